@@ -1,11 +1,597 @@
-from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import base64
+import hashlib
+import heapq
+import hmac
 import secrets
+import sqlite3
+import threading
+import time
 
-from .config import ACCESS_TOKEN_EXPIRE_MINUTES
+from .config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_MODE,
+    SESSION_BACKEND,
+    SESSION_CACHE_TTL_SECONDS,
+    SESSION_DB_PATH,
+    SESSION_MAX_SIZE,
+    SESSION_SWEEP_INTERVAL_SECONDS,
+    TOKEN_SECRET,
+)
+
+
+class SessionRecord:
+    """
+    Compact session record.
+
+    Timestamps are POSIX seconds (floats) rather than datetime objects.
+    """
+    __slots__ = ("user_id", "username", "created_at", "expires_at")
+
+    def __init__(self, user_id: int, username: str, created_at: float, expires_at: float):
+        self.user_id = user_id
+        self.username = username
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+
+class SessionBackend:
+    """
+    Interface implemented by session storage backends.
+    """
+
+    def create(self, user_id: int, username: str) -> str:
+        """
+        Store a new session and return its ID.
+        """
+        raise NotImplementedError
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """
+        Return the session if it exists and has not expired.
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        """
+        Remove a session if present.
+        """
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """
+        Remove expired sessions and return how many were removed.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for live, evicted and expired sessions.
+        """
+        raise NotImplementedError
+
+    def start_sweeper(self, interval_seconds: float) -> None:
+        """
+        Run sweep() every interval_seconds on a daemon thread.
+        """
+        if getattr(self, "_sweeper", None) is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval_seconds)
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+
+class SessionStore(SessionBackend):
+    """
+    In-memory session storage with active expiry and bounded size.
+
+    Sessions are only visible to the process that created them, so this
+    backend is for single-worker deployments.
+
+    Sessions are kept in LRU order. A min-heap of (expires_at, session_id)
+    lets sweep() drop expired sessions without scanning every entry, and
+    once max_size is reached the least recently used session is evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+        self.evicted = 0
+        self.expired = 0
+
+    def create(self, user_id: int, username: str) -> str:
+        """
+        Store a new session and return its ID.
+        """
+        session_id = secrets.token_urlsafe(32)
+        created_at = time.time()
+        record = SessionRecord(user_id, username, created_at, created_at + self.ttl_seconds)
+
+        with self._lock:
+            while len(self._sessions) >= self.max_size:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+            self._sessions[session_id] = record
+            heapq.heappush(self._expiries, (record.expires_at, session_id))
+
+        return session_id
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """
+        Return the session if it exists and has not expired.
+        """
+        with self._lock:
+            record = self._sessions.get(session_id)
+
+            if record is None:
+                return None
+
+            if time.time() > record.expires_at:
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+
+            self._sessions.move_to_end(session_id)
+            return record
+
+    def delete(self, session_id: str) -> None:
+        """
+        Remove a session if present.
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sweep(self) -> int:
+        """
+        Remove every expired session.
+
+        Heap entries for sessions that were already deleted or evicted are
+        discarded on the way. Returns the number of sessions removed.
+        """
+        now = time.time()
+        removed = 0
+
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                expires_at, session_id = heapq.heappop(self._expiries)
+                record = self._sessions.get(session_id)
+                if record is not None and record.expires_at == expires_at:
+                    del self._sessions[session_id]
+                    removed += 1
+
+            self.expired += removed
+
+            # Logouts and evictions leave stale heap entries behind; rebuild
+            # the heap when they dominate it
+            if len(self._expiries) > 2 * len(self._sessions) + 1024:
+                self._expiries = [
+                    (record.expires_at, session_id)
+                    for session_id, record in self._sessions.items()
+                ]
+                heapq.heapify(self._expiries)
+
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for live, evicted and expired sessions.
+        """
+        with self._lock:
+            return {
+                "live": len(self._sessions),
+                "evicted": self.evicted,
+                "expired": self.expired,
+            }
+
+
+class SQLiteSessionStore(SessionBackend):
+    """
+    Session storage in a SQLite file shared by all worker processes.
+
+    The file runs in WAL mode so readers in one worker do not block on
+    writers in another. Lookups go through a small per-process read
+    cache with a short TTL; a logout in another worker therefore takes up
+    to cache_ttl_seconds to be seen here.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        cache_ttl_seconds: float,
+        cache_size: int = 10_000
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_size = cache_size
+
+        self._local = threading.local()
+        self._cache: "OrderedDict[str, Tuple[float, SessionRecord]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.expired = 0
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, user_id INTEGER NOT NULL, username TEXT NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One autocommit connection per thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def create(self, user_id: int, username: str) -> str:
+        session_id = secrets.token_urlsafe(32)
+        created_at = time.time()
+        expires_at = created_at + self.ttl_seconds
+
+        self._connection().execute(
+            "INSERT INTO sessions (id, user_id, username, created_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (session_id, user_id, username, created_at, expires_at)
+        )
+
+        return session_id
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        now = time.time()
+
+        with self._cache_lock:
+            cached = self._cache.get(session_id)
+            if cached is not None and cached[0] > now:
+                self.cache_hits += 1
+                record = cached[1]
+                return record if now <= record.expires_at else None
+            self.cache_misses += 1
+
+        row = self._connection().execute(
+            "SELECT user_id, username, created_at, expires_at FROM sessions WHERE id = ?",
+            (session_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        record = SessionRecord(*row)
+
+        if now > record.expires_at:
+            self.delete(session_id)
+            self.expired += 1
+            return None
+
+        with self._cache_lock:
+            self._cache[session_id] = (now + self.cache_ttl_seconds, record)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return record
+
+    def delete(self, session_id: str) -> None:
+        with self._cache_lock:
+            self._cache.pop(session_id, None)
+
+        self._connection().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def sweep(self) -> int:
+        """
+        Remove every expired session (served by the expires_at index).
+        """
+        removed = self._connection().execute(
+            "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        self.expired += removed
+
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        live = self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+        return {
+            "live": live,
+            "evicted": 0,
+            "expired": self.expired,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+class TokenDenylist:
+    """
+    Revoked token IDs, kept only until the tokens would have expired.
+
+    Entries are checked in a local dict. When a shared SQLite path is
+    given, revocations are also written there and other workers pull new
+    rows (by id) at most every sync_interval_seconds, so a logout is
+    seen everywhere within that interval without a query per request.
+    """
+
+    def __init__(self, path: Optional[str] = None, sync_interval_seconds: float = 5):
+        self.path = path
+        self.sync_interval_seconds = sync_interval_seconds
+
+        self._entries: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_id = 0
+        self._next_sync = 0.0
+
+        if path is not None:
+            connection = self._connection()
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._create_table(connection)
+
+    @staticmethod
+    def _create_table(connection: sqlite3.Connection) -> None:
+        """
+        Create revoked_tokens, or move the rows of a table from before it
+        had an id column into a new one.
+
+        Workers sync on id, which AUTOINCREMENT never hands out twice; a
+        plain rowid can be reused once sweep() deletes the highest rows,
+        and revocations stored under a reused rowid would never be synced.
+        """
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(revoked_tokens)")}
+            migrate = bool(columns) and "id" not in columns
+
+            if migrate:
+                connection.execute("ALTER TABLE revoked_tokens RENAME TO revoked_tokens_old")
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "jti TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+            if migrate:
+                connection.execute(
+                    "INSERT INTO revoked_tokens (jti, expires_at) "
+                    "SELECT jti, expires_at FROM revoked_tokens_old ORDER BY rowid"
+                )
+                connection.execute("DROP TABLE revoked_tokens_old")
+
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at "
+                "ON revoked_tokens (expires_at)"
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, jti: str, expires_at: float) -> None:
+        if jti not in self._entries:
+            self._entries[jti] = expires_at
+            heapq.heappush(self._expiries, (expires_at, jti))
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token ID until expires_at.
+        """
+        with self._lock:
+            self._remember(jti, expires_at)
+
+        if self.path is not None:
+            self._connection().execute(
+                "INSERT INTO revoked_tokens (jti, expires_at) VALUES (?, ?)",
+                (jti, expires_at)
+            )
+
+    def __contains__(self, jti: str) -> bool:
+        if self.path is not None and time.time() >= self._next_sync:
+            self._sync()
+
+        return jti in self._entries
+
+    def _sync(self) -> None:
+        """
+        Pull revocations written by other workers since the last sync.
+        """
+        rows = self._connection().execute(
+            "SELECT id, jti, expires_at FROM revoked_tokens "
+            "WHERE id > ? AND expires_at > ?",
+            (self._last_id, time.time())
+        ).fetchall()
+
+        with self._lock:
+            for row_id, jti, expires_at in rows:
+                self._remember(jti, expires_at)
+                self._last_id = max(self._last_id, row_id)
+            self._next_sync = time.time() + self.sync_interval_seconds
+
+    def sweep(self) -> int:
+        """
+        Forget revocations of tokens that have expired anyway.
+        """
+        now = time.time()
+        removed = 0
+
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                _, jti = heapq.heappop(self._expiries)
+                if self._entries.pop(jti, None) is not None:
+                    removed += 1
+
+        if self.path is not None:
+            self._connection().execute(
+                "DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,)
+            )
+
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenSessionBackend(SessionBackend):
+    """
+    Stateless sessions carried in HMAC-SHA256 signed tokens.
+
+    A token is base64url("user_id:expires_at:jti:username") followed by
+    "." and the base64url signature. Verifying it needs only a
+    constant-time signature check plus a denylist lookup for logged out
+    tokens; nothing is stored per session.
+    """
+
+    def __init__(self, secret: bytes, ttl_seconds: float, denylist: TokenDenylist):
+        self.ttl_seconds = ttl_seconds
+        self.denylist = denylist
+
+        self._secret = secret
+
+        self.issued = 0
+        self.rejected = 0
+
+    def _sign(self, body: bytes) -> bytes:
+        digest = hmac.new(self._secret, body, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=")
+
+    def create(self, user_id: int, username: str) -> str:
+        expires_at = int(time.time() + self.ttl_seconds)
+        jti = secrets.token_urlsafe(12)
+
+        payload = f"{user_id}:{expires_at}:{jti}:{username}".encode()
+        body = base64.urlsafe_b64encode(payload).rstrip(b"=")
+
+        self.issued += 1
+
+        return (body + b"." + self._sign(body)).decode()
+
+    def _verify(self, token: str) -> Optional[Tuple[SessionRecord, str]]:
+        """
+        Check the signature and expiry of a token.
+
+        Returns:
+            Tuple of (session record, token ID), or None if invalid
+        """
+        try:
+            body, signature = token.encode().split(b".")
+        except ValueError:
+            return None
+
+        if not hmac.compare_digest(signature, self._sign(body)):
+            return None
+
+        try:
+            payload = base64.urlsafe_b64decode(body + b"=" * (-len(body) % 4))
+            user_id, expires_at, jti, username = payload.decode().split(":", 3)
+            expires_at = float(expires_at)
+            record = SessionRecord(
+                int(user_id), username, expires_at - self.ttl_seconds, expires_at
+            )
+        except ValueError:
+            return None
+
+        if time.time() > expires_at:
+            return None
+
+        return record, jti
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        verified = self._verify(session_id)
+
+        if verified is None or verified[1] in self.denylist:
+            self.rejected += 1
+            return None
+
+        return verified[0]
+
+    def delete(self, session_id: str) -> None:
+        verified = self._verify(session_id)
+
+        if verified is not None:
+            record, jti = verified
+            self.denylist.add(jti, record.expires_at)
+
+    def sweep(self) -> int:
+        return self.denylist.sweep()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "issued": self.issued,
+            "rejected": self.rejected,
+            "revoked": len(self.denylist),
+        }
+
+
+def _create_backend() -> SessionBackend:
+    """
+    Build the session backend selected by AUTH_MODE and SESSION_BACKEND.
+    """
+    ttl_seconds = 60 * ACCESS_TOKEN_EXPIRE_MINUTES
+
+    if AUTH_MODE == "token":
+        # A per-process random secret would silently log users out on
+        # restart and fail every token issued by another worker
+        if not TOKEN_SECRET:
+            raise ValueError("NOTES_TOKEN_SECRET must be set when NOTES_AUTH_MODE is 'token'")
+        secret = TOKEN_SECRET.encode()
+        denylist = TokenDenylist(
+            path=SESSION_DB_PATH if SESSION_BACKEND == "sqlite" else None,
+            sync_interval_seconds=SESSION_CACHE_TTL_SECONDS
+        )
+        return TokenSessionBackend(secret, ttl_seconds, denylist)
+
+    if AUTH_MODE != "session":
+        raise ValueError(f"Unknown AUTH_MODE: {AUTH_MODE!r}")
+
+    if SESSION_BACKEND == "sqlite":
+        return SQLiteSessionStore(
+            path=SESSION_DB_PATH,
+            ttl_seconds=ttl_seconds,
+            cache_ttl_seconds=SESSION_CACHE_TTL_SECONDS
+        )
+
+    if SESSION_BACKEND == "memory":
+        return SessionStore(ttl_seconds=ttl_seconds, max_size=SESSION_MAX_SIZE)
+
+    raise ValueError(f"Unknown SESSION_BACKEND: {SESSION_BACKEND!r}")
+
+
+# Session storage shared by create_session/get_session/delete_session
+sessions = _create_backend()
+sessions.start_sweeper(SESSION_SWEEP_INTERVAL_SECONDS)
 
-# In-memory session storage
-sessions: Dict[str, dict] = {}
 
 def create_session(user_id: int, username: str) -> str:
     """
@@ -18,25 +604,10 @@ def create_session(user_id: int, username: str) -> str:
     Returns:
         Session ID (random string)
     """
-    # Generate a random session ID
-    session_id = secrets.token_urlsafe(32)
-    
-    # Calculate expiration time
-    created_at = datetime.now(timezone.utc)
-    expires_at = created_at + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    # Store session
-    sessions[session_id] = {
-        "user_id": user_id,
-        "username": username,
-        "created_at": created_at,
-        "expires_at": expires_at
-    }
-    
-    return session_id
+    return sessions.create(user_id, username)
 
 
-def get_session(session_id: str) -> Optional[dict]:
+def get_session(session_id: str) -> Optional[SessionRecord]:
     """
     Get session data by session ID.
     
@@ -44,21 +615,9 @@ def get_session(session_id: str) -> Optional[dict]:
         session_id: Session ID to look up
     
     Returns:
-        Session data if valid, None if not found or expired
+        Session record if valid, None if not found or expired
     """
-    # Check if session exists
-    if session_id not in sessions:
-        return None
-    
-    session = sessions[session_id]
-    
-    # Check if session has expired
-    if datetime.now(timezone.utc) > session["expires_at"]:
-        # Session expired, delete it
-        delete_session(session_id)
-        return None
-    
-    return session
+    return sessions.get(session_id)
 
 
 def delete_session(session_id: str) -> None:
@@ -68,5 +627,4 @@ def delete_session(session_id: str) -> None:
     Args:
         session_id: Session ID to delete
     """
-    if session_id in sessions:
-        del sessions[session_id]
\ No newline at end of file
+    sessions.delete(session_id)
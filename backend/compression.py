@@ -0,0 +1,201 @@
+"""
+Transparent compression of note content at rest.
+
+Content at or above NOTE_COMPRESSION_THRESHOLD bytes is stored as a BLOB
+made of a one-byte codec marker followed by the compressed UTF-8 text;
+shorter content stays plain TEXT. CompressedText applies this on every
+write and read, and the note_text() SQL function does the same inside
+SQLite (used by the full-text search index).
+
+zlib output is a valid HTTP "deflate" body, so zlib-compressed content
+can be sent to clients as-is.
+
+Re-encode existing rows with the current settings:
+    python -m backend.compression migrate
+"""
+
+import lzma
+import sys
+import zlib
+from typing import Optional, Union
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+from .config import NOTE_COMPRESSION, NOTE_COMPRESSION_THRESHOLD
+
+ZLIB_MARKER = b"z"
+LZMA_MARKER = b"x"
+
+
+def encode_content(
+    value: str,
+    codec: str = NOTE_COMPRESSION,
+    threshold: int = NOTE_COMPRESSION_THRESHOLD
+) -> Union[str, bytes]:
+    """
+    Encode content for storage.
+
+    Args:
+        value: Note content
+        codec: "zlib", "lzma" or "none"
+        threshold: Minimum UTF-8 size in bytes worth compressing
+
+    Returns:
+        The text itself, or marker + compressed bytes
+    """
+    data = value.encode()
+
+    if codec == "none" or len(data) < threshold:
+        return value
+
+    if codec == "zlib":
+        compressed = ZLIB_MARKER + zlib.compress(data, 6)
+    elif codec == "lzma":
+        compressed = LZMA_MARKER + lzma.compress(data, preset=1)
+    else:
+        raise ValueError(f"Unknown NOTE_COMPRESSION: {codec!r}")
+
+    # Incompressible content is not worth the decode cost
+    return compressed if len(compressed) < len(data) else value
+
+
+def decode_content(value: Optional[Union[str, bytes]]) -> Optional[str]:
+    """
+    Decode a stored content value back to text.
+    """
+    if not isinstance(value, bytes):
+        return value
+
+    marker, payload = value[:1], value[1:]
+
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(payload).decode()
+    if marker == LZMA_MARKER:
+        return lzma.decompress(payload).decode()
+
+    return value.decode()
+
+
+def deflate_body(value: Union[str, bytes]) -> Optional[bytes]:
+    """
+    Return the stored bytes as an HTTP deflate body if they are zlib
+    compressed, None otherwise.
+    """
+    if isinstance(value, bytes) and value[:1] == ZLIB_MARKER:
+        return value[1:]
+
+    return None
+
+
+def accepts_encoding(header: Optional[str], coding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a content coding.
+
+    Codings compare case-insensitively and "*" stands for any coding the
+    header does not list. A coding whose q-value is 0, or not a number,
+    is not acceptable.
+    """
+    if header is None:
+        return False
+
+    wildcard = False
+
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name == coding:
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+
+    return wildcard
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column compressed at rest with encode_content/decode_content.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return encode_content(value)
+
+    def process_result_value(self, value, dialect):
+        return decode_content(value)
+
+
+def register_functions(dbapi_connection, connection_record=None) -> None:
+    """
+    Register note_text() on a new SQLite connection (connect event).
+    """
+    dbapi_connection.create_function("note_text", 1, decode_content, deterministic=True)
+
+
+def migrate(batch_size: int = 500) -> int:
+    """
+    Re-encode every note's content with the current settings.
+
+    Returns:
+        Number of rows rewritten
+    """
+    from sqlalchemy import select, type_coerce, update
+
+    from .database import create_tables, engine
+    from .models import Note
+
+    create_tables()
+
+    raw_content = type_coerce(Note.content, Text())
+    rewritten = 0
+    last_id = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(Note.id, raw_content)
+                .where(Note.id > last_id)
+                .order_by(Note.id)
+                .limit(batch_size)
+            ).all()
+
+            if not rows:
+                return rewritten
+
+            for note_id, stored in rows:
+                text = decode_content(stored)
+                if text is not None and encode_content(text) != stored:
+                    connection.execute(
+                        update(Note.__table__)
+                        .where(Note.id == note_id)
+                        .values(content=text, updated_at=Note.updated_at)
+                    )
+                    rewritten += 1
+
+            last_id = rows[-1][0]
+
+
+def main(argv):
+    if argv[1:] != ["migrate"]:
+        print("usage: python -m backend.compression migrate")
+        return 2
+
+    print(f"Rewrote {migrate()} notes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
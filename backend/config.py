@@ -1,3 +1,5 @@
+import os
+
 # API Settings
 API_TITLE = "Notes Web API"
 API_DESCRIPTION = "A modern web API for managing notes, tasks, and workspaces"
@@ -11,4 +13,120 @@ DEBUG = True
 # Database Settings 
 DATABASE_URL = "sqlite:///./notes.db"
 
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  
\ No newline at end of file
+# "sync" serves requests from the threadpool with a sync Session,
+# "async" uses an AsyncSession on ASYNC_DATABASE_URL (requires aiosqlite)
+DATABASE_MODE = os.getenv("NOTES_DATABASE_MODE", "sync")
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./notes.db"
+
+# Connection profile: PRAGMAs run on every new SQLite connection.
+# "tuned" uses WAL so readers never wait for the writer, waits up to
+# busy_timeout ms for locks instead of failing with "database is locked"
+# and trades durability of the last commits on power loss (not on a
+# crash) for fewer fsyncs. "default" keeps SQLite's own settings.
+DATABASE_PROFILE = os.getenv("NOTES_DATABASE_PROFILE", "tuned")
+DATABASE_PROFILES = {
+    "default": {},
+    "tuned": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # KiB
+    },
+}
+
+# Pool sizes of the read-only and write engines. SQLite allows a single
+# writer at a time, so one write connection per process avoids lock
+# contention between threads; readers scale with the pool.
+DATABASE_READ_POOL_SIZE = 8
+DATABASE_WRITE_POOL_SIZE = 1
+
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
+
+# Session store: maximum live sessions (least recently used are evicted
+# beyond this) and how often expired sessions are swept
+SESSION_MAX_SIZE = 100_000
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+
+# Session backend: "memory" (single worker) or "sqlite", a WAL-mode file
+# shared by all workers of `uvicorn --workers N`. Sessions read from the
+# shared file are cached per process for SESSION_CACHE_TTL_SECONDS.
+SESSION_BACKEND = os.getenv("NOTES_SESSION_BACKEND", "memory")
+SESSION_DB_PATH = "./sessions.db"
+SESSION_CACHE_TTL_SECONDS = 5
+
+# Auth mode: "session" stores sessions in SESSION_BACKEND, "token" issues
+# stateless HMAC-signed tokens. Token mode requires TOKEN_SECRET, shared
+# by all workers; with SESSION_BACKEND = "sqlite" logouts are also shared
+# through SESSION_DB_PATH.
+AUTH_MODE = os.getenv("NOTES_AUTH_MODE", "session")
+TOKEN_SECRET = os.getenv("NOTES_TOKEN_SECRET", "")
+
+# Note content compression at rest: "zlib", "lzma" or "none". Content of
+# at least NOTE_COMPRESSION_THRESHOLD bytes is compressed.
+NOTE_COMPRESSION = os.getenv("NOTES_COMPRESSION", "zlib")
+NOTE_COMPRESSION_THRESHOLD = 1024
+
+# Maximum length in characters of a note's content
+NOTE_CONTENT_MAX_LENGTH = 50_000
+
+# Maximum number of text operations in one PATCH of a note
+PATCH_MAX_OPERATIONS = 1000
+
+# Every REVISION_KEYFRAME_INTERVAL-th revision of a note stores its full
+# content; the others store a delta against the next version. Rebuilding
+# a revision applies at most REVISION_KEYFRAME_INTERVAL - 1 deltas.
+REVISION_KEYFRAME_INTERVAL = 20
+
+# Length in characters of the preview stored with every note and
+# returned by list endpoints instead of content
+NOTE_PREVIEW_LENGTH = 200
+
+# Note writes: "direct" commits every create/update/delete on its own.
+# "queue" funnels them through one writer thread that commits up to
+# WRITE_QUEUE_MAX_BATCH concurrent writes in a single transaction, waiting
+# at most WRITE_QUEUE_MAX_WAIT_MS after the first write for others to join.
+WRITE_MODE = os.getenv("NOTES_WRITE_MODE", "direct")
+WRITE_QUEUE_MAX_BATCH = 64
+WRITE_QUEUE_MAX_WAIT_MS = 2
+
+# Maximum number of notes in one batch create/update/delete request
+BATCH_MAX_ITEMS = 500
+
+# Export/import: notes fetched per round trip while streaming an export
+# and notes inserted per transaction by an import
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+# An import batch is also inserted once its lines add up to this many
+# bytes, which bounds the memory of an import request whatever the size
+# of its notes
+IMPORT_BATCH_BYTES = 4 * 1024 * 1024
+# Longest accepted import line: a note of the largest valid size even
+# with all of its content escaped as \uXXXX, plus its other fields
+IMPORT_MAX_LINE_BYTES = 6 * NOTE_CONTENT_MAX_LENGTH + 16 * 1024
+
+# Authenticated-user cache used by get_current_user
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TTL_SECONDS = 300
+
+# Read-through cache of encoded GET /notes/{note_id} responses, bounded
+# both in entries and in total bytes of the cached bodies. A write drops
+# the note from the cache of the process that made it; with several
+# workers, the others may serve the old note for up to
+# NOTE_CACHE_TTL_SECONDS. NOTE_CACHE_SIZE = 0 disables the cache.
+NOTE_CACHE_SIZE = 10_000
+NOTE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+NOTE_CACHE_TTL_SECONDS = 30
+
+# Password hashing pool: worker threads and how many hashes may wait
+# before signup/login are rejected with 503
+HASH_POOL_WORKERS = 2
+HASH_POOL_MAX_QUEUE = 32
+
+# SQL profiler (NOTES_SQL_PROFILE=1): records every statement of every
+# request with its query plan, and logs statements slower than
+# SQL_SLOW_QUERY_MS, statements run SQL_REPEAT_THRESHOLD or more times in
+# one request (N+1 patterns) and full table scans
+SQL_PROFILE = os.getenv("NOTES_SQL_PROFILE", "") == "1"
+SQL_SLOW_QUERY_MS = 50
+SQL_REPEAT_THRESHOLD = 3
@@ -2,21 +2,124 @@
 Database configuration and setup.
 """
 
-from sqlalchemy import create_engine
+from typing import Dict, Set
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from .config import DATABASE_URL
+from .config import (
+    DATABASE_URL, DATABASE_MODE, ASYNC_DATABASE_URL, DATABASE_PROFILE, DATABASE_PROFILES,
+    DATABASE_READ_POOL_SIZE, DATABASE_WRITE_POOL_SIZE
+)
+from .compression import register_functions
+from .search import create_search_index
+
+
+def apply_pragmas(dbapi_connection, pragmas: Dict[str, object]) -> None:
+    """
+    Run PRAGMA statements on a new SQLite connection.
+
+    Args:
+        dbapi_connection: Raw DBAPI connection (sqlite3 or aiosqlite adapter)
+        pragmas: PRAGMA names and values, applied in order
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def create_sqlite_engine(
+    url: str,
+    pragmas: Dict[str, object],
+    read_only: bool = False,
+    pool_size: int = 5
+) -> Engine:
+    """
+    Create an engine whose connections are set up with the given PRAGMAs.
+
+    Read-only engines additionally set query_only, so any write through
+    them fails. Write engines start every transaction with BEGIN
+    IMMEDIATE: the write lock is taken up front (waiting up to
+    busy_timeout) instead of on the first write, where SQLite fails with
+    "database is locked" without waiting if another connection has
+    committed since the transaction's first read.
+
+    Args:
+        url: Database URL
+        pragmas: PRAGMAs to apply to every connection
+        read_only: Whether to create a read-only engine
+        pool_size: Number of pooled connections
+
+    Returns:
+        The engine
+    """
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=10 if read_only else 0
+    )
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # SQL functions (note_text) used by the search index triggers
+        register_functions(dbapi_connection)
+        apply_pragmas(dbapi_connection, pragmas)
+
+        if read_only:
+            apply_pragmas(dbapi_connection, {"query_only": "ON"})
+        else:
+            # Let SQLAlchemy's begin event, not the driver, open transactions
+            dbapi_connection.isolation_level = None
+
+    if not read_only:
+        @event.listens_for(engine, "begin")
+        def on_begin(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+# Write engine, also used for schema setup and maintenance commands
+engine = create_sqlite_engine(
+    DATABASE_URL, DATABASE_PROFILES[DATABASE_PROFILE], pool_size=DATABASE_WRITE_POOL_SIZE
+)
 
-# Create database engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  
+# Read-only engine for requests that do not write
+read_engine = create_sqlite_engine(
+    DATABASE_URL, DATABASE_PROFILES[DATABASE_PROFILE], read_only=True,
+    pool_size=DATABASE_READ_POOL_SIZE
 )
 
 # Create SessionLocal class
-# Each instance of SessionLocal will be a database session
-SessionLocal = sessionmaker(bind=engine)
+# Each instance of SessionLocal will be a database session. Objects are
+# not expired on commit: repositories return rows they just wrote (via
+# RETURNING) and serializing them must not trigger another SELECT.
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, expire_on_commit=False)
+
+# Async engine and session factory, only created in async mode so that
+# aiosqlite stays an optional dependency
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def on_async_connect(dbapi_connection, connection_record):
+        register_functions(dbapi_connection)
+        apply_pragmas(dbapi_connection, DATABASE_PROFILES[DATABASE_PROFILE])
+
+    # Objects stay usable after commit without an implicit (blocking) refresh
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
 
 # Create Base class
 Base = declarative_base()
@@ -25,13 +128,66 @@ Base = declarative_base()
 def create_tables():
     """
     Create all tables in the database.
+
+    Columns and indexes added to a model after its table was created are
+    added to existing databases as well, and note statistics are
+    computed when their columns are new. The full-text search table and
+    its triggers are created last.
     """
+    from .note_stats import backfill
+
     Base.metadata.create_all(bind=engine)
 
+    with engine.begin() as connection:
+        added = add_missing_columns(connection)
 
-def get_db():
+        if "notes.content_hash" in added:
+            backfill(connection)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as connection:
+        create_search_index(connection)
+
+
+def add_missing_columns(connection) -> Set[str]:
+    """
+    ALTER existing tables to add model columns they do not have yet.
+
+    New columns must be nullable or carry a server_default.
+
+    Returns:
+        Added columns as "table.column" names
+    """
+    inspector = inspect(connection)
+    added = set()
+
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} " \
+                  f"{column.type.compile(dialect=connection.dialect)}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            if column.server_default is not None:
+                default = str(column.server_default.arg).replace("'", "''")
+                ddl += f" DEFAULT '{default}'"
+
+            connection.execute(text(ddl))
+            added.add(f"{table.name}.{column.name}")
+
+    return added
+
+
+def get_write_db():
     """
-    Get a database session.
+    Get a database session on the write engine.
     
     It ensures the database session is properly closed after use.
     """
@@ -39,4 +195,32 @@ def get_db():
     try:
         yield db  
     finally:
-        db.close()  
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """
+    Get a read-only database session.
+
+    Sessions come from a separate pool, so reads are not queued behind
+    the write connection.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Default dependency for sessions that may write
+get_db = get_write_db
+
+
+async def get_async_db():
+    """
+    Get an async database session.
+
+    Only available when DATABASE_MODE is "async".
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
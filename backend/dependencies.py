@@ -3,31 +3,22 @@ FastAPI dependencies for session-based authentication.
 """
 
 from fastapi import Cookie, HTTPException, status, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from .database import get_db
+from .database import get_read_db, get_async_db
 from .auth import get_session
-from .repositories import user_repository
-from .models import User
+from .repositories import user_repository, async_user_repository
+from .repositories.user_repository import CurrentUser
 
 
-def get_current_user(
-    session_id: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
-) -> User:
+def _session_user_id(session_id: Optional[str]) -> int:
     """
-    Get the current authenticated user from session cookie.
-    
-    Args:
-        session_id: Session ID from cookie 
-        db: Database session
-    
-    Returns:
-        User object of the authenticated user
-    
+    Resolve the user ID stored in a session cookie.
+
     Raises:
-        401: If session is invalid or user not found
+        401: If the session is missing, invalid or expired
     """
     # Check if session_id cookie exists
     if session_id is None:
@@ -35,32 +26,71 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
-    
+
     # Get session data
     session = get_session(session_id)
-    
+
     if session is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired session"
         )
+
+    return session.user_id
+
+
+def get_current_user(
+    session_id: Optional[str] = Cookie(None),
+    db: Session = Depends(get_read_db)
+) -> CurrentUser:
+    """
+    Get the current authenticated user from session cookie.
+
+    The user is served from the user cache, so an authenticated request
+    normally makes no query against the users table.
     
-    # Extract username from session
-    username = session.get("username")
+    Args:
+        session_id: Session ID from cookie 
+        db: Database session
+    
+    Returns:
+        CurrentUser identity of the authenticated user
+    
+    Raises:
+        401: If session is invalid or user not found
+    """
+    user_id = _session_user_id(session_id)
+    
+    # Get user from cache or database
+    user = user_repository.get_current_user_by_id(db, user_id=user_id)
     
-    if username is None:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid session data"
+            detail="User not found"
         )
     
-    # Get user from database
-    user = user_repository.get_user_by_username(db, username=username)
-    
+    return user
+
+
+async def get_current_user_async(
+    session_id: Optional[str] = Cookie(None),
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """
+    Async variant of get_current_user for routes using an AsyncSession.
+
+    Raises:
+        401: If session is invalid or user not found
+    """
+    user_id = _session_user_id(session_id)
+
+    user = await async_user_repository.get_current_user_by_id(db, user_id=user_id)
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
-    return user
\ No newline at end of file
+
+    return user
@@ -1,17 +1,69 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from .config import API_VERSION
-from .database import create_tables
+from .auth import sessions
+from .config import API_VERSION, DATABASE_MODE
+from .database import async_engine, create_tables, engine, read_engine
+from .metrics import MetricsMiddleware, instrument_engine, metrics
+from .profiler import ProfilerMiddleware
+from .profiler import instrument_engine as instrument_profiler
+from .repositories.note_repository import note_cache
+from .repositories.user_repository import user_cache
 from .routers import auth, notes
+from .utils.hashing import HashingPoolFull, hashing_pool
+from .write_queue import write_queue
 
 # Create the FastAPI application
 app = FastAPI()
 
 create_tables()
 
+# Request latency, status codes and SQL statements per route, served on
+# /metrics, and per-statement profiles when SQL_PROFILE is on
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilerMiddleware)
+
+for instrumented in (engine, read_engine, async_engine and async_engine.sync_engine):
+    if instrumented is not None:
+        instrument_engine(instrumented)
+        instrument_profiler(instrumented)
+
+metrics.register_collector("hashing_pool", hashing_pool.stats)
+metrics.register_collector("sessions", sessions.stats)
+metrics.register_collector("user_cache", user_cache.stats)
+metrics.register_collector("note_cache", note_cache.stats)
+if write_queue is not None:
+    metrics.register_collector("write_queue", write_queue.stats)
+
+if DATABASE_MODE == "async":
+    from .routers import async_auth, async_notes
+
+    # Registered first so they take precedence; routes without an async
+    # variant (e.g. logout) are still served by the sync routers below
+    app.include_router(async_auth.router, prefix="/api")
+    app.include_router(async_notes.router, prefix="/api")
+
 app.include_router(auth.router, prefix="/api")
 app.include_router (notes.router, prefix="/api")
 
+@app.exception_handler(HashingPoolFull)
+def hashing_pool_full_handler(request: Request, exc: HashingPoolFull):
+    """
+    Reject signup/login quickly when the password hashing pool is full.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """
+    Metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def read_root():
     """
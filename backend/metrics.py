@@ -0,0 +1,281 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+MetricsMiddleware records, per route template and method, a latency
+histogram, response counts by status code and the number and total time
+of the SQL statements each request ran. SQL statements are timed with
+cursor execute events on the instrumented engines and attributed to the
+request through a context variable, which the request threadpool (and
+the write queue) carry over to the threads running the route.
+
+Histograms have fixed bucket bounds and their count arrays are allocated
+once per route; the per-request statement counters come from a free
+list. The hot path therefore only does a bisect and a few integer
+additions.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the request latency and per-request SQL time
+# histograms
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the statements-per-request histogram
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+CONVERTOR = re.compile(r"\{(\w+):\w+\}")
+
+
+class Histogram:
+    """
+    Cumulative-on-render histogram over fixed bucket bounds.
+    """
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bound plus +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str, lines: List[str]) -> None:
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+
+
+class RouteMetrics:
+    """
+    Metrics of one (method, route template) pair.
+    """
+    __slots__ = ("method", "path", "duration", "statements", "db_seconds", "statuses")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = Histogram(DURATION_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestStats:
+    """
+    SQL statement count and time of the request in progress.
+    """
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Stats of the current request, None outside requests
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Metrics:
+    """
+    Registry of route metrics, SQL counters and component stats.
+
+    Route metrics are only updated from the event loop thread; SQL
+    statements run outside any request are counted under a lock.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.routes: Dict[Tuple[str, int], RouteMetrics] = {}
+        self.collectors: Dict[str, Callable[[], Dict]] = {}
+
+        self._free: List[RequestStats] = []
+        self._lock = threading.Lock()
+        self.background_statements = 0
+        self.background_seconds = 0.0
+
+    def route(self, scope) -> RouteMetrics:
+        """
+        Metrics of the route a request was dispatched to.
+        """
+        # Routes live as long as the app, so their id is a stable key
+        key = (scope["method"], id(scope.get("route")))
+        route_metrics = self.routes.get(key)
+        if route_metrics is None:
+            route_metrics = self.routes[key] = RouteMetrics(scope["method"], route_template(scope))
+        return route_metrics
+
+    def acquire(self) -> RequestStats:
+        if self._free:
+            return self._free.pop()
+        return RequestStats()
+
+    def release(self, stats: RequestStats) -> None:
+        stats.statements = 0
+        stats.seconds = 0.0
+        self._free.append(stats)
+
+    def record_background(self, seconds: float) -> None:
+        with self._lock:
+            self.background_statements += 1
+            self.background_seconds += seconds
+
+    def register_collector(self, name: str, collect: Callable[[], Dict]) -> None:
+        """
+        Expose the numeric values of collect() as notes_<name>_<key> gauges.
+        """
+        self.collectors[name] = collect
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP notes_http_requests_in_flight Requests being served.",
+            "# TYPE notes_http_requests_in_flight gauge",
+            f"notes_http_requests_in_flight {self.in_flight}",
+        ]
+        routes = sorted(self.routes.values(), key=lambda route: (route.path, route.method))
+
+        sections = (
+            ("notes_http_request_duration_seconds", "Request latency.", "duration"),
+            ("notes_db_statements_per_request", "SQL statements run by a request.", "statements"),
+            ("notes_db_seconds_per_request", "Time a request spent executing SQL.", "db_seconds"),
+        )
+        for name, help_text, attribute in sections:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for route in routes:
+                getattr(route, attribute).render(name, f'method="{route.method}",route="{route.path}"', lines)
+
+        lines.append("# HELP notes_http_responses_total Responses by status code.")
+        lines.append("# TYPE notes_http_responses_total counter")
+        for route in routes:
+            for status, count in sorted(route.statuses.items()):
+                lines.append(
+                    f'notes_http_responses_total{{method="{route.method}",route="{route.path}",'
+                    f'status="{status}"}} {count}'
+                )
+
+        with self._lock:
+            background = (self.background_statements, self.background_seconds)
+        lines.append("# HELP notes_db_background_statements_total SQL statements run outside requests.")
+        lines.append("# TYPE notes_db_background_statements_total counter")
+        lines.append(f"notes_db_background_statements_total {background[0]}")
+        lines.append("# HELP notes_db_background_seconds_total Time spent on SQL outside requests.")
+        lines.append("# TYPE notes_db_background_seconds_total counter")
+        lines.append(f"notes_db_background_seconds_total {background[1]}")
+
+        for component, collect in self.collectors.items():
+            for key, value in collect().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"notes_{component}_{key} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def route_template(scope) -> str:
+    """
+    Full path template of the route a request matched, e.g.
+    /api/notes/{note_id}, or "unmatched".
+
+    Routes of included routers only know the path below their include
+    prefix, so the prefix is taken from the leading segments of the
+    request path. Path convertors are dropped ({note_id:int} is
+    {note_id}) so that labels are the same in every database mode.
+    Computed once per route.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[:len(segments) - route.path.count("/")])
+
+    return prefix + CONVERTOR.sub(r"{\1}", route.path)
+
+
+def instrument_engine(engine: Engine, registry: Metrics = metrics) -> None:
+    """
+    Time every SQL statement run on engine and add it to the current
+    request's stats.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started_at
+        stats = request_stats.get()
+
+        if stats is None:
+            registry.record_background(elapsed)
+        else:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status codes and SQL statements
+    per route template.
+
+    Requests that match no route are recorded under route="unmatched".
+    """
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        stats = registry.acquire()
+        token = request_stats.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            registry.in_flight -= 1
+
+            route_metrics = registry.route(scope)
+            route_metrics.duration.observe(elapsed)
+            route_metrics.statements.observe(stats.statements)
+            route_metrics.db_seconds.observe(stats.seconds)
+            route_metrics.statuses[status] = route_metrics.statuses.get(status, 0) + 1
+
+            request_stats.reset(token)
+            registry.release(stats)
@@ -3,12 +3,42 @@ SQLAlchemy ORM models.
 """
 
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 
+from .compression import CompressedText
 from .database import Base
 
 
+def utcnow() -> datetime:
+    """
+    Current time in UTC, evaluated on every insert/update.
+    """
+    return datetime.now(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime stored as naive UTC and loaded as timezone-aware UTC.
+
+    Keeps timestamps identical whether they come from a freshly written
+    object or from a row read back from SQLite.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class User(Base):
     """
     User model - represents the 'users' table.
@@ -26,9 +56,13 @@ class User(Base):
     
     salt = Column(String, nullable=False)
     
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=utcnow)
     
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=utcnow, onupdate=utcnow)
+
+    # Bumped on every write to the user's notes. Versions the note list
+    # and doubles as the change sequence of the /notes/changes feed
+    notes_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     notes = relationship("Note", back_populates="user")
 
@@ -42,19 +76,100 @@ class Note(Base):
     """
     __tablename__ = "notes"
 
+    # Composite index backing keyset pagination of a user's notes
+    # ordered by (updated_at, id).
+    __table_args__ = (
+        Index("ix_notes_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_notes_user_id_change_seq_id", "user_id", "change_seq", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     
     title = Column(String, nullable=False)
     
-    content = Column(Text, default="")
+    # Compressed at rest above NOTE_COMPRESSION_THRESHOLD
+    content = Column(CompressedText, default="")
+    
+    # Maintained from content by the repositories (see note_stats), so
+    # that list endpoints never read content. content_hash is NULL until
+    # computed for notes written before these columns existed
+    preview = Column(String, nullable=False, default="", server_default="")
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    char_count = Column(Integer, nullable=False, default=0, server_default="0")
+    content_hash = Column(String)
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=utcnow)
+    updated_at = Column(UTCDateTime, default=utcnow, onupdate=utcnow)
+
+    # Value of the owner's notes_version when this note last changed
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")
 
     # This note belongs to one user
     user = relationship("User", back_populates="notes")
 
     def __repr__(self):
-        return f"<Note(id={self.id}, title='{self.title}', user_id={self.user_id})>"
\ No newline at end of file
+        return f"<Note(id={self.id}, title='{self.title}', user_id={self.user_id})>"
+
+
+class NoteTombstone(Base):
+    """
+    Record of a deleted note, returned by the change feed so that
+    syncing clients learn about deletions.
+    """
+    __tablename__ = "note_tombstones"
+
+    __table_args__ = (
+        Index("ix_note_tombstones_user_id_change_seq_note_id", "user_id", "change_seq", "note_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    note_id = Column(Integer, nullable=False)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    change_seq = Column(Integer, nullable=False)
+
+    deleted_at = Column(UTCDateTime, default=utcnow)
+
+    def __repr__(self):
+        return f"<NoteTombstone(note_id={self.note_id}, change_seq={self.change_seq})>"
+
+
+class NoteRevision(Base):
+    """
+    Earlier version of a note, kept when the note is updated.
+
+    data is a reverse delta against the next version, or the full
+    content for keyframes (see backend.revisions).
+    """
+    __tablename__ = "note_revisions"
+
+    __table_args__ = (
+        Index("ix_note_revisions_note_id_number", "note_id", "number", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    note_id = Column(Integer, ForeignKey("notes.id"), nullable=False)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # 1 for the version a note was created with, counting up
+    number = Column(Integer, nullable=False)
+
+    title = Column(String, nullable=False)
+
+    char_count = Column(Integer, nullable=False)
+
+    # When this version was written
+    updated_at = Column(UTCDateTime, nullable=False)
+
+    keyframe = Column(Boolean, nullable=False, default=False)
+
+    data = Column(CompressedText, nullable=False)
+
+    def __repr__(self):
+        return f"<NoteRevision(note_id={self.note_id}, number={self.number})>"
@@ -0,0 +1,103 @@
+"""
+Precomputed note preview and statistics.
+
+Every note stores a short preview of its content, word and character
+counts and a SHA-256 hash of the content, written together with the
+content so that list endpoints never need to read (or decompress) it.
+
+Fill in the columns of notes written before they existed:
+    python -m backend.note_stats backfill
+"""
+
+import hashlib
+import sys
+from typing import Dict, Union
+
+from .config import NOTE_PREVIEW_LENGTH
+
+
+def content_stats(content: str, preview_length: int = NOTE_PREVIEW_LENGTH) -> Dict[str, Union[str, int]]:
+    """
+    Compute the stored statistics of a note's content.
+
+    Args:
+        content: Note content
+        preview_length: Maximum length of the preview in characters
+
+    Returns:
+        Column values for preview, word_count, char_count and content_hash
+    """
+    # Runs of whitespace (including newlines) are collapsed so the
+    # preview renders on one line; only the head of the text is scanned
+    preview = " ".join(content[:preview_length * 2].split())[:preview_length]
+
+    return {
+        "preview": preview,
+        "word_count": len(content.split()),
+        "char_count": len(content),
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+    }
+
+
+def backfill(connection, batch_size: int = 500) -> int:
+    """
+    Compute the statistics of notes that do not have them yet.
+
+    Runs in the caller's transaction. updated_at is carried over so that
+    backfilled notes do not appear modified.
+
+    Args:
+        connection: Database connection
+        batch_size: Number of notes read per query
+
+    Returns:
+        Number of notes updated
+    """
+    from sqlalchemy import bindparam, select, update
+
+    from .models import Note
+
+    # The statistics columns are SET from the keys of each parameter set
+    statement = (
+        update(Note.__table__)
+        .where(Note.id == bindparam("note_id"))
+        .values(updated_at=Note.updated_at)
+    )
+    updated = 0
+    last_id = 0
+
+    while True:
+        rows = connection.execute(
+            select(Note.id, Note.content)
+            .where(Note.id > last_id, Note.content_hash.is_(None))
+            .order_by(Note.id)
+            .limit(batch_size)
+        ).all()
+
+        if not rows:
+            return updated
+
+        connection.execute(statement, [
+            {"note_id": note_id, **content_stats(content or "")}
+            for note_id, content in rows
+        ])
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+
+def main(argv):
+    if argv[1:] != ["backfill"]:
+        print("usage: python -m backend.note_stats backfill")
+        return 2
+
+    from .database import create_tables, engine
+
+    create_tables()
+
+    with engine.begin() as connection:
+        print(f"Backfilled {backfill(connection)} notes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,245 @@
+"""
+SQL statement profiler.
+
+When enabled (SQL_PROFILE, or temporarily through capture()), every SQL
+statement a request runs is recorded with its duration and SQLite query
+plan. At the end of the request the profile is checked for:
+
+- slow statements, slower than SQL_SLOW_QUERY_MS
+- repeated statements, the same SQL run SQL_REPEAT_THRESHOLD or more
+  times, which usually means a query per row (N+1)
+- full scans, a plan step that reads a whole table without an index
+
+Findings are written as one JSON object per line to the "backend.sql"
+logger at WARNING level. capture() collects the profiles of the
+requests served while it is active; backend.pytest_plugin builds
+statement budgets for tests on top of it.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import SQL_PROFILE, SQL_REPEAT_THRESHOLD, SQL_SLOW_QUERY_MS
+from .metrics import route_template
+
+logger = logging.getLogger("backend.sql")
+
+# Distinct SQL texts whose plan is kept
+MAX_CACHED_PLANS = 1000
+
+# Statements that never have an interesting plan
+UNPLANNED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+
+
+class StatementRecord:
+    """
+    One executed statement.
+    """
+    __slots__ = ("sql", "parameters", "seconds", "plan")
+
+    def __init__(self, sql: str, parameters, seconds: float, plan: Tuple[str, ...]):
+        self.sql = sql
+        self.parameters = parameters
+        self.seconds = seconds
+        self.plan = plan
+
+    def full_scans(self) -> List[str]:
+        """
+        Plan steps that scan a table without an index.
+
+        Scans of FTS virtual tables, subqueries (co-routines and
+        materialized views) and constant rows are not table scans.
+        """
+        subqueries = {
+            step.split(" ", 1)[1] for step in self.plan
+            if step.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+        }
+        return [
+            step for step in self.plan
+            if step.startswith("SCAN ")
+            and " USING " not in step
+            and "VIRTUAL TABLE" not in step
+            and not step.startswith(("SCAN (", "SCAN CONSTANT"))
+            and step.split(" ")[1] not in subqueries
+        ]
+
+
+class RequestProfile:
+    """
+    Statements run by one request.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = path
+        self.status = 500
+        self.seconds = 0.0
+        self.statements: List[StatementRecord] = []
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.route}"
+
+    def repeated(self, threshold: int = SQL_REPEAT_THRESHOLD) -> Dict[str, int]:
+        """
+        Statements run at least threshold times, with their count.
+        """
+        counts = Counter(
+            record.sql for record in self.statements
+            if not record.sql.lstrip().upper().startswith(UNPLANNED_PREFIXES)
+        )
+        return {sql: count for sql, count in counts.items() if count >= threshold}
+
+    def full_scans(self) -> List[StatementRecord]:
+        return [record for record in self.statements if record.full_scans()]
+
+    def slow(self, threshold_ms: float = SQL_SLOW_QUERY_MS) -> List[StatementRecord]:
+        return [record for record in self.statements if record.seconds * 1000 >= threshold_ms]
+
+
+# Profile of the current request, None when not profiling
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+class Profiler:
+    """
+    Collects request profiles and logs their findings.
+    """
+
+    def __init__(self, enabled: bool = SQL_PROFILE, history: int = 100):
+        self.enabled = enabled
+        self.active = enabled
+        self.recent: "deque[RequestProfile]" = deque(maxlen=history)
+
+        self._plans: Dict[str, Tuple[str, ...]] = {}
+        self._captures: List[List[RequestProfile]] = []
+        self._lock = threading.Lock()
+
+    def plan(self, dbapi_connection, sql: str, parameters) -> Tuple[str, ...]:
+        """
+        EXPLAIN QUERY PLAN of a statement, cached by SQL text.
+        """
+        if sql.lstrip().upper().startswith(UNPLANNED_PREFIXES):
+            return ()
+
+        plan = self._plans.get(sql)
+        if plan is None:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters)
+                plan = tuple(row[3] for row in cursor.fetchall())
+            except Exception:
+                plan = ()
+            finally:
+                cursor.close()
+            if len(self._plans) >= MAX_CACHED_PLANS:
+                self._plans.clear()
+            self._plans[sql] = plan
+
+        return plan
+
+    def finish(self, profile: RequestProfile) -> None:
+        """
+        Store a finished request profile and log its findings.
+        """
+        with self._lock:
+            self.recent.append(profile)
+            for captured in self._captures:
+                captured.append(profile)
+
+        for record in profile.slow():
+            self.log("slow_query", profile, sql=record.sql, ms=round(record.seconds * 1000, 3),
+                     parameters=repr(record.parameters)[:200], plan=list(record.plan))
+
+        for sql, count in profile.repeated().items():
+            self.log("repeated_statement", profile, sql=sql, count=count)
+
+        for record in profile.full_scans():
+            self.log("full_scan", profile, sql=record.sql, plan=list(record.plan))
+
+    def log(self, kind: str, profile: RequestProfile, **fields) -> None:
+        logger.warning(json.dumps({"event": kind, "endpoint": profile.endpoint, **fields}))
+
+    @contextmanager
+    def capture(self) -> Iterator[List[RequestProfile]]:
+        """
+        Profile requests while the block runs and collect their profiles.
+        """
+        captured: List[RequestProfile] = []
+
+        with self._lock:
+            self._captures.append(captured)
+            self.active = True
+        try:
+            yield captured
+        finally:
+            with self._lock:
+                self._captures.remove(captured)
+                self.active = self.enabled or bool(self._captures)
+
+
+profiler = Profiler()
+
+
+def instrument_engine(engine: Engine, registry: Profiler = profiler) -> None:
+    """
+    Record statements run on engine into the current request profile.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._profile_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        if profile is None:
+            return
+
+        elapsed = time.perf_counter() - context._profile_started_at
+        plan_parameters = parameters[0] if executemany and parameters else parameters
+        plan = registry.plan(conn.connection.dbapi_connection, statement, plan_parameters)
+
+        profile.statements.append(StatementRecord(statement, parameters, elapsed, plan))
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware opening a RequestProfile per request while the
+    profiler is enabled or capturing.
+    """
+
+    def __init__(self, app, registry: Profiler = profiler):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.active:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = current_profile.set(profile)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profile.seconds = time.perf_counter() - started_at
+            profile.route = route_template(scope)
+            current_profile.reset(token)
+            self.registry.finish(profile)
@@ -0,0 +1,105 @@
+"""
+pytest fixtures for SQL statement budgets.
+
+Enable in a test suite with:
+    pytest_plugins = ["backend.pytest_plugin"]
+
+Then wrap requests to the app in sql_budget:
+
+    def test_list_notes(client, sql_budget):
+        with sql_budget(3):
+            client.get("/api/notes/")
+
+    def test_note_routes(client, sql_budget):
+        with sql_budget({"GET /api/notes/{note_id}": 2, "PUT /api/notes/{note_id}": 5}):
+            client.get("/api/notes/1")
+            client.put("/api/notes/1", json={"title": "new"})
+
+A request fails the budget when it runs more statements than allowed,
+repeats a statement (N+1), or scans a table without an index (unless
+allow_full_scans is set). Transaction control (BEGIN, SAVEPOINT, ...)
+depends on the database and write modes and is not counted, and
+endpoint names leave out path convertors ({note_id:int} is {note_id}),
+so one budget holds in every mode. Endpoints missing from a budget dict
+are not checked.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Union
+
+import pytest
+
+from .config import SQL_REPEAT_THRESHOLD
+from .profiler import UNPLANNED_PREFIXES, RequestProfile, profiler
+
+
+def budget_violations(
+    profiles: List[RequestProfile],
+    budget: Union[int, Dict[str, int]],
+    repeat_threshold: int = SQL_REPEAT_THRESHOLD,
+    allow_full_scans: bool = False
+) -> List[str]:
+    """
+    Describe every way the profiled requests exceed a statement budget.
+
+    Args:
+        profiles: Profiles of the requests to check
+        budget: Maximum statements per request, or per endpoint as
+            "METHOD /route/template"
+        repeat_threshold: Number of runs of one statement that counts as N+1
+        allow_full_scans: Whether full table scans are accepted
+
+    Returns:
+        One message per violation, empty if within budget
+    """
+    violations = []
+
+    for profile in profiles:
+        limit = budget if isinstance(budget, int) else budget.get(profile.endpoint)
+        if limit is None:
+            continue
+
+        counted = [
+            record for record in profile.statements
+            if not record.sql.lstrip().upper().startswith(UNPLANNED_PREFIXES)
+        ]
+        if len(counted) > limit:
+            statements = "\n".join(f"    {record.sql}" for record in counted)
+            violations.append(
+                f"{profile.endpoint} ran {len(counted)} statements "
+                f"(budget {limit}):\n{statements}"
+            )
+
+        for sql, count in profile.repeated(repeat_threshold).items():
+            violations.append(f"{profile.endpoint} ran the same statement {count} times:\n    {sql}")
+
+        if not allow_full_scans:
+            for record in profile.full_scans():
+                violations.append(
+                    f"{profile.endpoint} scans without an index ({'; '.join(record.full_scans())}):\n"
+                    f"    {record.sql}"
+                )
+
+    return violations
+
+
+@pytest.fixture
+def sql_budget():
+    """
+    Context manager factory asserting a statement budget on the requests
+    made inside it; yields the captured request profiles.
+    """
+    @contextmanager
+    def check(
+        budget: Union[int, Dict[str, int]],
+        repeat_threshold: int = SQL_REPEAT_THRESHOLD,
+        allow_full_scans: bool = False
+    ) -> Iterator[List[RequestProfile]]:
+        with profiler.capture() as profiles:
+            yield profiles
+
+        violations = budget_violations(profiles, budget, repeat_threshold, allow_full_scans)
+        if violations:
+            pytest.fail("SQL budget exceeded:\n" + "\n".join(violations), pytrace=False)
+
+    return check
@@ -0,0 +1,279 @@
+"""
+Async note repository for database operations.
+
+Mirrors note_repository for use with an AsyncSession.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+
+from ..database import async_engine
+from ..models import Note, NoteRevision, NoteTombstone, User
+from ..note_stats import content_stats
+from .note_repository import (
+    NOTE_FIELDS, bump_notes_version_statement, cache_note_row, invalidate_cached_notes,
+    next_change_seq, note_cache, note_statement, paginate, previous_versions_statement,
+    revision_rows, user_notes_statement, watch_note_writes
+)
+
+if async_engine is not None:
+    watch_note_writes(async_engine.sync_engine)
+
+
+async def bump_notes_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Record a change to a user's notes in users.notes_version.
+
+    Returns:
+        The new version, used as the change_seq of the written notes
+    """
+    return await db.scalar(
+        bump_notes_version_statement(user_id),
+        execution_options={"synchronize_session": False}
+    )
+
+
+async def get_notes_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Get the version of a user's note list.
+    """
+    return await db.scalar(select(User.notes_version).where(User.id == user_id)) or 0
+
+
+async def get_note_version(db: AsyncSession, note_id: int, user_id: int) -> Optional[datetime]:
+    """
+    Get a note's updated_at without loading its content.
+    """
+    return await db.scalar(
+        select(Note.updated_at).where(Note.id == note_id, Note.user_id == user_id)
+    )
+
+
+async def create_note(db: AsyncSession, title: str, content: str, user_id: int) -> Note:
+    """
+    Create a new note for a user.
+    
+    Args:
+        db: Async database session
+        title: Note title
+        content: Note content
+        user_id: ID of user creating the note
+        
+    Returns:
+        Created Note object
+    """
+    change_seq = await bump_notes_version(db, user_id)
+    
+    note = Note(
+        title=title,
+        content=content,
+        user_id=user_id,
+        change_seq=change_seq,
+        **content_stats(content)
+    )
+    
+    db.add(note)
+    await db.commit()
+    
+    return note
+
+
+async def get_user_notes(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    order: str = "desc",
+    fields: Sequence[str] = tuple(NOTE_FIELDS)
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Get one page of notes for a specific user.
+    
+    Args:
+        db: Async database session
+        user_id: ID of user
+        limit: Maximum number of notes to return
+        cursor: Cursor returned with the previous page (optional)
+        order: "desc" for most recently updated first, "asc" otherwise
+        fields: Names from NOTE_FIELDS to select (default: all)
+        
+    Returns:
+        Tuple of (list of rows, cursor for the next page or None)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    stmt = user_notes_statement(user_id, limit, cursor, order, fields)
+
+    result = await db.execute(stmt)
+
+    return paginate(list(result.all()), limit)
+
+
+async def get_note_by_id(db: AsyncSession, note_id: int, user_id: int) -> Optional[Note]:
+    """
+    Get a specific note by ID.
+
+    Args:
+        db: Async database session
+        note_id: ID of note to get
+        user_id: ID of user requesting the note
+        
+    Returns:
+        Note object if found and belongs to user, None otherwise
+    """
+    result = await db.execute(
+        select(Note).where(Note.id == note_id, Note.user_id == user_id)
+    )
+
+    return result.scalars().first()
+
+
+async def load_note_json(db: AsyncSession, note_id: int, user_id: int) -> Optional[Tuple[bytes, datetime]]:
+    """
+    Load a note as an encoded NoteResponse body and add it to note_cache.
+
+    Args:
+        db: Async database session
+        note_id: ID of note
+        user_id: ID of user requesting the note
+
+    Returns:
+        Tuple of (JSON body, updated_at) if found, None otherwise
+    """
+    generation = note_cache.generation
+
+    result = await db.execute(note_statement(note_id, user_id))
+    row = result.first()
+
+    if row is None:
+        return None
+
+    return cache_note_row(row, user_id, generation)
+
+
+async def update_note(
+    db: AsyncSession,
+    note_id: int,
+    user_id: int,
+    title: Optional[str] = None,
+    content: Optional[str] = None,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Note]:
+    """
+    Update a note's title or content.
+
+    The version it replaces is kept as a NoteRevision.
+    
+    Args:
+        db: Async database session
+        note_id: ID of note to update
+        user_id: ID of user (for security check)
+        title: New title (optional)
+        content: New content (optional)
+        expected_updated_at: Only update if the note still has this
+            updated_at (optional, for If-Match preconditions)
+        
+    Returns:
+        Updated Note object if successful, None if not found or the
+        precondition failed
+    """
+    values = {}
+    
+    if title is not None:
+        values["title"] = title
+    
+    if content is not None:
+        values["content"] = content
+        values.update(content_stats(content))
+    
+    if not values:
+        note = await get_note_by_id(db, note_id, user_id)
+        if note is not None and expected_updated_at not in (None, note.updated_at):
+            return None
+        return note
+    
+    values["change_seq"] = next_change_seq(user_id)
+    
+    while True:
+        # The version being replaced is kept as a revision. Reads do not
+        # start a write transaction here, so the UPDATE only applies if
+        # the note is still at that version, and is retried otherwise
+        result = await db.execute(previous_versions_statement(user_id, [note_id]))
+        previous = result.first()
+        
+        if previous is None or expected_updated_at not in (None, previous.updated_at):
+            await db.commit()
+            return None
+        
+        result = await db.scalars(
+            update(Note)
+            .where(Note.id == note_id, Note.user_id == user_id, Note.updated_at == previous.updated_at)
+            .values(**values)
+            .returning(Note),
+            execution_options={"synchronize_session": False}
+        )
+        note = result.first()
+        
+        if note is not None:
+            break
+        
+        await db.rollback()
+    
+    await bump_notes_version(db, user_id)
+    invalidate_cached_notes(await db.connection(), user_id, [note_id])
+    
+    rows = revision_rows(user_id, [(
+        previous,
+        previous.title if title is None else title,
+        previous.content if content is None else content
+    )])
+    if rows:
+        await db.execute(insert(NoteRevision), rows)
+    
+    await db.commit()
+    
+    return note
+
+
+async def delete_note(
+    db: AsyncSession,
+    note_id: int,
+    user_id: int,
+    expected_updated_at: Optional[datetime] = None
+) -> bool:
+    """
+    Delete a note.
+    
+    Args:
+        db: Async database session
+        note_id: ID of note to delete
+        user_id: ID of user
+        expected_updated_at: Only delete if the note still has this
+            updated_at (optional, for If-Match preconditions)
+        
+    Returns:
+        True if deleted, False if not found or the precondition failed
+    """
+    stmt = delete(Note).where(Note.id == note_id, Note.user_id == user_id)
+    
+    if expected_updated_at is not None:
+        stmt = stmt.where(Note.updated_at == expected_updated_at)
+    
+    result = await db.scalars(stmt.returning(Note.id))
+    deleted_id = result.first()
+    
+    if deleted_id is not None:
+        change_seq = await bump_notes_version(db, user_id)
+        await db.execute(insert(NoteTombstone).values(
+            note_id=deleted_id, user_id=user_id, change_seq=change_seq
+        ))
+        await db.execute(delete(NoteRevision).where(NoteRevision.note_id == deleted_id))
+        invalidate_cached_notes(await db.connection(), user_id, [deleted_id])
+    
+    await db.commit()
+    
+    return deleted_id is not None
@@ -0,0 +1,127 @@
+"""
+Async user repository for database operations.
+
+Mirrors user_repository for use with an AsyncSession. Password hashing
+is CPU bound, so it runs on the dedicated hashing pool.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from ..models import User
+from .user_repository import CurrentUser, current_user_statement, user_cache
+from ..utils.hashing import hashing_pool
+from ..utils.security import generate_salt, hash_password, verify_password
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    """
+    Get a user by username.
+    
+    Args:
+        db: Async database session
+        username: Username to search for
+        
+    Returns:
+        User object if found, None otherwise
+    """
+    result = await db.execute(select(User).where(User.username == username))
+
+    return result.scalars().first()
+
+
+async def get_current_user_by_id(db: AsyncSession, user_id: int) -> Optional[CurrentUser]:
+    """
+    Get the identity of a user, served from user_cache when possible.
+    
+    Args:
+        db: Async database session
+        user_id: ID of user
+        
+    Returns:
+        CurrentUser if found, None otherwise
+    """
+    user = user_cache.get(user_id)
+
+    if user is not None:
+        return user
+
+    result = await db.execute(current_user_statement.where(User.id == user_id))
+    row = result.first()
+
+    if row is None:
+        return None
+
+    user = CurrentUser(*row)
+    user_cache.set(user_id, user)
+
+    return user
+
+
+async def create_user(db: AsyncSession, username: str, password: str) -> User:
+    """
+    Create a new user with hashed password.
+    
+    Args:
+        db: Async database session
+        username: Username for new user
+        password: Plain text password
+        
+    Returns:
+        Created User object
+
+    Raises:
+        HashingPoolFull: If the hashing pool is saturated
+        IntegrityError: If the username is already taken
+    """
+    salt = generate_salt()
+    
+    password_hash = await hashing_pool.run(hash_password, password, salt)
+    
+    db_user = User(
+        username=username,
+        password_hash=password_hash,
+        salt=salt
+    )
+    
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    await db.refresh(db_user)
+    
+    return db_user
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """
+    Authenticate a user.
+    
+    Args:
+        db: Async database session
+        username: Username 
+        password: Plain text password
+        
+    Returns:
+        User object if credentials are valid, None otherwise
+
+    Raises:
+        HashingPoolFull: If the hashing pool is saturated
+    """
+    user = await get_user_by_username(db, username)
+    
+    if not user:
+        return None
+    
+    password_is_valid = await hashing_pool.run(
+        verify_password, password, user.salt, user.password_hash
+    )
+    
+    if not password_is_valid:
+        return None
+    
+    return user
@@ -2,10 +2,122 @@
 Note repository for database operations.
 """
 
+from datetime import datetime
+
+from sqlalchemy import (
+    Connection, Float, Row, Select, String, Text, and_, case, delete, event, func, insert,
+    literal, or_, select, text, type_coerce, union_all, update
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from ..config import NOTE_CACHE_MAX_BYTES, NOTE_CACHE_SIZE, NOTE_CACHE_TTL_SECONDS
+from ..database import engine
+from ..models import Note, NoteRevision, NoteTombstone, User, utcnow
+from ..note_stats import content_stats
+from ..revisions import rebuild, revision_values
+from ..search import build_match_query, user_match_query
+from ..utils.cache import LRUCache
+from ..utils.encoding import dumps
+from ..utils.pagination import decode_cursor, encode_cursor
+
+# (user_id, note_id) -> (encoded NoteResponse, updated_at)
+note_cache = LRUCache(
+    max_size=NOTE_CACHE_SIZE,
+    ttl_seconds=NOTE_CACHE_TTL_SECONDS,
+    max_bytes=NOTE_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[0])
+)
+
+# Key in Connection.info of the note_cache keys a transaction changed
+CHANGED_NOTES = "changed_notes"
+
+
+def invalidate_cached_notes(connection: Connection, user_id: int, note_ids: Iterable[int]) -> None:
+    """
+    Drop notes from note_cache once the current write transaction ends.
+
+    Invalidating right away would let a concurrent read cache the old row
+    again before the write commits, so the keys are kept on the
+    connection until it goes back to the pool, after its commit. That is
+    also after the batch commit in "queue" write mode.
+
+    Args:
+        connection: Connection of the write transaction
+        user_id: ID of user
+        note_ids: IDs of the changed or deleted notes
+    """
+    connection.info.setdefault(CHANGED_NOTES, set()).update(
+        (user_id, note_id) for note_id in note_ids
+    )
+
+
+def watch_note_writes(engine: Engine) -> None:
+    """
+    Invalidate the notes changed on engine's connections when they are
+    returned to the pool.
+    """
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        if connection_record is None:
+            return
+        changed = connection_record.info.pop(CHANGED_NOTES, None)
+        if changed:
+            note_cache.invalidate(changed)
+
+
+watch_note_writes(engine)
+
+
+def bump_notes_version(db: Session, user_id: int) -> int:
+    """
+    Record a change to a user's notes in users.notes_version.
 
-from ..models import Note
+    Runs in the caller's transaction. users.updated_at is carried over
+    explicitly so that its onupdate does not fire for note writes.
+
+    Returns:
+        The new version, used as the change_seq of the written notes
+    """
+    return db.scalar(
+        bump_notes_version_statement(user_id),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def bump_notes_version_statement(user_id: int):
+    """
+    UPDATE ... RETURNING statement behind bump_notes_version.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(notes_version=User.notes_version + 1, updated_at=User.updated_at)
+        .returning(User.notes_version)
+    )
+
+
+def next_change_seq(user_id: int):
+    """
+    Scalar subquery for the change_seq the next bump will return, so
+    that a note can be stamped in the same statement that writes it.
+    """
+    return select(User.notes_version + 1).where(User.id == user_id).scalar_subquery()
+
+
+def get_notes_version(db: Session, user_id: int) -> int:
+    """
+    Get the version of a user's note list.
+
+    Args:
+        db: Database session
+        user_id: ID of user
+
+    Returns:
+        Counter that changes whenever any of the user's notes changes
+    """
+    return db.scalar(select(User.notes_version).where(User.id == user_id)) or 0
 
 
 def create_note(db: Session, title: str, content: str, user_id: int) -> Note:
@@ -21,31 +133,208 @@ def create_note(db: Session, title: str, content: str, user_id: int) -> Note:
     Returns:
         Created Note object
     """
+    change_seq = bump_notes_version(db, user_id)
+    
     note = Note(
         title=title,
         content=content,
-        user_id=user_id
+        user_id=user_id,
+        change_seq=change_seq,
+        **content_stats(content)
     )
     
+    # The primary key comes back through INSERT ... RETURNING and
+    # defaults are set client-side, so no refresh is needed
     db.add(note)
     db.commit()
-    db.refresh(note)
     
     return note
 
 
-def get_user_notes(db: Session, user_id: int) -> List[Note]:
+# Columns of schemas.NoteResponse by field name, selectable for list pages
+NOTE_FIELDS = {
+    "id": Note.id,
+    "title": Note.title,
+    "content": Note.content,
+    "preview": Note.preview,
+    "word_count": Note.word_count,
+    "char_count": Note.char_count,
+    "content_hash": Note.content_hash,
+    "user_id": Note.user_id,
+    "created_at": Note.created_at,
+    "updated_at": Note.updated_at,
+}
+
+
+def user_notes_statement(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    order: str = "desc",
+    fields: Sequence[str] = tuple(NOTE_FIELDS)
+) -> Select:
     """
-    Get all notes for a specific user.
-    
+    Build the keyset-paginated SELECT for one page of a user's notes.
+
+    Shared by the sync and async repositories. One extra row is selected
+    so that the caller can tell whether another page exists.
+
+    Args:
+        user_id: ID of user
+        limit: Maximum number of notes in the page
+        cursor: Cursor returned with the previous page (optional)
+        order: "desc" for most recently updated first, "asc" otherwise
+        fields: Names from NOTE_FIELDS to select, in order
+
+    Returns:
+        SELECT of the requested fields, followed by id and updated_at
+        (needed for the cursor) when they were not requested
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    descending = order == "desc"
+
+    names = list(fields) + [name for name in ("id", "updated_at") if name not in fields]
+
+    stmt = select(*(NOTE_FIELDS[name] for name in names)).where(Note.user_id == user_id)
+
+    if cursor is not None:
+        updated_at, note_id = decode_cursor(cursor)
+
+        if descending:
+            stmt = stmt.where(or_(
+                Note.updated_at < updated_at,
+                and_(Note.updated_at == updated_at, Note.id < note_id)
+            ))
+        else:
+            stmt = stmt.where(or_(
+                Note.updated_at > updated_at,
+                and_(Note.updated_at == updated_at, Note.id > note_id)
+            ))
+
+    if descending:
+        stmt = stmt.order_by(Note.updated_at.desc(), Note.id.desc())
+    else:
+        stmt = stmt.order_by(Note.updated_at.asc(), Note.id.asc())
+
+    return stmt.limit(limit + 1)
+
+
+def paginate(notes: List[Row], limit: int) -> Tuple[List[Row], Optional[str]]:
+    """
+    Trim the extra row selected by user_notes_statement and build the
+    cursor for the next page.
+
+    Args:
+        notes: Rows returned by the page statement
+        limit: Requested page size
+
+    Returns:
+        Tuple of (list of rows, cursor for the next page or None)
+    """
+    if len(notes) <= limit:
+        return notes, None
+
+    notes = notes[:limit]
+    last = notes[-1]
+
+    return notes, encode_cursor(last.updated_at, last.id)
+
+
+def get_user_notes(
+    db: Session,
+    user_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    order: str = "desc",
+    fields: Sequence[str] = tuple(NOTE_FIELDS)
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Get one page of notes for a specific user.
+
+    Notes are ordered by (updated_at, id) and paginated with a keyset
+    cursor, so every page is served from the (user_id, updated_at, id)
+    index regardless of how deep it is. Rows are plain column tuples of
+    the requested fields rather than ORM objects, so content is neither
+    read nor decompressed unless asked for.
+
     Args:
         db: Database session
         user_id: ID of user
-        
+        limit: Maximum number of notes to return
+        cursor: Cursor returned with the previous page (optional)
+        order: "desc" for most recently updated first, "asc" otherwise
+        fields: Names from NOTE_FIELDS to select (default: all)
+
     Returns:
-        List of Note objects
+        Tuple of (list of rows, cursor for the next page or None)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
     """
-    return db.query(Note).filter(Note.user_id == user_id).all()
+    stmt = user_notes_statement(user_id, limit, cursor, order, fields)
+
+    notes = db.execute(stmt).all()
+
+    return paginate(list(notes), limit)
+
+
+SEARCH_STATEMENT = text("""
+    SELECT notes.id, notes.title, notes.updated_at,
+           highlight(notes_fts, 0, '<mark>', '</mark>') AS title_highlight,
+           snippet(notes_fts, 1, '<mark>', '</mark>', '…', 24) AS snippet,
+           bm25(notes_fts, 10.0, 1.0, 0.0) AS rank
+    FROM notes_fts
+    JOIN notes ON notes.id = notes_fts.rowid
+    WHERE notes_fts MATCH :query AND notes.user_id = :user_id
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+""").columns(
+    Note.id, Note.title, Note.updated_at,
+    title_highlight=String, snippet=String, rank=Float
+)
+
+
+def search_notes(
+    db: Session,
+    user_id: int,
+    q: str,
+    limit: int = 20,
+    offset: int = 0
+) -> Tuple[List[Row], Optional[int]]:
+    """
+    Full-text search over a user's note titles and contents.
+
+    Results are ranked by BM25 with title matches weighted above content
+    matches, and carry highlighted snippets.
+
+    Args:
+        db: Database session
+        user_id: ID of user
+        q: Search text
+        limit: Maximum number of results
+        offset: Number of results to skip
+
+    Returns:
+        Tuple of (result rows, offset of the next page or None)
+    """
+    query = build_match_query(q)
+
+    if not query:
+        return [], None
+
+    rows = db.execute(SEARCH_STATEMENT, {
+        "query": user_match_query(user_id, query),
+        "user_id": user_id,
+        "limit": limit + 1,
+        "offset": offset
+    }).all()
+
+    if len(rows) > limit:
+        return rows[:limit], offset + limit
+
+    return rows, None
 
 
 def get_note_by_id(db: Session, note_id: int, user_id: int) -> Optional[Note]:
@@ -66,15 +355,166 @@ def get_note_by_id(db: Session, note_id: int, user_id: int) -> Optional[Note]:
     ).first()
 
 
+def note_statement(note_id: int, user_id: int) -> Select:
+    """
+    SELECT of every NOTE_FIELDS column of one of a user's notes.
+    """
+    return select(*NOTE_FIELDS.values()).where(Note.id == note_id, Note.user_id == user_id)
+
+
+def cache_note_row(row: Row, user_id: int, generation: int) -> Tuple[bytes, datetime]:
+    """
+    Encode a row of note_statement as a NoteResponse body and cache it.
+
+    Args:
+        row: Note row
+        user_id: ID of user
+        generation: note_cache.generation read before row was loaded
+
+    Returns:
+        Tuple of (JSON body, updated_at)
+    """
+    entry = (dumps(dict(zip(NOTE_FIELDS, row))), row.updated_at)
+    note_cache.set((user_id, row.id), entry, generation)
+
+    return entry
+
+
+def get_cached_note_json(note_id: int, user_id: int) -> Optional[Tuple[bytes, datetime]]:
+    """
+    Get a note's encoded response from note_cache, without the database.
+
+    Returns:
+        Tuple of (JSON body, updated_at) if cached, None otherwise
+    """
+    return note_cache.get((user_id, note_id))
+
+
+def load_note_json(db: Session, note_id: int, user_id: int) -> Optional[Tuple[bytes, datetime]]:
+    """
+    Load a note as an encoded NoteResponse body and add it to note_cache.
+
+    The row is encoded directly, without an ORM object or Pydantic model.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user requesting the note
+
+    Returns:
+        Tuple of (JSON body, updated_at) if found, None otherwise
+    """
+    generation = note_cache.generation
+
+    row = db.execute(note_statement(note_id, user_id)).first()
+
+    if row is None:
+        return None
+
+    return cache_note_row(row, user_id, generation)
+
+
+def get_stored_content(db: Session, note_id: int, user_id: int) -> Optional[Union[str, bytes]]:
+    """
+    Get a note's content exactly as stored, possibly still compressed.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user requesting the note
+
+    Returns:
+        Stored content (str, or compressed bytes) if found, None otherwise
+    """
+    return db.scalar(
+        select(type_coerce(Note.content, Text()))
+        .where(Note.id == note_id, Note.user_id == user_id)
+    )
+
+
+def get_note_content(db: Session, note_id: int, user_id: int) -> Optional[Row]:
+    """
+    Get a note's content together with its updated_at.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user requesting the note
+
+    Returns:
+        Row of (content, updated_at) if found, None otherwise
+    """
+    return db.execute(
+        select(Note.content, Note.updated_at)
+        .where(Note.id == note_id, Note.user_id == user_id)
+    ).first()
+
+
+def get_note_version(db: Session, note_id: int, user_id: int) -> Optional[datetime]:
+    """
+    Get a note's updated_at without loading its content.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user requesting the note
+
+    Returns:
+        updated_at if the note exists and belongs to user, None otherwise
+    """
+    return db.scalar(
+        select(Note.updated_at).where(Note.id == note_id, Note.user_id == user_id)
+    )
+
+
+def previous_versions_statement(user_id: int, note_ids: Iterable[int]) -> Select:
+    """
+    SELECT of the versions of notes that a write is about to replace:
+    id, title, content, updated_at and the number of their latest
+    revision.
+    """
+    latest = (
+        select(func.max(NoteRevision.number))
+        .where(NoteRevision.note_id == Note.id)
+        .scalar_subquery()
+    )
+
+    return select(
+        Note.id, Note.title, Note.content, Note.updated_at, latest.label("number")
+    ).where(Note.user_id == user_id, Note.id.in_(note_ids))
+
+
+def revision_rows(user_id: int, replaced: Iterable[Tuple[Row, str, str]]) -> List[Dict]:
+    """
+    Build the note_revisions rows keeping replaced versions of notes.
+
+    Args:
+        user_id: ID of user
+        replaced: Tuples of (row of previous_versions_statement, new
+            title, new content); unchanged notes get no revision
+
+    Returns:
+        Rows to insert
+    """
+    return [
+        {"note_id": previous.id, "user_id": user_id, **revision_values(previous, content)}
+        for previous, title, content in replaced
+        if title != previous.title or content != previous.content
+    ]
+
+
 def update_note(
     db: Session,
     note_id: int,
     user_id: int,
     title: Optional[str] = None,
-    content: Optional[str] = None
+    content: Optional[str] = None,
+    expected_updated_at: Optional[datetime] = None
 ) -> Optional[Note]:
     """
     Update a note's title or content.
+
+    The version it replaces is kept as a NoteRevision.
     
     Args:
         db: Database session
@@ -82,28 +522,71 @@ def update_note(
         user_id: ID of user (for security check)
         title: New title (optional)
         content: New content (optional)
+        expected_updated_at: Only update if the note still has this
+            updated_at (optional, for If-Match preconditions)
         
     Returns:
-        Updated Note object if successful, None if not found
+        Updated Note object if successful, None if not found or the
+        precondition failed
     """
-    note = get_note_by_id(db, note_id, user_id)
-    
-    if not note:
-        return None
+    values = {}
     
     if title is not None:
-        note.title = title
+        values["title"] = title
     
     if content is not None:
-        note.content = content
+        values["content"] = content
+        values.update(content_stats(content))
+    
+    if not values:
+        note = get_note_by_id(db, note_id, user_id)
+        if note is not None and expected_updated_at not in (None, note.updated_at):
+            return None
+        return note
+    
+    # The version being replaced is kept as a revision. The write
+    # transaction (BEGIN IMMEDIATE) holds the database lock from this
+    # SELECT on, so the note cannot change before the UPDATE
+    previous = db.execute(previous_versions_statement(user_id, [note_id])).first()
+    note = None
+    
+    if previous is not None:
+        stmt = update(Note).where(Note.id == note_id, Note.user_id == user_id)
+        
+        if expected_updated_at is not None:
+            stmt = stmt.where(Note.updated_at == expected_updated_at)
+        
+        values["change_seq"] = next_change_seq(user_id)
+        
+        # Conditional write and read back in a single statement
+        note = db.scalars(
+            stmt.values(**values).returning(Note),
+            execution_options={"synchronize_session": False}
+        ).first()
+    
+    if note is not None:
+        bump_notes_version(db, user_id)
+        invalidate_cached_notes(db.connection(), user_id, [note_id])
+        
+        rows = revision_rows(user_id, [(
+            previous,
+            previous.title if title is None else title,
+            previous.content if content is None else content
+        )])
+        if rows:
+            db.execute(insert(NoteRevision), rows)
     
     db.commit()
-    db.refresh(note)
     
     return note
 
 
-def delete_note(db: Session, note_id: int, user_id: int) -> bool:
+def delete_note(
+    db: Session,
+    note_id: int,
+    user_id: int,
+    expected_updated_at: Optional[datetime] = None
+) -> bool:
     """
     Delete a note.
     
@@ -111,16 +594,426 @@ def delete_note(db: Session, note_id: int, user_id: int) -> bool:
         db: Database session
         note_id: ID of note to delete
         user_id: ID of user
+        expected_updated_at: Only delete if the note still has this
+            updated_at (optional, for If-Match preconditions)
         
     Returns:
-        True if deleted, False if not found
+        True if deleted, False if not found or the precondition failed
     """
-    note = get_note_by_id(db, note_id, user_id)
+    stmt = delete(Note).where(Note.id == note_id, Note.user_id == user_id)
+    
+    if expected_updated_at is not None:
+        stmt = stmt.where(Note.updated_at == expected_updated_at)
     
-    if not note:
-        return False
+    deleted_id = db.scalars(stmt.returning(Note.id)).first()
+    
+    if deleted_id is not None:
+        add_tombstones(db, [deleted_id], user_id, bump_notes_version(db, user_id))
+        db.execute(delete(NoteRevision).where(NoteRevision.note_id == deleted_id))
+        invalidate_cached_notes(db.connection(), user_id, [deleted_id])
     
-    db.delete(note)
     db.commit()
     
-    return True
\ No newline at end of file
+    return deleted_id is not None
+
+
+def create_notes(db: Session, notes: List[Dict[str, str]], user_id: int) -> List[Note]:
+    """
+    Create many notes for a user in one transaction.
+
+    Rows are written with a single multi-row INSERT ... RETURNING.
+
+    Args:
+        db: Database session
+        notes: Dicts with "title" and "content"
+        user_id: ID of user creating the notes
+
+    Returns:
+        Created Note objects, in input order
+    """
+    change_seq = bump_notes_version(db, user_id)
+
+    rows = [
+        {
+            "title": note["title"],
+            "content": note["content"],
+            "user_id": user_id,
+            "change_seq": change_seq,
+            **content_stats(note["content"])
+        }
+        for note in notes
+    ]
+
+    created = db.scalars(insert(Note).returning(Note, sort_by_parameter_order=True), rows).all()
+    db.commit()
+
+    return list(created)
+
+
+# Fields of every note in an export, in output order
+EXPORT_FIELDS = ("id", "title", "content", "created_at", "updated_at")
+
+
+def export_notes(db: Session, user_id: int, batch_size: int = 1000) -> Iterator[List[Row]]:
+    """
+    Read all of a user's notes in batches.
+
+    Rows are fetched batch_size at a time with yield_per from a single
+    SELECT, so memory use does not grow with the number of notes and
+    every batch comes from the same snapshot of the database.
+
+    Args:
+        db: Database session
+        user_id: ID of user
+        batch_size: Number of rows per batch
+
+    Returns:
+        Iterator over lists of EXPORT_FIELDS rows, ordered by ID
+    """
+    stmt = (
+        select(*(NOTE_FIELDS[name] for name in EXPORT_FIELDS))
+        .where(Note.user_id == user_id)
+        .order_by(Note.id)
+    )
+
+    result = db.execute(stmt, execution_options={"yield_per": batch_size})
+
+    for partition in result.partitions():
+        yield partition
+
+
+def import_notes(db: Session, notes: List[Dict], user_id: int) -> int:
+    """
+    Insert many notes for a user in one transaction.
+
+    Unlike create_notes, the rows are written with an executemany INSERT
+    without RETURNING and nothing is read back, which keeps large imports
+    cheap. Timestamps given in the input are kept.
+
+    Args:
+        db: Database session
+        notes: Dicts with "title", "content" and optional "created_at"
+            and "updated_at"
+        user_id: ID of user importing the notes
+
+    Returns:
+        Number of notes inserted
+    """
+    change_seq = bump_notes_version(db, user_id)
+    now = utcnow()
+
+    rows = []
+    for note in notes:
+        created_at = note.get("created_at") or now
+        rows.append({
+            "title": note["title"],
+            "content": note["content"],
+            "user_id": user_id,
+            "change_seq": change_seq,
+            "created_at": created_at,
+            "updated_at": note.get("updated_at") or created_at,
+            **content_stats(note["content"])
+        })
+
+    db.execute(insert(Note), rows)
+    db.commit()
+
+    return len(rows)
+
+
+def update_notes(db: Session, changes: List[Dict], user_id: int) -> Tuple[Dict[int, Note], Set[int]]:
+    """
+    Update many notes of a user in one transaction.
+
+    Like update_note, an item with neither title nor content leaves its
+    note (and the notes version) untouched. All changed notes are written
+    and read back by a single UPDATE ... RETURNING.
+
+    Args:
+        db: Database session
+        changes: Dicts with "id" and optional "title"/"content"
+        user_id: ID of user (for security check)
+
+    Returns:
+        Tuple of (Note objects by ID, IDs of the notes that were
+        changed); IDs that were not found (or belong to another user)
+        are absent
+    """
+    ids = {change["id"] for change in changes}
+
+    previous = {
+        row.id: row
+        for row in db.execute(previous_versions_statement(user_id, ids))
+    }
+
+    if not previous:
+        return {}, set()
+
+    # Changes to the same note are merged, so that each note is written
+    # (and gets a revision) once
+    merged: Dict[int, Dict] = {note_id: {} for note_id in previous}
+    for change in changes:
+        if change["id"] in merged:
+            merged[change["id"]].update(
+                (key, value) for key, value in change.items()
+                if key != "id" and value is not None
+            )
+
+    rows = {note_id: values for note_id, values in merged.items() if values}
+    notes: Dict[int, Note] = {}
+
+    if rows:
+        for values in rows.values():
+            if "content" in values:
+                values.update(content_stats(values["content"]))
+
+        # Each changed column takes the value of every note from a CASE
+        # on id, so notes changing different columns share one statement
+        columns = {key for values in rows.values() for key in values}
+        assignments = {
+            key: case(
+                {
+                    note_id: type_coerce(values[key], getattr(Note, key).type)
+                    for note_id, values in rows.items() if key in values
+                },
+                value=Note.id,
+                else_=getattr(Note, key)
+            )
+            for key in columns
+        }
+
+        change_seq = bump_notes_version(db, user_id)
+
+        updated = db.scalars(
+            update(Note)
+            .where(Note.id.in_(rows), Note.user_id == user_id)
+            .values(**assignments, updated_at=utcnow(), change_seq=change_seq)
+            .returning(Note),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ).all()
+        notes.update((note.id, note) for note in updated)
+
+        invalidate_cached_notes(db.connection(), user_id, rows)
+
+        revisions = revision_rows(user_id, [
+            (
+                previous[note_id],
+                values.get("title", previous[note_id].title),
+                values.get("content", previous[note_id].content)
+            )
+            for note_id, values in rows.items()
+        ])
+        if revisions:
+            db.execute(insert(NoteRevision), revisions)
+
+    unchanged = set(previous) - set(rows)
+    if unchanged:
+        notes.update(
+            (note.id, note)
+            for note in db.scalars(select(Note).where(Note.id.in_(unchanged)))
+        )
+
+    db.commit()
+
+    return notes, set(rows)
+
+
+def delete_notes(db: Session, note_ids: List[int], user_id: int) -> Set[int]:
+    """
+    Delete many notes of a user in one transaction.
+
+    Args:
+        db: Database session
+        note_ids: IDs of notes to delete
+        user_id: ID of user
+
+    Returns:
+        IDs that were deleted
+    """
+    deleted = db.scalars(
+        delete(Note)
+        .where(Note.user_id == user_id, Note.id.in_(note_ids))
+        .returning(Note.id)
+    ).all()
+
+    if deleted:
+        add_tombstones(db, deleted, user_id, bump_notes_version(db, user_id))
+        db.execute(delete(NoteRevision).where(NoteRevision.note_id.in_(deleted)))
+        invalidate_cached_notes(db.connection(), user_id, deleted)
+
+    db.commit()
+
+    return set(deleted)
+
+
+def get_revisions(
+    db: Session,
+    note_id: int,
+    user_id: int,
+    limit: int = 50,
+    before: Optional[int] = None
+) -> Tuple[List[Row], Optional[int]]:
+    """
+    Get one page of a note's revisions, newest first, without content.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user
+        limit: Maximum number of revisions to return
+        before: Only return revisions numbered below this (optional)
+
+    Returns:
+        Tuple of (rows of number, title, char_count and updated_at,
+        before value of the next page or None)
+    """
+    stmt = select(
+        NoteRevision.number, NoteRevision.title, NoteRevision.char_count, NoteRevision.updated_at
+    ).where(NoteRevision.note_id == note_id, NoteRevision.user_id == user_id)
+
+    if before is not None:
+        stmt = stmt.where(NoteRevision.number < before)
+
+    rows = db.execute(stmt.order_by(NoteRevision.number.desc()).limit(limit + 1)).all()
+
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].number
+
+    return rows, None
+
+
+def get_revision(db: Session, note_id: int, user_id: int, number: int) -> Optional[Tuple[Row, str]]:
+    """
+    Get one revision of a note with its content rebuilt.
+
+    Reads the revisions from the wanted one up to the nearest newer
+    keyframe, or up to the latest revision and the note's current
+    content if there is no newer keyframe, and applies their deltas.
+
+    Args:
+        db: Database session
+        note_id: ID of note
+        user_id: ID of user
+        number: Revision number
+
+    Returns:
+        Tuple of (row of number, title, char_count and updated_at,
+        content) if found, None otherwise
+    """
+    keyframe = (
+        select(func.min(NoteRevision.number))
+        .where(
+            NoteRevision.note_id == note_id,
+            NoteRevision.number >= number,
+            NoteRevision.keyframe
+        )
+        .scalar_subquery()
+    )
+
+    rows = db.execute(
+        select(
+            NoteRevision.number, NoteRevision.title, NoteRevision.char_count,
+            NoteRevision.updated_at, NoteRevision.keyframe, NoteRevision.data
+        )
+        .where(
+            NoteRevision.note_id == note_id,
+            NoteRevision.user_id == user_id,
+            NoteRevision.number >= number,
+            or_(keyframe.is_(None), NoteRevision.number <= keyframe)
+        )
+        .order_by(NoteRevision.number.desc())
+    ).all()
+
+    if not rows or rows[-1].number != number:
+        return None
+
+    current = None
+    if not rows[0].keyframe:
+        current = db.scalar(select(Note.content).where(Note.id == note_id, Note.user_id == user_id))
+
+    return rows[-1], rebuild(current, rows)
+
+
+def add_tombstones(db: Session, note_ids: List[int], user_id: int, change_seq: int) -> None:
+    """
+    Record deleted notes for the change feed.
+
+    Runs in the caller's transaction.
+
+    Args:
+        db: Database session
+        note_ids: IDs of the deleted notes
+        user_id: ID of user
+        change_seq: Change sequence of the delete
+    """
+    db.execute(insert(NoteTombstone), [
+        {"note_id": note_id, "user_id": user_id, "change_seq": change_seq}
+        for note_id in note_ids
+    ])
+
+
+def get_changes(
+    db: Session,
+    user_id: int,
+    since_seq: int,
+    since_id: int,
+    limit: int = 500
+) -> Tuple[List[Tuple[int, int, Optional[Note]]], bool]:
+    """
+    Get notes changed and deleted after a point in the change feed.
+
+    Changes are ordered by (change_seq, note_id) and read from the
+    (user_id, change_seq) indexes on notes and note_tombstones, so a sync
+    costs time proportional to the number of changes.
+
+    Args:
+        db: Database session
+        user_id: ID of user
+        since_seq: change_seq of the last change already seen
+        since_id: note ID of the last change already seen
+        limit: Maximum number of changes to return
+
+    Returns:
+        Tuple of (list of (change_seq, note_id, Note or None if deleted),
+        whether more changes remain)
+    """
+    def after(seq_column, id_column):
+        return or_(
+            seq_column > since_seq,
+            and_(seq_column == since_seq, id_column > since_id)
+        )
+
+    updated = (
+        select(Note.change_seq, Note.id, literal(False).label("deleted"))
+        .where(Note.user_id == user_id, after(Note.change_seq, Note.id))
+        .order_by(Note.change_seq, Note.id)
+        .limit(limit + 1)
+    )
+    deleted = (
+        select(NoteTombstone.change_seq, NoteTombstone.note_id, literal(True))
+        .where(NoteTombstone.user_id == user_id, after(NoteTombstone.change_seq, NoteTombstone.note_id))
+        .order_by(NoteTombstone.change_seq, NoteTombstone.note_id)
+        .limit(limit + 1)
+    )
+
+    changes = db.execute(
+        union_all(updated.subquery().select(), deleted.subquery().select())
+        .order_by("change_seq", "id")
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    note_ids = [note_id for _, note_id, is_deleted in changes if not is_deleted]
+    notes = {}
+    if note_ids:
+        notes = {
+            note.id: note
+            for note in db.scalars(select(Note).where(Note.id.in_(note_ids)))
+        }
+
+    return [
+        (change_seq, note_id, None if is_deleted else notes.get(note_id))
+        for change_seq, note_id, is_deleted in changes
+    ], has_more
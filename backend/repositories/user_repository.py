@@ -2,13 +2,76 @@
 User repository for database operations.
 """
 
+from datetime import datetime
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from ..config import USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
 from ..models import User
+from ..utils.cache import LRUCache
 from ..utils.security import generate_salt, hash_password, verify_password
 
 
+class CurrentUser:
+    """
+    Lightweight identity of an authenticated user.
+
+    Returned by get_current_user instead of a session-bound User so that
+    it can be cached across requests.
+    """
+    __slots__ = ("id", "username", "created_at")
+
+    def __init__(self, id: int, username: str, created_at: datetime):
+        self.id = id
+        self.username = username
+        self.created_at = created_at
+
+
+# user_id -> CurrentUser
+user_cache = LRUCache(max_size=USER_CACHE_SIZE, ttl_seconds=USER_CACHE_TTL_SECONDS)
+
+current_user_statement = select(User.id, User.username, User.created_at)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    """
+    Drop a user from user_cache whenever its row changes.
+    """
+    user_cache.pop(target.id)
+
+
+def get_current_user_by_id(db: Session, user_id: int) -> Optional[CurrentUser]:
+    """
+    Get the identity of a user, served from user_cache when possible.
+    
+    Args:
+        db: Database session
+        user_id: ID of user
+        
+    Returns:
+        CurrentUser if found, None otherwise
+    """
+    user = user_cache.get(user_id)
+
+    if user is not None:
+        return user
+
+    row = db.execute(current_user_statement.where(User.id == user_id)).first()
+
+    if row is None:
+        return None
+
+    user = CurrentUser(*row)
+    user_cache.set(user_id, user)
+
+    return user
+
+
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """
     Get a user by username.
@@ -39,6 +102,29 @@ def create_user(db: Session, username: str, password: str) -> User:
     
     password_hash = hash_password(password, salt)
     
+    return add_user(db, username, password_hash, salt)
+
+
+def add_user(db: Session, username: str, password_hash: str, salt: str) -> User:
+    """
+    Insert a user whose password has already been hashed.
+
+    Used by routes that hash on the dedicated hashing pool. The user is
+    not read back after the commit, which would open another write
+    transaction; its columns are all set on the object already.
+    
+    Args:
+        db: Database session
+        username: Username for new user
+        password_hash: Hex PBKDF2 hash of the password
+        salt: Salt used for the hash
+        
+    Returns:
+        Created User object
+
+    Raises:
+        IntegrityError: If the username is already taken
+    """
     db_user = User(
         username=username,
         password_hash=password_hash,
@@ -46,8 +132,11 @@ def create_user(db: Session, username: str, password: str) -> User:
     )
     
     db.add(db_user)
-    db.commit()  
-    db.refresh(db_user) 
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
     
     return db_user
 
@@ -0,0 +1,169 @@
+"""
+Note revision history stored as reverse deltas.
+
+Every update of a note keeps the version it replaces as a NoteRevision.
+Most revisions hold a reverse delta, which rebuilds the replaced content
+from the content of the version after it. Every
+REVISION_KEYFRAME_INTERVAL-th revision holds the full content instead (a
+keyframe), so rebuilding any revision applies fewer than
+REVISION_KEYFRAME_INTERVAL deltas, starting from the nearest newer
+keyframe or from the note's current content.
+
+A delta is a JSON list whose items are either [start, end], copying
+newer[start:end], or a string inserted as-is. Edits usually touch one
+region, so the common prefix and suffix are found first and only the
+changed middle is diffed, line by line. Revision data is compressed at
+rest like note content.
+"""
+
+import json
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Union
+
+from .config import REVISION_KEYFRAME_INTERVAL
+from .text_patch import split_lines
+
+Delta = List[Union[List[int], str]]
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    # Binary search over slice comparisons, which run in C
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(a: str, b: str, limit: int) -> int:
+    low, high = 0, min(len(a), len(b), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def make_delta(newer: str, older: str) -> Delta:
+    """
+    Build the delta that turns newer into older.
+
+    Args:
+        newer: Content of the later version
+        older: Content of the version to rebuild
+
+    Returns:
+        Delta items, see the module docstring
+    """
+    delta: Delta = []
+
+    def copy(start: int, end: int):
+        if start == end:
+            return
+        if delta and isinstance(delta[-1], list) and delta[-1][1] == start:
+            delta[-1][1] = end
+        else:
+            delta.append([start, end])
+
+    def insert(text: str):
+        if not text:
+            return
+        if delta and isinstance(delta[-1], str):
+            delta[-1] += text
+        else:
+            delta.append(text)
+
+    prefix = common_prefix_length(newer, older)
+    suffix = common_suffix_length(newer, older, min(len(newer), len(older)) - prefix)
+    newer_middle = newer[prefix:len(newer) - suffix]
+    older_middle = older[prefix:len(older) - suffix]
+
+    copy(0, prefix)
+
+    newer_lines = split_lines(newer_middle)
+    older_lines = split_lines(older_middle)
+
+    if len(newer_lines) > 1 and len(older_lines) > 1:
+        # Character offset in newer of every line of its middle
+        offsets = [prefix]
+        for line in newer_lines:
+            offsets.append(offsets[-1] + len(line))
+
+        matcher = SequenceMatcher(None, newer_lines, older_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                copy(offsets[i1], offsets[i2])
+            else:
+                insert("".join(older_lines[j1:j2]))
+    else:
+        insert(older_middle)
+
+    copy(len(newer) - suffix, len(newer))
+
+    return delta
+
+
+def apply_delta(newer: str, delta: Delta) -> str:
+    """
+    Rebuild the older content from newer and a delta made by make_delta.
+    """
+    return "".join(
+        newer[item[0]:item[1]] if isinstance(item, list) else item
+        for item in delta
+    )
+
+
+def revision_values(previous, new_content: str, keyframe_interval: int = REVISION_KEYFRAME_INTERVAL) -> Dict:
+    """
+    Column values of the revision that keeps a note's previous version.
+
+    Args:
+        previous: Row with number (the note's latest revision number or
+            None), title, content and updated_at of the replaced version
+        new_content: Content of the version replacing it
+
+    Returns:
+        Values for note_revisions, without note_id and user_id
+    """
+    number = (previous.number or 0) + 1
+    keyframe = number % keyframe_interval == 0
+
+    if keyframe:
+        data = previous.content
+    else:
+        data = json.dumps(make_delta(new_content, previous.content), ensure_ascii=False, separators=(",", ":"))
+
+    return {
+        "number": number,
+        "title": previous.title,
+        "char_count": len(previous.content),
+        "updated_at": previous.updated_at,
+        "keyframe": keyframe,
+        "data": data,
+    }
+
+
+def rebuild(current: str, revisions: Iterable) -> str:
+    """
+    Rebuild the content of the last of revisions.
+
+    Args:
+        current: The note's current content
+        revisions: Rows with keyframe and data, from the newest needed
+            (a keyframe, or the note's latest revision) down to the
+            wanted revision
+
+    Returns:
+        Content of the wanted revision
+    """
+    content = current
+
+    for revision in revisions:
+        content = revision.data if revision.keyframe else apply_delta(content, json.loads(revision.data))
+
+    return content
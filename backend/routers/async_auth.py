@@ -0,0 +1,96 @@
+"""
+Authentication router for async database mode.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db
+from ..schemas import UserCreate, UserResponse, UserLogin, LoginResponse
+from ..repositories import async_user_repository
+from ..auth import create_session
+from ..dependencies import get_current_user_async
+from ..repositories.user_repository import CurrentUser
+from ..config import ACCESS_TOKEN_EXPIRE_MINUTES
+
+
+router = APIRouter(
+    prefix="/auth",
+    tags=["authentication"]
+)
+
+
+@router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new user account.
+        
+    Raises:
+        400: If username already exists
+    """
+    existing_user = await async_user_repository.get_user_by_username(db, user_data.username)
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+    
+    # Create new user; a concurrent signup may have taken the username
+    # since the check
+    try:
+        user = await async_user_repository.create_user(
+            db=db,
+            username=user_data.username,
+            password=user_data.password
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+    
+    return user
+
+
+@router.post("/login", response_model=LoginResponse)
+async def login(credentials: UserLogin, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Log in a user.
+        
+    Raises:
+        401: If credentials are invalid
+    """
+    user = await async_user_repository.authenticate_user(
+        db=db,
+        username=credentials.username,
+        password=credentials.password
+    )
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+    
+    session_id = create_session(user_id=user.id, username=user.username)
+
+    response.set_cookie(
+        key="session_id",
+        value=session_id,
+        httponly=True,
+        max_age=60 * ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+    
+    return {
+        "message": "Login successful",
+        "user": user
+    }
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: CurrentUser = Depends(get_current_user_async)):
+    """
+    Get current authenticated user.
+    """
+    return current_user
@@ -0,0 +1,217 @@
+"""
+Notes router for async database mode.
+
+Serves the core CRUD routes from the event loop with an AsyncSession.
+Note IDs use the int path convertor so that other /notes routes fall
+through to the sync router.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Literal, Optional
+
+from ..database import get_async_db
+from ..schemas import NoteCreate, NoteUpdate, NoteResponse, NoteListPage
+from ..repositories import async_note_repository, note_repository
+from ..dependencies import get_current_user_async
+from ..repositories.user_repository import CurrentUser
+from ..utils.etags import etag_matches, list_etag, note_etag
+from ..utils.pagination import InvalidCursorError
+from .notes import LIST_RESPONSES, encode_note_list, parse_fields, raise_write_failed
+
+router = APIRouter(
+    prefix="/notes",
+    tags=["notes"]
+)
+
+
+async def check_if_match(
+    db: AsyncSession,
+    note_id: int,
+    user_id: int,
+    if_match: Optional[str]
+) -> Optional[datetime]:
+    """
+    Async variant of notes.check_if_match.
+    """
+    if if_match is None:
+        return None
+
+    updated_at = await async_note_repository.get_note_version(db, note_id, user_id)
+
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+
+    if not etag_matches(if_match, note_etag(note_id, updated_at), weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Note has been modified"
+        )
+
+    return updated_at
+
+
+@router.post("/", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
+async def create_note(
+    note_data: NoteCreate,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new note for the authenticated user.
+    """
+    note = await async_note_repository.create_note(
+        db=db,
+        title=note_data.title,
+        content=note_data.content,
+        user_id=current_user.id
+    )
+    
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    
+    return note
+
+
+@router.get("/", responses=LIST_RESPONSES)
+async def get_notes(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    order: Literal["asc", "desc"] = "desc",
+    fields: str = "summary",
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get one page of notes for the authenticated user.
+    """
+    field_names = parse_fields(fields)
+    notes_version = await async_note_repository.get_notes_version(db, current_user.id)
+    etag = list_etag(notes_version, limit, cursor, order, field_names)
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    try:
+        notes, next_cursor = await async_note_repository.get_user_notes(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            order=order,
+            fields=field_names
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return Response(
+        encode_note_list(notes, next_cursor, field_names),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+
+@router.get("/{note_id:int}", response_model=NoteResponse)
+async def get_note(
+    note_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific note by ID.
+    """
+    note = note_repository.get_cached_note_json(note_id, current_user.id)
+    
+    if note is None and if_none_match is not None:
+        updated_at = await async_note_repository.get_note_version(db, note_id, current_user.id)
+        
+        if updated_at is not None:
+            etag = note_etag(note_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    if note is None:
+        note = await async_note_repository.load_note_json(
+            db=db,
+            note_id=note_id,
+            user_id=current_user.id
+        )
+    
+    if note is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+    
+    body, updated_at = note
+    etag = note_etag(note_id, updated_at)
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.put("/{note_id:int}", response_model=NoteResponse)
+async def update_note(
+    note_id: int,
+    note_data: NoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a note's title and content.
+    """
+    expected_updated_at = await check_if_match(db, note_id, current_user.id, if_match)
+    
+    note = await async_note_repository.update_note(
+        db=db,
+        note_id=note_id,
+        user_id=current_user.id,
+        title=note_data.title,
+        content=note_data.content,
+        expected_updated_at=expected_updated_at
+    )
+    
+    if not note:
+        raise_write_failed(expected_updated_at)
+    
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    
+    return note
+
+
+@router.delete("/{note_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_note(
+    note_id: int,
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a note.
+    """
+    expected_updated_at = await check_if_match(db, note_id, current_user.id, if_match)
+    
+    success = await async_note_repository.delete_note(
+        db=db,
+        note_id=note_id,
+        user_id=current_user.id,
+        expected_updated_at=expected_updated_at
+    )
+    
+    if not success:
+        raise_write_failed(expected_updated_at)
+    
+    return None
@@ -3,15 +3,19 @@ Authentication router.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from ..database import get_db
+from ..database import get_read_db, get_write_db
 from ..schemas import UserCreate, UserResponse, UserLogin, LoginResponse
 from ..repositories import user_repository
 from ..auth import create_session, delete_session
 from ..dependencies import get_current_user
-from ..models import User
+from ..repositories.user_repository import CurrentUser
 from ..config import ACCESS_TOKEN_EXPIRE_MINUTES
+from ..utils.hashing import hashing_pool
+from ..utils.security import generate_salt, hash_password, verify_password
 
 
 router = APIRouter(
@@ -21,12 +25,23 @@ router = APIRouter(
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(
+    user_data: UserCreate,
+    read_db: Session = Depends(get_read_db),
+    db: Session = Depends(get_write_db)
+):
     """
     Create a new user account.
+
+    Database work runs on the request threadpool and the password hash
+    on the dedicated hashing pool, so signups never tie up a request
+    worker while hashing. No connection is held while hashing: the
+    username check runs on a read session, and the write transaction
+    (which takes the database write lock) only covers the INSERT.
     
     Args:
         user_data: Username and password from request body
+        read_db: Read-only session for the username check
         db: Database session 
 
     Returns:
@@ -34,26 +49,46 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         
     Raises:
         400: If username already exists
+        503: If the hashing pool is saturated
     """
+    def username_taken() -> bool:
+        try:
+            return user_repository.get_user_by_username(read_db, user_data.username) is not None
+        finally:
+            # Return the read connection to its pool before hashing
+            read_db.close()
+
     # Check if username already exists
-    existing_user = user_repository.get_user_by_username(db, user_data.username)
-    if existing_user:
+    if await run_in_threadpool(username_taken):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    # Create new user
-    user = user_repository.create_user(
-        db=db,
-        username=user_data.username,
-        password=user_data.password
-    )
+    # Hash the password off the request threadpool
+    salt = generate_salt()
+    password_hash = await hashing_pool.run(hash_password, user_data.password, salt)
+    
+    # Create new user; a concurrent signup may have taken the username
+    # since the check
+    try:
+        user = await run_in_threadpool(
+            user_repository.add_user,
+            db,
+            user_data.username,
+            password_hash,
+            salt
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
     
     return user
 
 @router.post("/login", response_model=LoginResponse)
-def login(credentials: UserLogin, response: Response, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, response: Response, db: Session = Depends(get_read_db)):
     """
     Log in a user.
       
@@ -66,14 +101,20 @@ def login(credentials: UserLogin, response: Response, db: Session = Depends(get_
         
     Raises:
         401: If credentials are invalid
+        503: If the hashing pool is saturated
     """
     # Authenticate user
-    user = user_repository.authenticate_user(
-        db=db,
-        username=credentials.username,
-        password=credentials.password
+    user = await run_in_threadpool(
+        user_repository.get_user_by_username, db, credentials.username
     )
     
+    if user is not None:
+        password_is_valid = await hashing_pool.run(
+            verify_password, credentials.password, user.salt, user.password_hash
+        )
+        if not password_is_valid:
+            user = None
+    
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -118,7 +159,7 @@ def logout(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: CurrentUser = Depends(get_current_user)):
     """
     Get current authenticated user.
     """
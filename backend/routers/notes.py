@@ -2,15 +2,39 @@
 Notes router 
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import zlib
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple
 
-from ..database import get_db
-from ..schemas import NoteCreate, NoteUpdate, NoteResponse
+from ..database import ReadSessionLocal, get_read_db, get_write_db
+from ..compression import accepts_encoding, decode_content, deflate_body
+from ..config import (
+    BATCH_MAX_ITEMS, EXPORT_BATCH_SIZE, IMPORT_BATCH_BYTES, IMPORT_BATCH_SIZE,
+    IMPORT_MAX_LINE_BYTES, NOTE_CONTENT_MAX_LENGTH
+)
+from ..schemas import (
+    NoteCreate, NoteUpdate, NoteResponse, NoteListPage, NoteSearchResponse,
+    NoteBatchUpdate, NoteBatchDelete, NoteBatchResponse, NoteChangesResponse,
+    NoteImport, NoteImportResponse, NotePatch, NoteSummaryResponse,
+    NoteRevisionListResponse, NoteRevisionResponse
+)
 from ..repositories import note_repository
 from ..dependencies import get_current_user
-from ..models import User
+from ..repositories.user_repository import CurrentUser
+from ..utils.encoding import dumps
+from ..utils.etags import etag_matches, list_etag, note_etag
+from ..utils.pagination import (
+    MAX_INTEGER, InvalidCursorError, decode_change_cursor, encode_change_cursor
+)
+from ..text_patch import PatchError, apply_operations, apply_unified_diff
+from ..write_queue import run_write
 
 router = APIRouter(
     prefix="/notes",
@@ -18,111 +42,829 @@ router = APIRouter(
 )
 
 
+def check_if_match(
+    db: Session,
+    note_id: int,
+    user_id: int,
+    if_match: Optional[str]
+) -> Optional[datetime]:
+    """
+    Evaluate an If-Match precondition for a write to a note.
+
+    Returns:
+        The note's current updated_at, which the write must still see,
+        or None when there is no If-Match header
+
+    Raises:
+        404: If the note does not exist
+        412: If the ETag does not match
+    """
+    if if_match is None:
+        return None
+
+    updated_at = note_repository.get_note_version(db, note_id, user_id)
+
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+
+    if not etag_matches(if_match, note_etag(note_id, updated_at), weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Note has been modified"
+        )
+
+    return updated_at
+
+
+# Default projection of list endpoints: the stored preview and
+# statistics in place of content, so every item has a bounded size
+SUMMARY_FIELDS = (
+    "id", "title", "preview", "word_count", "char_count", "content_hash",
+    "created_at", "updated_at"
+)
+
+
+# The list routes return pre-encoded JSON whose item shape depends on
+# fields=, so the shapes are documented here instead of through a
+# response_model
+LIST_RESPONSES = {
+    200: {
+        "model": NoteListPage,
+        "description": "NoteSummaryListResponse for fields=summary (the default), "
+                       "NoteListResponse for fields=full, NoteFieldsListResponse "
+                       "with only the requested fields otherwise",
+    },
+    304: {"description": "The If-None-Match ETag matches"},
+}
+
+
+def parse_fields(fields: str) -> Tuple[str, ...]:
+    """
+    Parse the fields= query parameter of list endpoints.
+
+    Accepts "summary", "full" or a comma-separated list of NoteResponse
+    field names.
+
+    Raises:
+        400: If an unknown field is requested
+    """
+    if fields == "summary":
+        return SUMMARY_FIELDS
+
+    if fields == "full":
+        return tuple(note_repository.NOTE_FIELDS)
+
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+
+    if not names or any(name not in note_repository.NOTE_FIELDS for name in names):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields must be summary, full or a list of: {', '.join(note_repository.NOTE_FIELDS)}"
+        )
+
+    return names
+
+
+def encode_note_list(notes, next_cursor: Optional[str], fields: Sequence[str]) -> bytes:
+    """
+    Encode a page of rows from get_user_notes as a list response.
+
+    Skips Pydantic validation of every row; each item holds the requested
+    fields exactly as NoteResponse would serialize them.
+    """
+    return dumps({
+        "items": [dict(zip(fields, note)) for note in notes],
+        "next_cursor": next_cursor
+    })
+
+
+def raise_write_failed(expected_updated_at: Optional[datetime]):
+    """
+    Raise 412 if a conditional write lost a race, 404 otherwise.
+    """
+    if expected_updated_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Note has been modified"
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Note not found"
+    )
+
+
+def encode_export(batches: Iterable[List[Row]], gzip: bool) -> Iterator[bytes]:
+    """
+    Encode batches of export rows as NDJSON, one chunk per batch.
+
+    With gzip the chunks form a single gzip stream.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    fields = note_repository.EXPORT_FIELDS
+
+    for batch in batches:
+        chunk = b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in batch)
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
+async def read_import_lines(request: Request) -> AsyncIterator[bytes]:
+    """
+    Split a streamed NDJSON upload into lines as it arrives.
+
+    A gzip upload (Content-Encoding: gzip) is inflated in pieces of at
+    most IMPORT_MAX_LINE_BYTES, so that neither a long line nor a highly
+    compressed body is ever held in memory at once.
+
+    Raises:
+        400: If a gzip body is invalid or truncated
+        413: If a line is longer than IMPORT_MAX_LINE_BYTES
+        415: If the upload uses another Content-Encoding
+    """
+    encoding = request.headers.get("content-encoding", "identity").lower()
+
+    if encoding not in ("identity", "gzip"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Encoding must be gzip or identity"
+        )
+
+    decompressor = zlib.decompressobj(31) if encoding == "gzip" else None
+    pending = b""
+
+    def inflate(data: bytes) -> Iterator[bytes]:
+        if decompressor is None:
+            yield data
+            return
+        while True:
+            piece = decompressor.decompress(data, IMPORT_MAX_LINE_BYTES)
+            yield piece
+            data = decompressor.unconsumed_tail
+            # A full piece may leave output pending even without input
+            if not data and len(piece) < IMPORT_MAX_LINE_BYTES:
+                return
+
+    try:
+        async for chunk in request.stream():
+            for piece in inflate(chunk):
+                *lines, pending = (pending + piece).split(b"\n")
+
+                if len(pending) > IMPORT_MAX_LINE_BYTES or any(
+                    len(line) > IMPORT_MAX_LINE_BYTES for line in lines
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=f"Lines must be at most {IMPORT_MAX_LINE_BYTES} bytes"
+                    )
+
+                for line in lines:
+                    yield line
+    except zlib.error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid gzip body"
+        )
+
+    if decompressor is not None and not decompressor.eof:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Truncated gzip body"
+        )
+
+    if pending:
+        yield pending
+
+
+def import_batch(db: Session, lines: List[bytes], first_line: int, user_id: int, imported: int) -> int:
+    """
+    Validate one batch of NDJSON lines and insert it in one transaction.
+
+    Blank lines are skipped.
+
+    Returns:
+        Number of notes inserted
+
+    Raises:
+        400: If a line is not a valid note; the batch is not inserted
+    """
+    notes = []
+
+    for line_number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            notes.append(NoteImport.model_validate_json(line).model_dump())
+        except ValidationError as error:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Line {line_number}: {error.errors()[0]['msg']} "
+                       f"({imported} notes of earlier lines were imported)"
+            )
+
+    if not notes:
+        return 0
+
+    return run_write(db, lambda db: note_repository.import_notes(
+        db=db,
+        notes=notes,
+        user_id=user_id
+    ))
+
+
 @router.post("/", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
 def create_note(
     note_data: NoteCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
 ):
     """
     Create a new note for the authenticated user.
     """
-    note = note_repository.create_note(
+    note = run_write(db, lambda db: note_repository.create_note(
         db=db,
         title=note_data.title,
         content=note_data.content,
         user_id=current_user.id
-    )
+    ))
+    
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
     
     return note
 
 
-@router.get("/", response_model=List[NoteResponse])
-def get_notes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.post("/batch", response_model=NoteBatchResponse, status_code=status.HTTP_201_CREATED)
+def create_notes_batch(
+    notes_data: List[NoteCreate] = Body(..., min_length=1, max_length=BATCH_MAX_ITEMS),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Create many notes in one transaction.
+    """
+    notes = run_write(db, lambda db: note_repository.create_notes(
+        db=db,
+        notes=[note_data.model_dump() for note_data in notes_data],
+        user_id=current_user.id
+    ))
+    
+    return {"items": [
+        {"id": note.id, "status": "created", "note": note} for note in notes
+    ]}
+
+
+@router.put("/batch", response_model=NoteBatchResponse)
+def update_notes_batch(
+    notes_data: List[NoteBatchUpdate] = Body(..., min_length=1, max_length=BATCH_MAX_ITEMS),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Update many notes in one transaction.
+
+    Items whose note does not exist are reported as not_found. As with
+    PUT /notes/{note_id}, an item with neither title nor content does not
+    modify its note; it is reported as unchanged.
+    """
+    notes, updated = run_write(db, lambda db: note_repository.update_notes(
+        db=db,
+        changes=[note_data.model_dump() for note_data in notes_data],
+        user_id=current_user.id
+    ))
+    
+    items = []
+    for note_data in notes_data:
+        note = notes.get(note_data.id)
+        if note is None:
+            items.append({"id": note_data.id, "status": "not_found"})
+        else:
+            status_name = "updated" if note.id in updated else "unchanged"
+            items.append({"id": note.id, "status": status_name, "note": note})
+    
+    return {"items": items}
+
+
+@router.post("/batch/delete", response_model=NoteBatchResponse)
+def delete_notes_batch(
+    delete_data: NoteBatchDelete,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
 ):
     """
-    Get all notes for the authenticated user and returns a list of notes.
+    Delete many notes in one transaction.
+
+    Items whose note does not exist are reported as not_found.
     """
-    notes = note_repository.get_user_notes(
+    deleted = run_write(db, lambda db: note_repository.delete_notes(
         db=db,
+        note_ids=delete_data.ids,
         user_id=current_user.id
+    ))
+    
+    return {"items": [
+        {"id": note_id, "status": "deleted" if note_id in deleted else "not_found"}
+        for note_id in delete_data.ids
+    ]}
+
+
+@router.get("/", responses=LIST_RESPONSES)
+def get_notes(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    order: Literal["asc", "desc"] = "desc",
+    fields: str = "summary",
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get one page of notes for the authenticated user.
+
+    Notes are sorted by last update. Pass the returned next_cursor back
+    as cursor to fetch the following page.
+
+    Items hold id, title, the content preview and statistics and the
+    timestamps by default; use fields=full or a comma-separated list of
+    NoteResponse fields for more. Full content is
+    available from GET /notes/{note_id}. The ETag changes whenever any
+    of the user's notes changes; a matching If-None-Match gets a 304
+    without the notes being loaded.
+    """
+    field_names = parse_fields(fields)
+    notes_version = note_repository.get_notes_version(db, current_user.id)
+    etag = list_etag(notes_version, limit, cursor, order, field_names)
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    try:
+        notes, next_cursor = note_repository.get_user_notes(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            order=order,
+            fields=field_names
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return Response(
+        encode_note_list(notes, next_cursor, field_names),
+        media_type="application/json",
+        headers={"ETag": etag}
     )
+
+
+@router.get("/search", response_model=NoteSearchResponse)
+def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=MAX_INTEGER),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Search the authenticated user's notes by title and content.
+
+    Results are ranked by relevance. Pass next_offset back as offset to
+    fetch the following page.
+    """
+    results, next_offset = note_repository.search_notes(
+        db=db,
+        user_id=current_user.id,
+        q=q,
+        limit=limit,
+        offset=offset
+    )
+    
+    return {"items": results, "next_offset": next_offset}
+
+
+@router.get("/changes", response_model=NoteChangesResponse)
+def get_changes(
+    since: str = "0",
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get notes created, updated or deleted since a previous sync.
+
+    Start with since=0 and pass the returned cursor on the next call.
+    Deleted notes are returned as tombstones (deleted=true).
+    """
+    try:
+        since_seq, since_id = decode_change_cursor(since)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
-    return notes
+    changes, has_more = note_repository.get_changes(
+        db=db,
+        user_id=current_user.id,
+        since_seq=since_seq,
+        since_id=since_id,
+        limit=limit
+    )
+    
+    cursor = since
+    if changes:
+        cursor = encode_change_cursor(changes[-1][0], changes[-1][1])
+    
+    return {
+        "changes": [
+            {"id": note_id, "change_seq": change_seq, "deleted": note is None, "note": note}
+            for change_seq, note_id, note in changes
+        ],
+        "cursor": cursor,
+        "has_more": has_more
+    }
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_notes(
+    accept_encoding: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Download all of the authenticated user's notes as NDJSON.
+
+    Each line is a JSON object with id, title, content, created_at and
+    updated_at, in ID order. The body is streamed as notes are read, so
+    memory use does not depend on the number of notes; it is gzipped
+    (Content-Encoding: gzip) when the client accepts it. The output can
+    be uploaded to POST /notes/import as-is.
+    """
+    gzip = accepts_encoding(accept_encoding, "gzip")
+
+    def generate():
+        # The request's session is closed once the route returns, before
+        # the body is streamed, so the export reads on its own session
+        with ReadSessionLocal() as db:
+            yield from encode_export(
+                note_repository.export_notes(db, current_user.id, EXPORT_BATCH_SIZE), gzip
+            )
+
+    headers = {
+        "Content-Disposition": 'attachment; filename="notes.ndjson"',
+        "Vary": "Accept-Encoding"
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+
+@router.post("/import", response_model=NoteImportResponse, status_code=status.HTTP_201_CREATED)
+async def import_notes(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Create notes from an NDJSON upload, one NoteImport object per line.
+
+    The body may be gzipped (Content-Encoding: gzip). It is parsed while
+    it streams in and inserted in transactions of IMPORT_BATCH_SIZE lines,
+    or fewer when they add up to IMPORT_BATCH_BYTES, so the memory used
+    does not depend on the size of the upload or of its notes. If a line
+    is invalid, 400 names it; the batches before it stay imported.
+    """
+    imported = 0
+    first_line = 1
+    lines: List[bytes] = []
+    batch_bytes = 0
+
+    async for line in read_import_lines(request):
+        lines.append(line)
+        batch_bytes += len(line)
+        if len(lines) == IMPORT_BATCH_SIZE or batch_bytes >= IMPORT_BATCH_BYTES:
+            imported += await run_in_threadpool(
+                import_batch, db, lines, first_line, current_user.id, imported
+            )
+            first_line += len(lines)
+            lines = []
+            batch_bytes = 0
+
+    if lines:
+        imported += await run_in_threadpool(
+            import_batch, db, lines, first_line, current_user.id, imported
+        )
+
+    return {"imported": imported}
 
 
 @router.get("/{note_id}", response_model=NoteResponse)
 def get_note(
     note_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific note by ID.
+
+    Served from the note cache when possible, which also answers a
+    matching If-None-Match with a 304. On a cache miss, a matching
+    If-None-Match gets a 304 answered from the note's updated_at alone,
+    without loading its content.
+    """
+    note = note_repository.get_cached_note_json(note_id, current_user.id)
+    
+    if note is None and if_none_match is not None:
+        updated_at = note_repository.get_note_version(db, note_id, current_user.id)
+        
+        if updated_at is not None:
+            etag = note_etag(note_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    if note is None:
+        note = note_repository.load_note_json(
+            db=db,
+            note_id=note_id,
+            user_id=current_user.id
+        )
+    
+    if note is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+    
+    body, updated_at = note
+    etag = note_etag(note_id, updated_at)
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/{note_id}/content", response_class=PlainTextResponse)
+def get_note_content(
+    note_id: int,
+    accept_encoding: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a note's content as plain text.
+
+    Content stored zlib-compressed is sent as-is with
+    Content-Encoding: deflate when the client accepts it, without being
+    decompressed on the server.
     """
-    note = note_repository.get_note_by_id(
+    stored = note_repository.get_stored_content(
         db=db,
         note_id=note_id,
         user_id=current_user.id
     )
     
-    if not note:
+    if stored is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Note not found"
         )
     
-    return note
+    body = deflate_body(stored)
+    
+    if body is not None and accepts_encoding(accept_encoding, "deflate"):
+        return PlainTextResponse(
+            body,
+            headers={"Content-Encoding": "deflate", "Vary": "Accept-Encoding"}
+        )
+    
+    return PlainTextResponse(decode_content(stored), headers={"Vary": "Accept-Encoding"})
 
 
-@router.put("/{note_id}", response_model=NoteResponse)
-def update_note(
+@router.get("/{note_id}/revisions", response_model=NoteRevisionListResponse)
+def get_note_revisions(
     note_id: int,
-    note_data: NoteUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = Query(None, ge=1, le=MAX_INTEGER),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Update a note's title and content.
+    List the earlier versions of a note, newest first.
+
+    A revision is kept every time the note's title or content changes;
+    the current version is the note itself. Pass the returned
+    next_before back as before to fetch older revisions.
     """
-    note = note_repository.update_note(
+    if note_repository.get_note_version(db, note_id, current_user.id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+    
+    revisions, next_before = note_repository.get_revisions(
         db=db,
         note_id=note_id,
         user_id=current_user.id,
-        title=note_data.title,
-        content=note_data.content
+        limit=limit,
+        before=before
+    )
+    
+    return {"items": revisions, "next_before": next_before}
+
+
+@router.get("/{note_id}/revisions/{number}", response_model=NoteRevisionResponse)
+def get_note_revision(
+    note_id: int,
+    number: int = Path(ge=1, le=MAX_INTEGER),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get an earlier version of a note, with its content.
+    """
+    found = note_repository.get_revision(
+        db=db,
+        note_id=note_id,
+        user_id=current_user.id,
+        number=number
     )
     
-    if not note:
+    if found is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Note not found"
+            detail="Revision not found"
         )
     
+    revision, content = found
+    
+    return {
+        "note_id": note_id,
+        "number": revision.number,
+        "title": revision.title,
+        "char_count": revision.char_count,
+        "updated_at": revision.updated_at,
+        "content": content
+    }
+
+
+@router.put("/{note_id}", response_model=NoteResponse)
+def update_note(
+    note_id: int,
+    note_data: NoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Update a note's title and content.
+
+    With If-Match the update only applies if the note's ETag still
+    matches, otherwise 412 is returned.
+    """
+    def write(db: Session):
+        expected_updated_at = check_if_match(db, note_id, current_user.id, if_match)
+        
+        note = note_repository.update_note(
+            db=db,
+            note_id=note_id,
+            user_id=current_user.id,
+            title=note_data.title,
+            content=note_data.content,
+            expected_updated_at=expected_updated_at
+        )
+        
+        if not note:
+            raise_write_failed(expected_updated_at)
+        
+        return note
+    
+    note = run_write(db, write)
+    
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    
+    return note
+
+
+@router.patch("/{note_id}", response_model=NoteSummaryResponse)
+def patch_note(
+    note_id: int,
+    patch: NotePatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Update a note's content with a list of text operations or a unified
+    diff, and optionally its title.
+
+    The If-Match header is required (428 without it) and names the
+    version (ETag) the patch was made against; if the note has changed
+    since, 412 is returned and nothing is applied. A patch that does not
+    apply to the content gets a 422. The response holds the summary
+    fields and the new ETag rather than the full content, which the
+    client already has; content_hash lets it check its copy.
+    """
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match with the note's ETag is required"
+        )
+    
+    def write(db: Session):
+        current = note_repository.get_note_content(db, note_id, current_user.id)
+        
+        if current is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Note not found"
+            )
+        
+        if not etag_matches(if_match, note_etag(note_id, current.updated_at), weak=False):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Note has been modified"
+            )
+        
+        content = None
+        try:
+            if patch.operations is not None:
+                content = apply_operations(current.content, [op.model_dump() for op in patch.operations])
+            elif patch.diff is not None:
+                content = apply_unified_diff(current.content, patch.diff)
+        except PatchError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=str(error)
+            )
+        
+        if content is not None and len(content) > NOTE_CONTENT_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Patched content is longer than {NOTE_CONTENT_MAX_LENGTH} characters"
+            )
+        
+        note = note_repository.update_note(
+            db=db,
+            note_id=note_id,
+            user_id=current_user.id,
+            title=patch.title,
+            content=content,
+            expected_updated_at=current.updated_at
+        )
+        
+        if not note:
+            raise_write_failed(current.updated_at)
+        
+        return note
+    
+    note = run_write(db, write)
+    
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    
     return note
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_note(
     note_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_write_db)
 ):
     """
     Delete a note.
+
+    With If-Match the delete only applies if the note's ETag still
+    matches, otherwise 412 is returned.
     """
-    success = note_repository.delete_note(
-        db=db,
-        note_id=note_id,
-        user_id=current_user.id
-    )
-    
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Note not found"
+    def write(db: Session):
+        expected_updated_at = check_if_match(db, note_id, current_user.id, if_match)
+        
+        success = note_repository.delete_note(
+            db=db,
+            note_id=note_id,
+            user_id=current_user.id,
+            expected_updated_at=expected_updated_at
         )
+        
+        if not success:
+            raise_write_failed(expected_updated_at)
+    
+    run_write(db, write)
     
-    return None 
\ No newline at end of file
+    return None
@@ -2,8 +2,13 @@
 Pydantic schemas for request/response validation.
 """
 
-from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timezone
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from .config import BATCH_MAX_ITEMS, NOTE_CONTENT_MAX_LENGTH, PATCH_MAX_OPERATIONS
+from .utils.pagination import MAX_INTEGER
 
 
 class UserCreate(BaseModel):
@@ -59,7 +64,7 @@ class NoteCreate(BaseModel):
     """
     title: str = Field(..., min_length=1, max_length=200)
     
-    content: str = Field(default="", max_length=50000)
+    content: str = Field(default="", max_length=NOTE_CONTENT_MAX_LENGTH)
 
 
 class NoteUpdate(BaseModel):
@@ -68,7 +73,99 @@ class NoteUpdate(BaseModel):
     """
     title: str | None = Field(None, min_length=1, max_length=200)
     
-    content: str | None = Field(None, max_length=50000)
+    content: str | None = Field(None, max_length=NOTE_CONTENT_MAX_LENGTH)
+
+
+class TextOperation(BaseModel):
+    """
+    Schema for one edit of a note's content (see backend.text_patch).
+
+    Offsets and lengths count characters (Unicode code points). insert
+    takes text, delete takes length and splice takes both.
+    """
+    op: Literal["insert", "delete", "splice"]
+    offset: int = Field(..., ge=0)
+    length: int = Field(0, ge=0)
+    text: str = Field("", max_length=NOTE_CONTENT_MAX_LENGTH)
+
+    @model_validator(mode="after")
+    def check_arguments(self):
+        if self.op == "insert" and self.length:
+            raise ValueError("insert takes no length")
+        if self.op == "delete" and self.text:
+            raise ValueError("delete takes no text")
+        return self
+
+
+class NotePatch(BaseModel):
+    """
+    Schema for an incremental update of a note.
+
+    Content is changed by either a list of operations or a unified diff
+    against the version named by the If-Match header.
+    """
+    title: str | None = Field(None, min_length=1, max_length=200)
+
+    operations: Optional[List[TextOperation]] = Field(None, max_length=PATCH_MAX_OPERATIONS)
+
+    # Room for removing and re-adding a note of the maximum length
+    diff: Optional[str] = Field(None, max_length=2 * NOTE_CONTENT_MAX_LENGTH + 10_000)
+
+    @model_validator(mode="after")
+    def check_single_patch(self):
+        if self.operations is not None and self.diff is not None:
+            raise ValueError("Give either operations or diff, not both")
+        return self
+
+
+class NoteImport(NoteCreate):
+    """
+    Schema for one line of an NDJSON import.
+
+    Timestamps are kept when given and stored in UTC; naive ones are
+    taken as UTC. Other fields, such as the id of an exported note, are
+    ignored.
+    """
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator("created_at", "updated_at")
+    def convert_to_utc(cls, v):
+        """
+        Convert timestamps to UTC here rather than on INSERT, where an
+        offset pushing them past year 1 or 9999 would fail the batch.
+        """
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        try:
+            return v.astimezone(timezone.utc)
+        except OverflowError:
+            raise ValueError("Timestamp is out of range in UTC")
+
+
+class NoteImportResponse(BaseModel):
+    """
+    Schema for the outcome of an import.
+    """
+    imported: int
+
+
+class NoteBatchUpdate(NoteUpdate):
+    """
+    Schema for one item of a batch update.
+    """
+    id: int = Field(..., ge=1, le=MAX_INTEGER)
+
+
+class NoteBatchDelete(BaseModel):
+    """
+    Schema for a batch delete.
+    """
+    ids: List[Annotated[int, Field(ge=1, le=MAX_INTEGER)]] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_ITEMS
+    )
 
 
 class NoteResponse(BaseModel):
@@ -78,9 +175,175 @@ class NoteResponse(BaseModel):
     id: int
     title: str
     content: str
+    preview: str
+    word_count: int
+    char_count: int
+    content_hash: Optional[str] = None
     user_id: int
     created_at: datetime
     updated_at: datetime
     
     class Config:
-        from_attributes = True  
\ No newline at end of file
+        from_attributes = True
+
+
+class NoteSummaryResponse(BaseModel):
+    """
+    Schema for a note in list responses (the default "summary" fields).
+
+    preview holds the first NOTE_PREVIEW_LENGTH characters of content
+    with whitespace collapsed; content_hash is the SHA-256 hex digest of
+    content, for change detection without downloading it.
+    """
+    id: int
+    title: str
+    preview: str
+    word_count: int
+    char_count: int
+    content_hash: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteSummaryListResponse(BaseModel):
+    """
+    Schema for one page of note summaries (fields=summary).
+    """
+    items: List[NoteSummaryResponse]
+    next_cursor: Optional[str] = None
+
+
+class NoteListResponse(BaseModel):
+    """
+    Schema for one page of notes (fields=full).
+
+    next_cursor is None when there are no more notes.
+    """
+    items: List[NoteResponse]
+    next_cursor: Optional[str] = None
+
+
+class NoteFieldsResponse(BaseModel):
+    """
+    Schema for a note in list responses with fields= a list of
+    NoteResponse field names; only the requested fields are present.
+    """
+    id: Optional[int] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    preview: Optional[str] = None
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    content_hash: Optional[str] = None
+    user_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class NoteFieldsListResponse(BaseModel):
+    """
+    Schema for one page of notes with the requested fields.
+    """
+    items: List[NoteFieldsResponse]
+    next_cursor: Optional[str] = None
+
+
+# Response of GET /notes, depending on fields=
+NoteListPage = Union[NoteSummaryListResponse, NoteListResponse, NoteFieldsListResponse]
+
+
+class NoteSearchResult(BaseModel):
+    """
+    Schema for one full-text search hit.
+
+    title_highlight and snippet wrap matched words in <mark> tags.
+    """
+    id: int
+    title: str
+    title_highlight: str
+    snippet: str
+    rank: float
+    updated_at: datetime
+
+
+class NoteSearchResponse(BaseModel):
+    """
+    Schema for a page of search results.
+
+    next_offset is None when there are no more results.
+    """
+    items: List[NoteSearchResult]
+    next_offset: Optional[int] = None
+
+
+class NoteBatchItemResult(BaseModel):
+    """
+    Schema for the outcome of one batch item.
+
+    status is "created", "updated", "unchanged", "deleted" or "not_found";
+    note is set for created, updated and unchanged items.
+    """
+    id: int
+    status: str
+    note: Optional[NoteResponse] = None
+
+
+class NoteBatchResponse(BaseModel):
+    """
+    Schema for batch results, in request order.
+    """
+    items: List[NoteBatchItemResult]
+
+
+class NoteChange(BaseModel):
+    """
+    Schema for one entry of the change feed.
+
+    note is None for deleted notes.
+    """
+    id: int
+    change_seq: int
+    deleted: bool
+    note: Optional[NoteResponse] = None
+
+
+class NoteChangesResponse(BaseModel):
+    """
+    Schema for a page of the change feed.
+
+    Pass cursor back as since on the next sync. When has_more is true,
+    more changes are available right away.
+    """
+    changes: List[NoteChange]
+    cursor: str
+    has_more: bool
+
+
+class NoteRevisionSummary(BaseModel):
+    """
+    Schema for one revision in a revision list.
+
+    updated_at is when this version of the note was written.
+    """
+    number: int
+    title: str
+    char_count: int
+    updated_at: datetime
+
+
+class NoteRevisionListResponse(BaseModel):
+    """
+    Schema for one page of a note's revisions, newest first.
+
+    next_before is None when there are no older revisions.
+    """
+    items: List[NoteRevisionSummary]
+    next_before: Optional[int] = None
+
+
+class NoteRevisionResponse(NoteRevisionSummary):
+    """
+    Schema for one revision with its content.
+    """
+    note_id: int
+    content: str
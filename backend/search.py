@@ -0,0 +1,165 @@
+"""
+Full-text search index over notes (SQLite FTS5).
+
+notes_fts is an external-content FTS5 table over notes.title and
+notes.content, kept in sync by triggers so that every write path updates
+it incrementally. The owning user's id is indexed too (as owner), and
+every search requires it, so FTS5 intersects the query with that user's
+notes instead of matching every user's notes and filtering afterwards.
+Content may be compressed at rest, so the index reads it through the
+notes_fts_source view and note_text(), which must be registered on every
+connection (see compression.register_functions).
+
+Rebuild the index of an existing database with:
+    python -m backend.search rebuild
+"""
+
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+FTS_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS notes_fts_source AS
+    SELECT id, title, note_text(content) AS content, user_id AS owner FROM notes
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        title, content, owner,
+        content='notes_fts_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts (rowid, title, content, owner)
+        VALUES (new.id, new.title, note_text(new.content), new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts (notes_fts, rowid, title, content, owner)
+        VALUES ('delete', old.id, old.title, note_text(old.content), old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+        INSERT INTO notes_fts (notes_fts, rowid, title, content, owner)
+        VALUES ('delete', old.id, old.title, note_text(old.content), old.user_id);
+        INSERT INTO notes_fts (rowid, title, content, owner)
+        VALUES (new.id, new.title, note_text(new.content), new.user_id);
+    END
+    """,
+]
+
+# Objects of earlier index layouts, dropped before (re)creating the index
+FTS_OBJECTS = [
+    "DROP TRIGGER IF EXISTS notes_fts_insert",
+    "DROP TRIGGER IF EXISTS notes_fts_delete",
+    "DROP TRIGGER IF EXISTS notes_fts_update",
+    "DROP TABLE IF EXISTS notes_fts",
+    "DROP VIEW IF EXISTS notes_fts_source",
+]
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the FTS table and its triggers if missing.
+
+    A newly created (or upgraded) index on a database that already has
+    notes is populated straight away.
+
+    Args:
+        connection: Connection to the notes database
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    existing_sql = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'")
+    ).scalar()
+
+    # Indexes created before content compression read notes directly, and
+    # those created before per-user matching have no owner column
+    current = existing_sql is not None and "owner" in existing_sql
+
+    if not current:
+        for statement in FTS_OBJECTS:
+            connection.execute(text(statement))
+
+    for statement in FTS_DDL:
+        connection.execute(text(statement))
+
+    if not current:
+        rebuild_search_index(connection)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """
+    Re-index every note from the notes table.
+
+    Args:
+        connection: Connection to the notes database
+    """
+    connection.execute(text("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')"))
+
+
+def build_match_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word is quoted so that FTS5 operators in user input are matched
+    literally; a trailing * on a word keeps prefix matching.
+
+    Args:
+        q: Search text from the client
+
+    Returns:
+        MATCH expression requiring all words
+    """
+    terms = []
+
+    for word in q.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if not word:
+            continue
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+
+    return " ".join(terms)
+
+
+def user_match_query(user_id: int, query: str) -> str:
+    """
+    Restrict a MATCH expression from build_match_query to one user's
+    notes, and its words to title and content.
+
+    Args:
+        user_id: ID of user
+        query: Non-empty MATCH expression
+
+    Returns:
+        MATCH expression
+    """
+    return f'owner : "{user_id}" AND {{title content}} : ({query})'
+
+
+def main(argv):
+    if argv[1:] != ["rebuild"]:
+        print("usage: python -m backend.search rebuild")
+        return 2
+
+    from .database import create_tables, engine
+
+    create_tables()
+
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+
+    print("Search index rebuilt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
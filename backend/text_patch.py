@@ -0,0 +1,181 @@
+"""
+Incremental edits of note content.
+
+A patch is either a list of text operations or a unified diff:
+
+- Operations splice text at character offsets (Unicode code points).
+  insert adds text at offset, delete removes length characters at offset
+  and splice replaces length characters at offset with text. They apply
+  in order, each to the result of the previous one.
+- A unified diff, as written by `diff -u` or difflib.unified_diff, is
+  applied strictly: every context and removed line must match the
+  content exactly at the position its hunk header gives. Lines are
+  separated by "\\n" only.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from .config import NOTE_CONTENT_MAX_LENGTH
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Lines that may precede the first hunk
+DIFF_HEADER_PREFIXES = ("--- ", "+++ ", "diff ", "index ")
+
+
+class PatchError(ValueError):
+    """
+    Raised when a patch does not apply to the content.
+    """
+
+
+def apply_operations(content: str, operations: Iterable[Dict]) -> str:
+    """
+    Apply text operations to content.
+
+    Args:
+        content: Current content
+        operations: Dicts with "op" ("insert", "delete" or "splice"),
+            "offset", and "length" and/or "text"
+
+    Returns:
+        The patched content
+
+    Raises:
+        PatchError: If an operation reaches past the end of the content,
+            or makes it longer than NOTE_CONTENT_MAX_LENGTH
+    """
+    for index, operation in enumerate(operations):
+        offset = operation["offset"]
+        length = operation.get("length", 0) if operation["op"] != "insert" else 0
+        text = operation.get("text", "") if operation["op"] != "delete" else ""
+
+        if offset + length > len(content):
+            raise PatchError(
+                f"Operation {index} ({operation['op']} at {offset}, length {length}) "
+                f"is past the end of the content ({len(content)} characters)"
+            )
+
+        content = content[:offset] + text + content[offset + length:]
+
+        # Checked per operation so that many inserts cannot build up a
+        # string far past the limit before the route rejects it
+        if len(content) > NOTE_CONTENT_MAX_LENGTH:
+            raise PatchError(
+                f"Operation {index} makes the content longer than "
+                f"{NOTE_CONTENT_MAX_LENGTH} characters"
+            )
+
+    return content
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    Split text into lines that keep their "\\n"; the last line has none
+    if text does not end with one.
+    """
+    lines = text.split("\n")
+    last = lines.pop()
+
+    return [line + "\n" for line in lines] + ([last] if last else [])
+
+
+def parse_hunk(lines: List[str], start: int) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    Read the body of one hunk.
+
+    Returns:
+        Tuple of (list of (tag, line) with tag " ", "-" or "+", index of
+        the line after the hunk)
+    """
+    body = []
+    index = start
+
+    while index < len(lines) and not lines[index].startswith("@@"):
+        line = lines[index]
+
+        if line.startswith("\\"):
+            # "\ No newline at end of file" applies to the line before
+            if not body:
+                raise PatchError(f"Unexpected line {index + 1} of the diff")
+            tag, text = body[-1]
+            body[-1] = (tag, text[:-1] if text.endswith("\n") else text)
+        elif line in ("\n", ""):
+            # Context lines of empty lines lose their space in some editors
+            body.append((" ", line))
+        elif line[0] in " -+":
+            body.append((line[0], line[1:]))
+        else:
+            raise PatchError(f"Unexpected line {index + 1} of the diff")
+
+        index += 1
+
+    return body, index
+
+
+def apply_unified_diff(content: str, diff: str) -> str:
+    """
+    Apply a unified diff to content.
+
+    Args:
+        content: Current content
+        diff: Unified diff against content
+
+    Returns:
+        The patched content
+
+    Raises:
+        PatchError: If the diff is malformed or does not match content
+    """
+    source = split_lines(content)
+    lines = split_lines(diff)
+    result: List[str] = []
+    position = 0
+    index = 0
+
+    while index < len(lines) and lines[index].startswith(DIFF_HEADER_PREFIXES):
+        index += 1
+
+    if index == len(lines):
+        raise PatchError("The diff has no hunks")
+
+    while index < len(lines):
+        match = HUNK_HEADER.match(lines[index])
+        if match is None:
+            raise PatchError(f"Expected a hunk header on line {index + 1} of the diff")
+
+        old_start, old_count, _, new_count = (
+            int(value) if value is not None else 1 for value in match.groups()
+        )
+        # A hunk that removes nothing is placed after line old_start
+        start = old_start - 1 if old_count else old_start
+
+        if start < position or start > len(source):
+            raise PatchError(f"Hunk on line {index + 1} of the diff is out of order or range")
+
+        body, next_index = parse_hunk(lines, index + 1)
+
+        if sum(tag != "+" for tag, _ in body) != old_count or sum(tag != "-" for tag, _ in body) != new_count:
+            raise PatchError(f"Hunk on line {index + 1} of the diff does not match its line counts")
+
+        result.extend(source[position:start])
+        position = start
+
+        for tag, text in body:
+            if tag == "+":
+                result.append(text)
+                continue
+            if position >= len(source) or source[position] != text:
+                raise PatchError(
+                    f"Hunk on line {index + 1} of the diff does not match line {position + 1} of the content"
+                )
+            if tag == " ":
+                result.append(text)
+            position += 1
+
+        index = next_index
+
+    result.extend(source[position:])
+
+    return "".join(result)
@@ -0,0 +1,136 @@
+"""
+Bounded in-process caches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Union
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ttl_seconds.
+
+    With max_bytes, the total sizeof() of the cached values is bounded as
+    well; values larger than max_bytes are not cached.
+
+    invalidate() bumps a generation counter. A reader that loads a value
+    while a write may be in progress reads generation first and passes it
+    to set(), which then drops the value if anything was invalidated in
+    between, so that stale data loaded before the write committed is
+    never cached.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = len
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        # key -> (expires at, value, size)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            generation: generation read before value was loaded; the value
+                is dropped if entries were invalidated since (optional)
+        """
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self.bytes += size
+
+            while len(self._entries) > self.max_size or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Invalidate one entry.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """
+        Invalidate entries and fail concurrent set() calls.
+        """
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+            self.generation += 1
+
+    def clear(self) -> None:
+        """
+        Invalidate every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.generation += 1
+
+    def _remove(self, key: Hashable) -> None:
+        self.bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Hit and miss counters, hit ratio and current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
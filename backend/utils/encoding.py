@@ -0,0 +1,37 @@
+"""
+Fast JSON encoding for hot response paths.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Output matches what FastAPI produces through the Pydantic
+response models: compact UTF-8, and UTC datetimes in ISO 8601 with a "Z"
+suffix and microseconds only when non-zero.
+"""
+
+import json
+from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value of dicts, lists, strings, numbers and datetimes to
+    JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+
+    return json.dumps(
+        value, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
@@ -0,0 +1,58 @@
+"""
+ETag helpers for conditional requests.
+
+A note's ETag is derived from its ID and updated_at (in microseconds), so
+it can be checked without loading the note content. A note list's ETag
+is derived from the user's notes_version and the query parameters.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _microseconds(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def note_etag(note_id: int, updated_at: datetime) -> str:
+    """
+    Strong ETag for one note.
+    """
+    return f'"{note_id}-{_microseconds(updated_at)}"'
+
+
+def list_etag(notes_version: int, *params) -> str:
+    """
+    Strong ETag for a note list response.
+    """
+    key = repr((notes_version,) + params).encode()
+
+    return f'"l{notes_version}-{hashlib.sha1(key).hexdigest()[:16]}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Check an If-None-Match / If-Match header against an ETag.
+
+    With weak comparison (If-None-Match) W/"..." validators are compared
+    by their opaque part; strong comparison (If-Match) ignores them.
+    """
+    if header is None:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
@@ -0,0 +1,104 @@
+"""
+Cursor helpers for keyset pagination.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+
+# Largest value SQLite can bind as an integer
+MAX_INTEGER = 2 ** 63 - 1
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+def encode_cursor(updated_at: datetime, note_id: int) -> str:
+    """
+    Encode the position of the last row of a page as an opaque cursor.
+
+    Args:
+        updated_at: updated_at value of the last row
+        note_id: ID of the last row
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([updated_at.isoformat(), note_id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (updated_at, note_id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, note_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        updated_at = datetime.fromisoformat(updated_at)
+        if updated_at.tzinfo is not None:
+            # Converted to UTC here as on bind, where an offset could push
+            # it past year 1 or 9999
+            updated_at = updated_at.astimezone(timezone.utc)
+        note_id = int(note_id)
+    except (ValueError, TypeError, OverflowError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+    if not 0 <= note_id <= MAX_INTEGER:
+        raise InvalidCursorError("Invalid cursor")
+
+    return updated_at, note_id
+
+
+def encode_change_cursor(change_seq: int, note_id: int) -> str:
+    """
+    Encode a position in the change feed.
+
+    Args:
+        change_seq: change_seq of the last change returned
+        note_id: note ID of the last change returned
+
+    Returns:
+        Cursor string
+    """
+    return f"{change_seq}.{note_id}"
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a change feed cursor. A bare change_seq is accepted as well,
+    so "0" means "from the beginning".
+
+    Args:
+        cursor: Cursor from a previous sync
+
+    Returns:
+        Tuple of (change_seq, note_id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        change_seq, _, note_id = cursor.partition(".")
+        change_seq, note_id = int(change_seq), int(note_id or 0)
+    except ValueError as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+    if not (0 <= change_seq <= MAX_INTEGER and 0 <= note_id <= MAX_INTEGER):
+        raise InvalidCursorError("Invalid cursor")
+
+    return change_seq, note_id
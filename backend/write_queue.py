@@ -0,0 +1,229 @@
+"""
+Group commit for note writes.
+
+SQLite has a single writer and every commit pays for its own fsync, so
+under bursty load each write waits for all the commits queued before
+it. In "queue" write mode, routes hand their write to one writer thread
+instead. The thread collects the writes that arrive within a short
+window and runs them on a single connection and transaction, each inside
+its own SAVEPOINT, then commits once.
+
+A write that raises is rolled back to its savepoint without affecting
+the others, and its exception is re-raised in the request that submitted
+it. If the final commit fails, every write of the batch gets that error.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from queue import Empty, Queue
+from typing import Callable, Dict, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import WRITE_MODE, WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_MAX_WAIT_MS
+from .database import engine
+
+T = TypeVar("T")
+
+# Upper bounds of the batch size histogram
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, float("inf"))
+
+
+class WriteQueue:
+    """
+    Single writer thread that commits concurrent writes in batches.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int, max_wait_seconds: float, history: int = 100):
+        self._engine = engine
+        self._queue: "Queue[tuple]" = Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self.batches = 0
+        self.operations = 0
+        self.failed_operations = 0
+        self.failed_commits = 0
+        self.max_batch_size = 0
+        self.batch_sizes = {bound: 0 for bound in BATCH_SIZE_BUCKETS}
+        self.queue_wait_seconds = 0.0
+        self.execute_seconds = 0.0
+        self.commit_seconds = 0.0
+        self.recent_batches = deque(maxlen=history)
+
+    def submit(self, operation: Callable[[Session], T]) -> T:
+        """
+        Run operation(db) in the next batch and wait for its result.
+
+        The session passed to operation is bound to the batch's
+        transaction; its commit() only releases the operation's savepoint.
+
+        Returns:
+            The operation's return value, once the batch has committed
+
+        Raises:
+            Whatever the operation or the batch commit raised
+        """
+        self._start()
+
+        future: "Future[T]" = Future()
+        # The operation runs in the submitting request's context, so that
+        # e.g. its SQL statements are attributed to the request
+        context = contextvars.copy_context()
+        self._queue.put((partial(context.run, operation), future, time.perf_counter()))
+
+        return future.result()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> list:
+        """
+        Block for the first write, then gather more until the batch is
+        full or max_wait_seconds have passed.
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                self._execute(batch)
+            except BaseException as exc:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _execute(self, batch: list) -> None:
+        started_at = time.perf_counter()
+        results = []
+        failed = 0
+
+        with self._engine.connect() as connection:
+            connection.begin()
+
+            for operation, future, _ in batch:
+                db = Session(
+                    bind=connection,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False
+                )
+                try:
+                    results.append((future, operation(db), None))
+                except Exception as exc:
+                    db.rollback()
+                    results.append((future, None, exc))
+                    failed += 1
+                finally:
+                    db.close()
+
+            executed_at = time.perf_counter()
+
+            try:
+                connection.commit()
+            except Exception:
+                with self._lock:
+                    self.failed_commits += 1
+                raise
+
+        committed_at = time.perf_counter()
+
+        for future, result, exc in results:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        self._record(batch, failed, started_at, executed_at, committed_at)
+
+    def _record(self, batch: list, failed: int, started_at: float, executed_at: float, committed_at: float) -> None:
+        size = len(batch)
+        queue_wait = sum(started_at - enqueued_at for _, _, enqueued_at in batch)
+
+        with self._lock:
+            self.batches += 1
+            self.operations += size
+            self.failed_operations += failed
+            self.max_batch_size = max(self.max_batch_size, size)
+            for bound in BATCH_SIZE_BUCKETS:
+                if size <= bound:
+                    self.batch_sizes[bound] += 1
+                    break
+            self.queue_wait_seconds += queue_wait
+            self.execute_seconds += executed_at - started_at
+            self.commit_seconds += committed_at - executed_at
+            self.recent_batches.append({
+                "size": size,
+                "failed": failed,
+                "queue_wait_ms": round(queue_wait / size * 1000, 3),
+                "execute_ms": round((executed_at - started_at) * 1000, 3),
+                "commit_ms": round((committed_at - executed_at) * 1000, 3),
+            })
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Snapshot of the batch counters and the most recent batches.
+        """
+        with self._lock:
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "operations": self.operations,
+                "failed_operations": self.failed_operations,
+                "failed_commits": self.failed_commits,
+                "max_batch_size": self.max_batch_size,
+                "mean_batch_size": self.operations / self.batches if self.batches else 0.0,
+                "batch_sizes": {f"le_{bound:g}": count for bound, count in self.batch_sizes.items()},
+                "queue_wait_seconds_total": self.queue_wait_seconds,
+                "execute_seconds_total": self.execute_seconds,
+                "commit_seconds_total": self.commit_seconds,
+                "recent_batches": list(self.recent_batches),
+            }
+
+
+write_queue = (
+    WriteQueue(engine, WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_MAX_WAIT_MS / 1000)
+    if WRITE_MODE == "queue" else None
+)
+
+
+def run_write(db: Session, operation: Callable[[Session], T]) -> T:
+    """
+    Run a note write with the configured WRITE_MODE.
+
+    Args:
+        db: The request's write session, used in "direct" mode
+        operation: Function performing the write on a session
+
+    Returns:
+        The operation's return value
+    """
+    if write_queue is None:
+        return operation(db)
+
+    return write_queue.submit(operation)
@@ -0,0 +1,130 @@
+"""
+Compare concurrent-request throughput of the sync (threadpool) and async
+database modes.
+
+Each mode is served by its own uvicorn process in a scratch directory and
+driven with the same number of concurrent GET /api/notes/{id} requests.
+
+Usage:
+    python -m benchmarks.async_vs_sync [--concurrency 64] [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(mode: str, port: int, workdir: str) -> subprocess.Popen:
+    """
+    Start uvicorn for backend.main:app in the given database mode.
+    """
+    env = dict(os.environ, NOTES_DATABASE_MODE=mode, PYTHONPATH=ROOT)
+
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(100):
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run_load(base_url: str, concurrency: int, total: int) -> dict:
+    """
+    Seed one user with notes and read them back with `concurrency`
+    requests in flight.
+    """
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        credentials = {"username": "bench", "password": "benchpass"}
+        await client.post("/api/auth/signup", json=credentials)
+        await client.post("/api/auth/login", json=credentials)
+
+        note_ids = []
+        for i in range(100):
+            response = await client.post(
+                "/api/notes/", json={"title": f"note {i}", "content": "x" * 2000}
+            )
+            note_ids.append(response.json()["id"])
+
+        queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(note_ids[i % len(note_ids)])
+
+        latencies = []
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                note_id = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(f"/api/notes/{note_id}")
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+def bench_mode(mode: str, port: int, concurrency: int, total: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(mode, port, workdir)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_ready(base_url))
+            return asyncio.run(run_load(base_url, concurrency, total))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {
+        mode: bench_mode(mode, args.port + i, args.concurrency, args.requests)
+        for i, mode in enumerate(("sync", "async"))
+    }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
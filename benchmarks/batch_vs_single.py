@@ -0,0 +1,90 @@
+"""
+Compare the per-note cost of the batch routes against the single-item
+create/update/delete routes.
+
+Runs backend.main:app in-process against a scratch database.
+
+Usage:
+    python -m benchmarks.batch_vs_single [--notes 500]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    credentials = {"username": "bench", "password": "benchpass"}
+    client.post("/api/auth/signup", json=credentials)
+    client.post("/api/auth/login", json=credentials)
+
+    count = args.notes
+    payload = [{"title": f"note {i}", "content": "x" * 1000} for i in range(count)]
+
+    single_ids = []
+
+    def single_create():
+        for note in payload:
+            single_ids.append(client.post("/api/notes/", json=note).json()["id"])
+
+    def single_update():
+        for note_id in single_ids:
+            client.put(f"/api/notes/{note_id}", json={"content": "y" * 1000})
+
+    def single_delete():
+        for note_id in single_ids:
+            client.delete(f"/api/notes/{note_id}")
+
+    batch_ids = []
+
+    def batch_create():
+        items = client.post("/api/notes/batch", json=payload).json()["items"]
+        batch_ids.extend(item["id"] for item in items)
+
+    def batch_update():
+        client.put(
+            "/api/notes/batch",
+            json=[{"id": note_id, "content": "y" * 1000} for note_id in batch_ids]
+        )
+
+    def batch_delete():
+        client.post("/api/notes/batch/delete", json={"ids": batch_ids})
+
+    results = {}
+    for operation, single, batch in (
+        ("create", single_create, batch_create),
+        ("update", single_update, batch_update),
+        ("delete", single_delete, batch_delete),
+    ):
+        single_seconds = timed(single)
+        batch_seconds = timed(batch)
+        results[operation] = {
+            "single_us_per_note": round(single_seconds / count * 1e6, 1),
+            "batch_us_per_note": round(batch_seconds / count * 1e6, 1),
+            "speedup": round(single_seconds / batch_seconds, 1),
+        }
+
+    print(json.dumps({"notes": count, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare two benchmarks.load result files endpoint by endpoint.
+
+For every endpoint present in both runs, prints the baseline and
+candidate throughput and latency percentiles with the relative change
+(positive means the candidate is higher).
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+
+import argparse
+import json
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+
+
+def change(before: float, after: float):
+    if not before:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def compare(baseline: dict, candidate: dict) -> dict:
+    endpoints = {}
+    rows = dict(baseline["endpoints"], total=baseline["total"])
+    candidate_rows = dict(candidate["endpoints"], total=candidate["total"])
+
+    for endpoint, before in rows.items():
+        after = candidate_rows.get(endpoint)
+        if not before or not after:
+            continue
+        endpoints[endpoint] = {
+            metric: {
+                "baseline": before[metric],
+                "candidate": after[metric],
+                "change_percent": change(before[metric], after[metric]),
+            }
+            for metric in METRICS
+        }
+
+    return {
+        "baseline": baseline.get("revision"),
+        "candidate": candidate.get("revision"),
+        "endpoints": endpoints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    print(json.dumps(compare(baseline, candidate), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure database size and read/write latency of note content stored
+uncompressed, zlib-compressed and lzma-compressed.
+
+Uses the same codec as the Note.content column (backend.compression)
+against a scratch SQLite file per codec.
+
+Usage:
+    python -m benchmarks.compression [--notes 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from backend.compression import decode_content, encode_content
+from backend.config import NOTE_COMPRESSION_THRESHOLD
+
+WORDS = (
+    "meeting project deadline review draft idea todo call follow budget team "
+    "design release fix bug customer feedback plan week notes summary research "
+    "the a and of to in for on with is this that from by at as be"
+).split()
+
+
+def make_content(rng: random.Random) -> str:
+    """
+    Prose-like note body between 200 characters and 50 KB.
+    """
+    size = int(rng.choice([200, 1000, 4000, 20000, 50000]) * rng.uniform(0.5, 1.0))
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def bench_codec(codec: str, contents, threshold: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "bench.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, content TEXT)")
+
+        start = time.perf_counter()
+        with connection:
+            for content in contents:
+                connection.execute(
+                    "INSERT INTO notes (content) VALUES (?)",
+                    (encode_content(content, codec, threshold),)
+                )
+        write_seconds = time.perf_counter() - start
+
+        connection.execute("VACUUM")
+        size = os.path.getsize(path)
+
+        ids = list(range(1, len(contents) + 1))
+        random.Random(1).shuffle(ids)
+        start = time.perf_counter()
+        for note_id in ids:
+            stored = connection.execute(
+                "SELECT content FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()[0]
+            decode_content(stored)
+        read_seconds = time.perf_counter() - start
+
+        connection.close()
+
+    count = len(contents)
+    return {
+        "db_bytes": size,
+        "write_us_per_note": round(write_seconds / count * 1e6, 1),
+        "read_us_per_note": round(read_seconds / count * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--threshold", type=int, default=NOTE_COMPRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    contents = [make_content(rng) for _ in range(args.notes)]
+
+    results = {
+        codec: bench_codec(codec, contents, args.threshold)
+        for codec in ("none", "zlib", "lzma")
+    }
+    raw_bytes = sum(len(content.encode()) for content in contents)
+
+    print(json.dumps({"notes": args.notes, "content_bytes": raw_bytes, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
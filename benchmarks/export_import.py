@@ -0,0 +1,213 @@
+"""
+Measure streaming NDJSON import and export of one user's notes.
+
+A local uvicorn serves a scratch database. --notes generated notes are
+uploaded to POST /api/notes/import as one streamed body, then downloaded
+from GET /api/notes/export, plain and gzipped. Every phase runs on a
+fresh server process so that its peak memory is its own (Linux only).
+With the "tuned" database profile, resident memory includes the SQLite
+mmap and anonymous memory its page cache (cache_size), which both fill
+up to their configured size on large databases; run with
+NOTES_DATABASE_PROFILE=default to see the server's own memory stay flat.
+
+Usage:
+    python -m benchmarks.export_import [--notes 1000000] [--content-chars 300]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from typing import Iterator, Optional
+
+import httpx
+
+from .seed import PASSWORD, ContentGenerator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Notes per chunk of the generated upload
+UPLOAD_CHUNK_NOTES = 1000
+
+
+def memory_mb(pid: int, field: str) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+class Server:
+    """
+    uvicorn serving backend.main:app from workdir.
+    """
+
+    def __init__(self, workdir: str, port: int):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=workdir,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.peak_anon_mb = 0.0
+        self._stopped = threading.Event()
+
+        for _ in range(200):
+            try:
+                httpx.get(self.base_url + "/")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            self.stop()
+            raise RuntimeError("server did not start")
+
+        threading.Thread(target=self._sample, daemon=True).start()
+
+    def _sample(self):
+        while not self._stopped.wait(0.05):
+            self.peak_anon_mb = max(self.peak_anon_mb, memory_mb(self.process.pid, "RssAnon") or 0.0)
+
+    def memory(self) -> dict:
+        return {
+            "server_peak_rss_mb": memory_mb(self.process.pid, "VmHWM"),
+            "server_peak_anon_mb": self.peak_anon_mb or None,
+        }
+
+    def client(self) -> httpx.Client:
+        client = httpx.Client(base_url=self.base_url, timeout=None)
+        credentials = {"username": "export", "password": PASSWORD}
+        client.post("/api/auth/signup", json=credentials)
+        client.post("/api/auth/login", json=credentials).raise_for_status()
+        return client
+
+    def stop(self):
+        self._stopped.set()
+        self.process.terminate()
+        self.process.wait()
+
+
+def generate_upload(notes: int, content_chars: int, stats: dict) -> Iterator[bytes]:
+    generator = ContentGenerator(0)
+
+    for start in range(0, notes, UPLOAD_CHUNK_NOTES):
+        chunk = b"".join(
+            json.dumps({"title": generator.title(), "content": generator.content(content_chars)}).encode() + b"\n"
+            for _ in range(min(UPLOAD_CHUNK_NOTES, notes - start))
+        )
+        stats["bytes"] += len(chunk)
+        yield chunk
+
+
+def run_import(server: Server, args) -> dict:
+    stats = {"bytes": 0}
+
+    client = server.client()
+    try:
+        started_at = time.perf_counter()
+        response = client.post(
+            "/api/notes/import",
+            content=generate_upload(args.notes, args.content_chars, stats),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        seconds = time.perf_counter() - started_at
+    finally:
+        client.close()
+
+    response.raise_for_status()
+
+    return {
+        "notes": response.json()["imported"],
+        "seconds": round(seconds, 2),
+        "notes_per_second": round(args.notes / seconds),
+        "upload_mb": round(stats["bytes"] / 1e6, 1),
+        **server.memory(),
+    }
+
+
+def run_export(server: Server, gzip: bool) -> dict:
+    received = 0
+    lines = 0
+    decompressor = zlib.decompressobj(31) if gzip else None
+
+    client = server.client()
+    try:
+        started_at = time.perf_counter()
+        with client.stream(
+            "GET", "/api/notes/export",
+            headers={"Accept-Encoding": "gzip" if gzip else "identity"}
+        ) as response:
+            response.raise_for_status()
+            first_byte_seconds = time.perf_counter() - started_at
+            for chunk in response.iter_raw():
+                received += len(chunk)
+                if decompressor is not None:
+                    chunk = decompressor.decompress(chunk)
+                lines += chunk.count(b"\n")
+        seconds = time.perf_counter() - started_at
+    finally:
+        client.close()
+
+    return {
+        "notes": lines,
+        "seconds": round(seconds, 2),
+        "first_byte_ms": round(first_byte_seconds * 1000, 1),
+        "notes_per_second": round(lines / seconds),
+        "download_mb": round(received / 1e6, 1),
+        **server.memory(),
+    }
+
+
+def idle_memory(workdir: str, port: int) -> dict:
+    server = Server(workdir, port)
+    try:
+        server.client().close()
+        time.sleep(0.1)
+        return server.memory()
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--content-chars", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {"idle": idle_memory(workdir, args.port)}
+
+        for phase, run in (
+            ("import", lambda server: run_import(server, args)),
+            ("export", lambda server: run_export(server, gzip=False)),
+            ("export_gzip", lambda server: run_export(server, gzip=True)),
+        ):
+            server = Server(workdir, args.port)
+            try:
+                results[phase] = run(server)
+            finally:
+                server.stop()
+
+        database_mb = os.path.getsize(os.path.join(workdir, "notes.db")) / 1e6
+
+    print(json.dumps({
+        "notes": args.notes,
+        "content_chars": args.content_chars,
+        "database_mb": round(database_mb, 1),
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare note create throughput and latency of concurrent writers
+committing one by one ("direct") against the group-commit write queue.
+
+Writers call note_repository.create_note from their own threads, as the
+request threadpool does, against a scratch database per profile and
+mode. Queue-mode results include the write queue's batch statistics.
+
+Usage:
+    python -m benchmarks.group_commit [--writers 16] [--writes 200] [--profiles default,tuned]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from backend.config import WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_MAX_WAIT_MS
+
+
+def bench(profile: str, mode: str, args) -> dict:
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.config import DATABASE_PROFILES
+    from backend.database import Base, create_sqlite_engine
+    from backend.models import User
+    from backend.repositories import note_repository
+    from backend.search import create_search_index
+    from backend.write_queue import WriteQueue
+
+    engine = create_sqlite_engine(f"sqlite:///./{profile}-{mode}.db", DATABASE_PROFILES[profile], pool_size=1)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        create_search_index(connection)
+
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    with SessionLocal() as db:
+        user = User(username="bench", password_hash="-", salt="-")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    queue = WriteQueue(engine, args.max_batch, args.max_wait_ms / 1000)
+    latencies = []
+    lock = threading.Lock()
+
+    def write(db):
+        return note_repository.create_note(db, "title", "some note content " * 20, user_id)
+
+    def writer():
+        samples = []
+        for _ in range(args.writes):
+            start = time.perf_counter()
+            if mode == "queue":
+                queue.submit(write)
+            else:
+                with SessionLocal() as db:
+                    write(db)
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    engine.dispose()
+    latencies.sort()
+
+    result = {
+        "writes_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+    if mode == "queue":
+        stats = queue.stats()
+        result["batches"] = stats["batches"]
+        result["mean_batch_size"] = round(stats["mean_batch_size"], 2)
+        result["max_batch_size"] = stats["max_batch_size"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="writes per writer")
+    parser.add_argument("--profiles", default="default,tuned")
+    parser.add_argument("--max-batch", type=int, default=WRITE_QUEUE_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=WRITE_QUEUE_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        results = {
+            profile: {mode: bench(profile, mode, args) for mode in ("direct", "queue")}
+            for profile in args.profiles.split(",")
+        }
+
+    print(json.dumps({"writers": args.writers, "writes": args.writes, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the Pydantic response-model path for GET /api/notes against the
+column-projected fast path. tests/test_list_serialization.py checks that
+both produce the same JSON.
+
+Usage:
+    python -m benchmarks.list_serialization [--notes 200] [--rounds 200]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+
+    from sqlalchemy import select
+
+    from backend.database import SessionLocal, create_tables
+    from backend.models import Note
+    from backend.repositories import note_repository, user_repository
+    from backend.routers.notes import encode_note_list
+    from backend.schemas import NoteListResponse
+    from backend.utils import encoding
+
+    create_tables()
+    db = SessionLocal()
+    user = user_repository.add_user(db, "bench", "x", "y")
+    note_repository.create_notes(
+        db,
+        [{"title": f"note {i}", "content": "lorem ipsum dolor " * (i % 50 + 1)}
+         for i in range(args.notes)],
+        user.id
+    )
+
+    def pydantic_path() -> bytes:
+        notes = db.scalars(
+            select(Note).where(Note.user_id == user.id)
+            .order_by(Note.updated_at.desc(), Note.id.desc())
+            .limit(args.notes)
+        ).all()
+        db.expunge_all()
+        return NoteListResponse.model_validate(
+            {"items": notes, "next_cursor": None}
+        ).model_dump_json().encode()
+
+    def fast_path() -> bytes:
+        notes, next_cursor = note_repository.get_user_notes(db, user.id, limit=args.notes)
+        return encode_note_list(notes, next_cursor, tuple(note_repository.NOTE_FIELDS))
+
+    results = {"encoder": "orjson" if encoding.orjson is not None else "json"}
+    for name, fn in (("pydantic", pydantic_path), ("fast", fast_path)):
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            fn()
+        results[f"{name}_ms_per_page"] = round((time.perf_counter() - start) / args.rounds * 1000, 3)
+
+    results["speedup"] = round(results["pydantic_ms_per_page"] / results["fast_ms_per_page"], 2)
+    print(json.dumps({"notes_per_page": args.notes, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Run a scripted mixed workload against the API and report throughput and
+latency percentiles per endpoint.
+
+A scratch database is seeded (see benchmarks.seed), then --concurrency
+virtual users run for --duration seconds, each logged in as one of the
+seeded users and picking operations at random with the weights of
+--mix. The app is either called in-process through its ASGI interface or
+served by a local uvicorn started on the seeded database.
+
+Results are printed (and optionally written to --output) as JSON
+together with the revision and settings they were measured with;
+compare two runs with benchmarks.compare.
+
+Usage:
+    python -m benchmarks.load [--target inprocess|uvicorn] [--concurrency 16]
+        [--duration 20] [--notes-per-user 10,100,1000,10000]
+        [--mix list=30,get=30,update=15,create=10,delete=5,login=5,signup=5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+from .seed import PASSWORD, ContentGenerator, parse_counts, seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Methods of VirtualUser that --mix can weight
+OPERATIONS = ("list", "get", "update", "create", "delete", "login", "signup")
+
+DEFAULT_MIX = "list=30,get=30,update=15,create=10,delete=5,login=5,signup=5"
+
+# Environment variables that change how the app runs, recorded with results
+SETTINGS = (
+    "NOTES_DATABASE_MODE", "NOTES_DATABASE_PROFILE", "NOTES_WRITE_MODE",
+    "NOTES_SESSION_BACKEND", "NOTES_AUTH_MODE", "NOTES_COMPRESSION"
+)
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples.
+    """
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(latencies: List[float], statuses: Counter, seconds: float) -> dict:
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "rps": round(len(ordered) / seconds, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+class VirtualUser:
+    """
+    One client session running operations for a seeded user.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, user: dict, rng: random.Random):
+        self.client = client
+        self.username = user["username"]
+        self.note_ids = user["note_ids"]
+        self.created: List[int] = []
+        self.rng = rng
+        self.content = ContentGenerator(rng.random())
+
+    def seeded_note(self) -> int:
+        # Seeded notes are only ever updated, so reads never hit a 404
+        return self.rng.choice(self.note_ids or self.created or [0])
+
+    async def list(self):
+        return "GET /api/notes", await self.client.get("/api/notes/", params={"limit": 50})
+
+    async def get(self):
+        return "GET /api/notes/{id}", await self.client.get(f"/api/notes/{self.seeded_note()}")
+
+    async def update(self):
+        return "PUT /api/notes/{id}", await self.client.put(
+            f"/api/notes/{self.seeded_note()}", json={"content": self.content.content()}
+        )
+
+    async def create(self):
+        response = await self.client.post(
+            "/api/notes/", json={"title": self.content.title(), "content": self.content.content()}
+        )
+        if response.status_code == 201:
+            self.created.append(response.json()["id"])
+        return "POST /api/notes", response
+
+    async def delete(self):
+        # Only notes this virtual user created are deleted
+        if not self.created:
+            return await self.create()
+        return "DELETE /api/notes/{id}", await self.client.delete(f"/api/notes/{self.created.pop()}")
+
+    async def login(self):
+        return "POST /api/auth/login", await self.client.post(
+            "/api/auth/login", json={"username": self.username, "password": PASSWORD}
+        )
+
+    async def signup(self):
+        username = f"load{self.rng.getrandbits(48):x}"
+        return "POST /api/auth/signup", await self.client.post(
+            "/api/auth/signup", json={"username": username, "password": PASSWORD}
+        )
+
+
+async def run_workload(make_client, users: List[dict], args) -> dict:
+    """
+    Run the virtual users and collect latencies per endpoint.
+    """
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+
+    started_at = time.perf_counter()
+    measure_from = started_at + args.warmup
+    stop_at = measure_from + args.duration
+
+    async def virtual_user(index: int):
+        rng = random.Random(index)
+        async with make_client() as client:
+            user = VirtualUser(client, users[index % len(users)], rng)
+            await user.login()
+
+            while time.perf_counter() < stop_at:
+                operation = getattr(user, rng.choices(names, weights)[0])
+                start = time.perf_counter()
+                try:
+                    endpoint, response = await operation()
+                    status = response.status_code
+                except httpx.TransportError:
+                    endpoint, status = operation.__name__, 599
+                finished = time.perf_counter()
+
+                if start >= measure_from:
+                    latencies[endpoint].append(finished - start)
+                    statuses[endpoint][status] += 1
+
+    await asyncio.gather(*(virtual_user(index) for index in range(args.concurrency)))
+    seconds = time.perf_counter() - measure_from
+
+    all_latencies = [sample for samples in latencies.values() for sample in samples]
+    all_statuses = sum(statuses.values(), Counter())
+
+    return {
+        "endpoints": {
+            endpoint: summarize(latencies[endpoint], statuses[endpoint], seconds)
+            for endpoint in sorted(latencies)
+        },
+        "total": summarize(all_latencies, all_statuses, seconds) if all_latencies else {},
+    }
+
+
+def run_inprocess(users: List[dict], args) -> dict:
+    from backend.main import app
+
+    transport = httpx.ASGITransport(app=app)
+
+    def make_client():
+        return httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+    return asyncio.run(run_workload(make_client, users, args))
+
+
+def run_uvicorn(users: List[dict], args, workdir: str) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=workdir,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        for _ in range(200):
+            try:
+                httpx.get(base_url + "/")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("server did not start")
+
+        def make_client():
+            limits = httpx.Limits(max_connections=1)
+            return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+
+        return asyncio.run(run_workload(make_client, users, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--notes-per-user", type=parse_counts, default=parse_counts("10,100,1000,10000"))
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+
+        seed_started = time.perf_counter()
+        users = seed(args.notes_per_user)
+        seed_seconds = time.perf_counter() - seed_started
+
+        if args.target == "uvicorn":
+            from backend.database import engine, read_engine
+            engine.dispose()
+            read_engine.dispose()
+            results = run_uvicorn(users, args, workdir)
+        else:
+            results = run_inprocess(users, args)
+
+    report = {
+        "revision": revision(),
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "notes_per_user": args.notes_per_user,
+        "mix": args.mix,
+        "settings": {name: os.environ[name] for name in SETTINGS if name in os.environ},
+        "seed_seconds": round(seed_seconds, 2),
+        **results,
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if output_path:
+        with open(output_path, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
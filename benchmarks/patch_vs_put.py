@@ -0,0 +1,86 @@
+"""
+Compare autosave-style edits through PATCH (one text operation) and PUT
+(the whole content) for notes of several sizes.
+
+Each edit changes one character. Reports request and response body
+sizes and the mean time per edit. Runs backend.main:app in-process
+against a scratch database.
+
+Usage:
+    python -m benchmarks.patch_vs_put [--sizes 1000,10000,50000] [--edits 200]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from .seed import ContentGenerator, parse_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=parse_counts, default=parse_counts("1000,10000,50000"))
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    credentials = {"username": "bench", "password": "benchpass"}
+    client.post("/api/auth/signup", json=credentials)
+    client.post("/api/auth/login", json=credentials)
+
+    generator = ContentGenerator(0)
+    results = {}
+
+    for size in args.sizes:
+        content = generator.content(size)
+        note = client.post("/api/notes/", json={"title": "bench", "content": content})
+        note_id, etag = note.json()["id"], note.headers["ETag"]
+        position = size // 2
+
+        def put(index: int):
+            nonlocal content, etag
+            content = content[:position] + "xy"[index % 2] + content[position + 1:]
+            response = client.put(f"/api/notes/{note_id}", json={"content": content})
+            etag = response.headers["ETag"]
+            return response
+
+        def patch(index: int):
+            nonlocal etag
+            response = client.patch(
+                f"/api/notes/{note_id}",
+                json={"operations": [{"op": "splice", "offset": position, "length": 1, "text": "xy"[index % 2]}]},
+                headers={"If-Match": etag}
+            )
+            etag = response.headers["ETag"]
+            return response
+
+        results[size] = {}
+        for name, edit in (("put", put), ("patch", patch)):
+            request_bytes = response_bytes = 0
+            started_at = time.perf_counter()
+            for index in range(args.edits):
+                response = edit(index)
+                response.raise_for_status()
+                request_bytes += len(response.request.content)
+                response_bytes += len(response.content)
+            seconds = time.perf_counter() - started_at
+
+            results[size][name] = {
+                "request_bytes": request_bytes // args.edits,
+                "response_bytes": response_bytes // args.edits,
+                "us_per_edit": round(seconds / args.edits * 1e6, 1),
+            }
+
+    print(json.dumps({"edits": args.edits, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Measure note list throughput of concurrent readers while writers
+continuously create and update notes, per database connection profile.
+
+Each profile gets a scratch database with read-only and write engines
+built by backend.database.create_sqlite_engine, as the app does. Readers
+page through the user's notes with get_user_notes; writers alternate
+create_note and update_note.
+
+Usage:
+    python -m benchmarks.read_write_concurrency [--readers 4] [--writers 1] [--seconds 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+
+def percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_profile(profile: str, args) -> dict:
+    from backend.config import DATABASE_PROFILES
+    from backend.database import Base, create_sqlite_engine
+    from backend.models import User
+    from backend.repositories import note_repository
+    from backend.search import create_search_index
+
+    pragmas = DATABASE_PROFILES[profile]
+    url = f"sqlite:///./{profile}.db"
+    write_engine = create_sqlite_engine(url, pragmas, pool_size=1)
+    read_engine = create_sqlite_engine(url, pragmas, read_only=True, pool_size=args.readers)
+
+    Base.metadata.create_all(bind=write_engine)
+    with write_engine.begin() as connection:
+        create_search_index(connection)
+
+    WriteSession = sessionmaker(bind=write_engine, expire_on_commit=False)
+    ReadSession = sessionmaker(bind=read_engine, expire_on_commit=False)
+
+    with WriteSession() as db:
+        user = User(username="bench", password_hash="-", salt="-")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        note_repository.create_notes(db, [
+            {"title": f"note {i}", "content": "lorem ipsum dolor sit amet " * 20}
+            for i in range(args.notes)
+        ], user_id)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_latencies = []
+    counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+
+    def reader():
+        latencies = []
+        reads = errors = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with ReadSession() as db:
+                    note_repository.get_user_notes(db, user_id, limit=50)
+                latencies.append(time.perf_counter() - start)
+                reads += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            read_latencies.extend(latencies)
+            counts["reads"] += reads
+            counts["read_errors"] += errors
+
+    def writer():
+        writes = errors = 0
+        last_id = None
+        while not stop.is_set():
+            try:
+                with WriteSession() as db:
+                    if last_id is None or writes % 2 == 0:
+                        last_id = note_repository.create_note(db, "new", "written " * 50, user_id).id
+                    else:
+                        note_repository.update_note(db, last_id, user_id, content="updated " * 50)
+                writes += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["writes"] += writes
+            counts["write_errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    write_engine.dispose()
+    read_engine.dispose()
+
+    return {
+        "reads_per_second": round(counts["reads"] / args.seconds, 1),
+        "writes_per_second": round(counts["writes"] / args.seconds, 1),
+        "read_errors": counts["read_errors"],
+        "write_errors": counts["write_errors"],
+        "read_p50_ms": round(statistics.median(read_latencies) * 1000, 2) if read_latencies else None,
+        "read_p99_ms": round(percentile(read_latencies, 0.99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--profiles", default="default,tuned")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        results = {
+            profile: bench_profile(profile, args)
+            for profile in args.profiles.split(",")
+        }
+
+    print(json.dumps({
+        "readers": args.readers,
+        "writers": args.writers,
+        "seconds": args.seconds,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measure the storage and read cost of note revision history.
+
+One note of --size characters receives --edits autosave-style edits (a
+few characters typed, deleted or replaced at a random position) through
+note_repository.update_note, which stores a revision per edit. Reports:
+
+- storage amplification: bytes stored for the note and all its
+  revisions over the bytes of the note alone, against keeping every
+  version in full
+- write cost per edit
+- reconstruction cost of fetching every revision with get_revision
+
+Usage:
+    python -m benchmarks.revisions [--size 40000] [--edits 500]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from .load import percentile
+from .seed import PASSWORD, ContentGenerator
+
+
+def edit(content: str, rng: random.Random, generator: ContentGenerator) -> str:
+    position = rng.randrange(len(content))
+    roll = rng.random()
+
+    if roll < 0.6:
+        return content[:position] + generator.content(rng.randint(1, 20)) + content[position:]
+    if roll < 0.8:
+        return content[:position] + content[position + rng.randint(1, 20):]
+    return content[:position] + generator.content(rng.randint(1, 40)) + content[position + rng.randint(1, 40):]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=40_000)
+    parser.add_argument("--edits", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+
+    from sqlalchemy import func, select, type_coerce
+    from sqlalchemy.types import LargeBinary
+
+    from backend.compression import encode_content
+    from backend.config import REVISION_KEYFRAME_INTERVAL
+    from backend.database import SessionLocal, create_tables
+    from backend.models import Note, NoteRevision
+    from backend.repositories import note_repository, user_repository
+    from backend.utils.security import generate_salt, hash_password
+
+    create_tables()
+    rng = random.Random(0)
+    generator = ContentGenerator(0)
+
+    def stored_bytes(value: str) -> int:
+        encoded = encode_content(value)
+        return len(encoded if isinstance(encoded, bytes) else encoded.encode())
+
+    with SessionLocal() as db:
+        salt = generate_salt()
+        user = user_repository.add_user(db, "bench", hash_password(PASSWORD, salt), salt)
+        content = generator.content(args.size)
+        note = note_repository.create_note(db, "bench", content, user.id)
+
+        full_copy_bytes = 0
+        started_at = time.perf_counter()
+        for _ in range(args.edits):
+            full_copy_bytes += stored_bytes(content)
+            content = edit(content, rng, generator)
+            note_repository.update_note(db, note.id, user.id, content=content)
+        write_seconds = time.perf_counter() - started_at
+
+        revision_bytes, keyframes = db.execute(
+            select(func.sum(func.length(type_coerce(NoteRevision.data, LargeBinary))), func.count().filter(NoteRevision.keyframe))
+            .where(NoteRevision.note_id == note.id)
+        ).one()
+        note_bytes = stored_bytes(content)
+
+        timings = []
+        for number in range(1, args.edits + 1):
+            started_at = time.perf_counter()
+            note_repository.get_revision(db, note.id, user.id, number)
+            timings.append(time.perf_counter() - started_at)
+
+    timings.sort()
+
+    print(json.dumps({
+        "size": args.size,
+        "edits": args.edits,
+        "keyframe_interval": REVISION_KEYFRAME_INTERVAL,
+        "keyframes": keyframes,
+        "note_bytes": note_bytes,
+        "revision_bytes": revision_bytes,
+        "revision_bytes_per_edit": round(revision_bytes / args.edits),
+        "amplification": round((note_bytes + revision_bytes) / note_bytes, 2),
+        "full_copy_amplification": round((note_bytes + full_copy_bytes) / note_bytes, 2),
+        "update_us_per_edit": round(write_seconds / args.edits * 1e6, 1),
+        "reconstruct_ms": {
+            "mean": round(sum(timings) / len(timings) * 1000, 3),
+            "p50": round(percentile(timings, 0.50) * 1000, 3),
+            "p95": round(percentile(timings, 0.95) * 1000, 3),
+            "max": round(timings[-1] * 1000, 3),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
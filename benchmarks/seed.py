@@ -0,0 +1,125 @@
+"""
+Seed a notes database with benchmark users and notes.
+
+Creates one user per entry of --notes-per-user, each with that many notes
+of mixed sizes (mostly short, some of a few KB, a few long ones), through
+the same repository functions the API uses, so search index, statistics
+and change sequence are all populated. Every user has the password
+PASSWORD.
+
+Usage:
+    python -m benchmarks.seed [--notes-per-user 10,100,1000,10000,100000] [--dir .]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+PASSWORD = "benchpass"
+
+WORDS = (
+    "meeting project deadline review draft idea todo call follow budget team "
+    "design release fix bug customer feedback plan week notes summary research "
+    "the a and of to in for on with is this that from by at as be"
+).split()
+
+# (probability, min chars, max chars) of note content sizes
+CONTENT_SIZES = ((0.6, 50, 500), (0.3, 1_000, 4_000), (0.1, 10_000, 20_000))
+
+
+class ContentGenerator:
+    """
+    Prose-like note bodies cut from a fixed random corpus.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.corpus = " ".join(self.rng.choice(WORDS) for _ in range(8_000))
+
+    def size(self) -> int:
+        roll = self.rng.random()
+        for probability, low, high in CONTENT_SIZES:
+            if roll < probability:
+                return self.rng.randint(low, high)
+            roll -= probability
+        return CONTENT_SIZES[-1][2]
+
+    def content(self, size: Optional[int] = None) -> str:
+        size = size or self.size()
+        start = self.rng.randrange(len(self.corpus) - size) if size < len(self.corpus) else 0
+        return self.corpus[start:start + size]
+
+    def title(self) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(2, 6)))
+
+
+def seed(notes_per_user: List[int], prefix: str = "seed", random_seed: int = 0) -> List[Dict]:
+    """
+    Create the users and their notes in the database of the current
+    directory.
+
+    Args:
+        notes_per_user: Number of notes of each user to create
+        prefix: Username prefix; users are named prefix0, prefix1, ...
+        random_seed: Random seed of the generated content
+
+    Returns:
+        One dict per user with id, username and note_ids
+    """
+    from backend.config import BATCH_MAX_ITEMS
+    from backend.database import SessionLocal, create_tables
+    from backend.repositories import note_repository, user_repository
+    from backend.utils.security import generate_salt, hash_password
+
+    create_tables()
+    generator = ContentGenerator(random_seed)
+
+    # One PBKDF2 hash shared by all seeded users
+    salt = generate_salt()
+    password_hash = hash_password(PASSWORD, salt)
+
+    users = []
+    with SessionLocal() as db:
+        for index, count in enumerate(notes_per_user):
+            user = user_repository.add_user(db, f"{prefix}{index}", password_hash, salt)
+            note_ids = []
+
+            for offset in range(0, count, BATCH_MAX_ITEMS):
+                notes = note_repository.create_notes(db, [
+                    {"title": generator.title(), "content": generator.content()}
+                    for _ in range(min(BATCH_MAX_ITEMS, count - offset))
+                ], user.id)
+                note_ids.extend(note.id for note in notes)
+                db.expunge_all()
+
+            users.append({"id": user.id, "username": user.username, "note_ids": note_ids})
+
+    return users
+
+
+def parse_counts(value: str) -> List[int]:
+    return [int(count) for count in value.split(",") if count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes-per-user", type=parse_counts, default=parse_counts("10,100,1000,10000"))
+    parser.add_argument("--dir", default=".", help="directory of the notes.db to seed")
+    args = parser.parse_args()
+
+    os.chdir(args.dir)
+
+    start = time.perf_counter()
+    users = seed(args.notes_per_user)
+
+    print(json.dumps({
+        "users": [{"username": user["username"], "notes": len(user["note_ids"])} for user in users],
+        "seconds": round(time.perf_counter() - start, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure payload size and latency of GET /api/notes with the default
+summary projection against fields=full.
+
+Usage:
+    python -m benchmarks.sparse_fields [--notes 200] [--rounds 100]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    credentials = {"username": "bench", "password": "benchpass"}
+    client.post("/api/auth/signup", json=credentials)
+    client.post("/api/auth/login", json=credentials)
+
+    for start in range(0, args.notes, 500):
+        client.post("/api/notes/batch", json=[
+            {"title": f"note {i}", "content": "lorem ipsum dolor sit amet " * (i % 400 + 10)}
+            for i in range(start, min(start + 500, args.notes))
+        ])
+
+    results = {}
+    for fields in ("full", "summary"):
+        params = {"limit": min(args.notes, 200), "fields": fields}
+        size = len(client.get("/api/notes/", params=params).content)
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            client.get("/api/notes/", params=params)
+        elapsed = time.perf_counter() - start
+
+        results[fields] = {
+            "payload_bytes": size,
+            "ms_per_request": round(elapsed / args.rounds * 1000, 3),
+        }
+
+    print(json.dumps({"notes_per_page": min(args.notes, 200), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
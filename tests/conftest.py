@@ -0,0 +1,62 @@
+"""
+Shared fixtures.
+
+The app opens notes.db in the working directory when backend.database is
+imported, so the tests move to a scratch directory before importing it.
+"""
+
+import os
+import tempfile
+import uuid
+
+os.chdir(tempfile.mkdtemp())
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+pytest_plugins = ["backend.pytest_plugin"]
+
+PASSWORD = "password1"
+
+
+def log_in_new_user(client: TestClient) -> TestClient:
+    """
+    Sign up and log in client as a new user.
+    """
+    credentials = {"username": f"user_{uuid.uuid4().hex[:12]}", "password": PASSWORD}
+    client.post("/api/auth/signup", json=credentials).raise_for_status()
+    client.post("/api/auth/login", json=credentials).raise_for_status()
+    # get_current_user caches the user from the first authenticated
+    # request on, so statement counts below cover the routes only
+    client.get("/api/notes/").raise_for_status()
+    return client
+
+
+@pytest.fixture
+def client():
+    """
+    Client logged in as a new user, so tests never see each other's notes.
+    """
+    with TestClient(app) as client:
+        yield log_in_new_user(client)
+
+
+@pytest.fixture
+def other_client(client):
+    """
+    Client logged in as a second new user, next to client's.
+    """
+    with TestClient(app) as other_client:
+        yield log_in_new_user(other_client)
+
+
+@pytest.fixture
+def note(client):
+    """
+    A note of the client's user, as returned by POST /api/notes.
+    """
+    response = client.post("/api/notes/", json={"title": "Title", "content": "Some content"})
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,53 @@
+"""
+Signup, login and the session backends behind them.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import auth
+from backend.main import app
+from backend.repositories import async_user_repository, user_repository
+
+from .conftest import PASSWORD
+
+
+@pytest.fixture
+def credentials():
+    return {"username": f"user_{uuid.uuid4().hex[:12]}", "password": PASSWORD}
+
+
+def test_signup_taken_username(credentials):
+    with TestClient(app) as client:
+        assert client.post("/api/auth/signup", json=credentials).status_code == 201
+
+        response = client.post("/api/auth/signup", json=credentials)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+
+def test_signup_loses_race(credentials, monkeypatch):
+    async def not_found_async(db, username):
+        return None
+
+    with TestClient(app) as client:
+        client.post("/api/auth/signup", json=credentials).raise_for_status()
+        # As if a concurrent signup took the username after the check
+        monkeypatch.setattr(user_repository, "get_user_by_username", lambda db, username: None)
+        monkeypatch.setattr(async_user_repository, "get_user_by_username", not_found_async)
+
+        response = client.post("/api/auth/signup", json=credentials)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+
+def test_token_mode_requires_secret(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_MODE", "token")
+    monkeypatch.setattr(auth, "TOKEN_SECRET", "")
+
+    with pytest.raises(ValueError, match="NOTES_TOKEN_SECRET"):
+        auth._create_backend()
@@ -0,0 +1,61 @@
+"""
+Batch create, update and delete with per-item statuses.
+"""
+
+import pytest
+
+from backend.utils.pagination import MAX_INTEGER
+
+
+def test_create(client):
+    response = client.post("/api/notes/batch", json=[
+        {"title": "One", "content": "1"}, {"title": "Two", "content": "2"}
+    ])
+
+    assert response.status_code == 201
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["created", "created"]
+    assert [item["note"]["title"] for item in items] == ["One", "Two"]
+
+
+def test_update_mixed_statuses(client, note):
+    other = client.post("/api/notes/", json={"title": "Other", "content": "x"}).json()
+
+    response = client.put("/api/notes/batch", json=[
+        {"id": note["id"], "content": "New content"},
+        {"id": other["id"]},
+        {"id": MAX_INTEGER, "title": "Missing"},
+    ])
+
+    assert response.status_code == 200
+    assert [(item["id"], item["status"]) for item in response.json()["items"]] == [
+        (note["id"], "updated"), (other["id"], "unchanged"), (MAX_INTEGER, "not_found")
+    ]
+    assert response.json()["items"][2]["note"] is None
+    assert client.get(f"/api/notes/{note['id']}").json()["content"] == "New content"
+
+
+def test_delete_mixed_statuses(client, note):
+    response = client.post("/api/notes/batch/delete", json={"ids": [note["id"], note["id"] + 1000]})
+
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()["items"]] == ["deleted", "not_found"]
+    assert client.get(f"/api/notes/{note['id']}").status_code == 404
+
+
+def test_other_users_note_not_found(client, other_client, note):
+    response = other_client.post("/api/notes/batch/delete", json={"ids": [note["id"]]})
+
+    assert response.json()["items"] == [{"id": note["id"], "status": "not_found", "note": None}]
+    assert client.get(f"/api/notes/{note['id']}").status_code == 200
+
+
+@pytest.mark.parametrize("method, url, body", [
+    ("PUT", "/api/notes/batch", []),
+    ("POST", "/api/notes/batch/delete", {"ids": []}),
+    ("PUT", "/api/notes/batch", [{"id": MAX_INTEGER + 1, "title": "x"}]),
+    ("PUT", "/api/notes/batch", [{"id": 0, "title": "x"}]),
+    ("POST", "/api/notes/batch/delete", {"ids": [MAX_INTEGER + 1]}),
+], ids=["update_empty", "delete_empty", "update_too_large", "update_zero", "delete_too_large"])
+def test_invalid(client, method, url, body):
+    assert client.request(method, url, json=body).status_code == 422
@@ -0,0 +1,88 @@
+"""
+The LRU cache and the user identity cache built on it.
+"""
+
+import time
+
+from sqlalchemy import select
+
+from backend.database import SessionLocal
+from backend.models import User
+from backend.profiler import profiler
+from backend.repositories.user_repository import user_cache
+from backend.utils.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_bounded_by_bytes():
+    cache = LRUCache(max_size=10, ttl_seconds=60, max_bytes=10)
+    cache.set("a", b"x" * 6)
+    cache.set("b", b"x" * 6)
+    cache.set("big", b"x" * 11)
+
+    assert (cache.get("a"), cache.get("big")) == (None, None)
+    assert cache.stats()["bytes"] == 6
+
+
+def test_entries_expire(monkeypatch):
+    cache = LRUCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidate_fails_concurrent_set():
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("a", "old")
+    # A reader starts loading, then a write invalidates before it caches
+    generation = cache.generation
+    cache.invalidate(["a"])
+    cache.set("a", "stale", generation)
+
+    assert cache.get("a") is None
+    cache.set("a", "new", cache.generation)
+    assert cache.get("a") == "new"
+
+
+def user_queries(client) -> int:
+    with profiler.capture() as profiles:
+        client.get("/api/auth/me").raise_for_status()
+    return sum("FROM users" in record.sql for record in profiles[0].statements)
+
+
+def test_user_served_from_cache(client):
+    assert user_queries(client) == 0
+
+    user_cache.clear()
+
+    assert user_queries(client) == 1
+    assert user_queries(client) == 0
+
+
+def test_user_change_invalidates_cache(client):
+    username = client.get("/api/auth/me").json()["username"]
+
+    with SessionLocal() as db:
+        user = db.scalar(select(User).where(User.username == username))
+        user.username = username + "_renamed"
+        db.commit()
+
+    assert client.get("/api/auth/me").json()["username"] == username + "_renamed"
+
+    with SessionLocal() as db:
+        db.delete(db.get(User, user.id))
+        db.commit()
+
+    assert client.get("/api/auth/me").status_code == 401
@@ -0,0 +1,19 @@
+"""
+Change feed cursors.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize("since", ["99999999999999999999", "-1", "0.-5", "1.99999999999999999999", "x"])
+def test_invalid_cursor(client, since):
+    response = client.get("/api/notes/changes", params={"since": since})
+
+    assert response.status_code == 400
+
+
+def test_largest_cursor(client, note):
+    response = client.get("/api/notes/changes", params={"since": str(2 ** 63 - 1)})
+
+    assert response.status_code == 200
+    assert response.json()["changes"] == []
@@ -0,0 +1,47 @@
+"""
+Note content compressed at rest, and sent as-is where HTTP allows.
+"""
+
+import functools
+
+import pytest
+from sqlalchemy import Text, select, type_coerce
+
+from backend import compression
+from backend.database import SessionLocal
+from backend.models import Note
+
+CONTENT = "Compressible content, " * 200
+
+
+@pytest.fixture(params=["zlib", "lzma", "none"])
+def codec(request, monkeypatch):
+    """
+    Store content with each NOTES_COMPRESSION codec.
+    """
+    monkeypatch.setattr(
+        compression, "encode_content",
+        functools.partial(compression.encode_content, codec=request.param)
+    )
+    return request.param
+
+
+def stored_content(note_id: int):
+    with SessionLocal() as db:
+        return db.scalar(select(type_coerce(Note.content, Text())).where(Note.id == note_id))
+
+
+@pytest.mark.parametrize("accept_encoding", ["deflate", "gzip, deflate;q=0", "identity"])
+def test_content_round_trip(client, codec, accept_encoding):
+    note = client.post("/api/notes/", json={"title": "Long", "content": CONTENT}).json()
+    marker = {"zlib": compression.ZLIB_MARKER, "lzma": compression.LZMA_MARKER}.get(codec)
+
+    response = client.get(f"/api/notes/{note['id']}/content", headers={"Accept-Encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert response.text == CONTENT
+    assert client.get(f"/api/notes/{note['id']}").json()["content"] == CONTENT
+    stored = stored_content(note["id"])
+    assert (stored[:1] == marker) if marker else stored == CONTENT
+    sent_as_is = codec == "zlib" and accept_encoding == "deflate"
+    assert (response.headers.get("Content-Encoding") == "deflate") is sent_as_is
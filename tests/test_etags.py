@@ -0,0 +1,71 @@
+"""
+ETags and conditional requests on notes and note lists.
+"""
+
+import pytest
+
+from backend.repositories.note_repository import note_cache
+from backend.utils.etags import etag_matches
+
+
+@pytest.mark.parametrize("header, weak, expected", [
+    ('"a"', True, True),
+    ('"b", "a"', True, True),
+    ('W/"a"', True, True),
+    ('W/"a"', False, False),
+    ("*", False, True),
+    ('"b"', True, False),
+    (None, True, False),
+])
+def test_etag_matches(header, weak, expected):
+    assert etag_matches(header, '"a"', weak=weak) is expected
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_note_not_modified(client, note, cached):
+    etag = client.get(f"/api/notes/{note['id']}").headers["ETag"]
+    if not cached:
+        note_cache.clear()
+
+    response = client.get(f"/api/notes/{note['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_note_modified(client, note):
+    etag = client.get(f"/api/notes/{note['id']}").headers["ETag"]
+    client.put(f"/api/notes/{note['id']}", json={"content": "Changed"}).raise_for_status()
+
+    response = client.get(f"/api/notes/{note['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["content"] == "Changed"
+
+
+def test_update_if_match(client, note):
+    etag = client.get(f"/api/notes/{note['id']}").headers["ETag"]
+
+    first = client.put(f"/api/notes/{note['id']}", json={"title": "First"}, headers={"If-Match": etag})
+    second = client.put(f"/api/notes/{note['id']}", json={"title": "Second"}, headers={"If-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert client.get(f"/api/notes/{note['id']}").json()["title"] == "First"
+
+
+def test_list_not_modified_until_a_note_changes(client, other_client, note):
+    etag = client.get("/api/notes/").headers["ETag"]
+    # Another user's writes leave the list as it was
+    other_client.post("/api/notes/", json={"title": "Other", "content": "x"}).raise_for_status()
+
+    assert client.get("/api/notes/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/notes/", params={"limit": 1}, headers={"If-None-Match": etag}).status_code == 200
+
+    client.delete(f"/api/notes/{note['id']}").raise_for_status()
+
+    response = client.get("/api/notes/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"] == []
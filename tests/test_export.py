@@ -0,0 +1,37 @@
+"""
+NDJSON export and its Accept-Encoding negotiation.
+"""
+
+import json
+
+import pytest
+
+from backend.compression import accepts_encoding
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("gzip", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, *", False),
+    ("br, *;q=0.1", True),
+    ("*;q=0", False),
+    ("x-gzip", False),
+    ("gzip;q=high", False),
+])
+def test_accepts_encoding(header, expected):
+    assert accepts_encoding(header, "gzip") is expected
+
+
+@pytest.mark.parametrize("accept_encoding, encoded", [
+    ("gzip", True), ("gzip;q=0", False), ("identity", False)
+])
+def test_export_encoding(client, note, accept_encoding, encoded):
+    response = client.get("/api/notes/export", headers={"Accept-Encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert (response.headers.get("Content-Encoding") == "gzip") is encoded
+    [line] = response.text.splitlines()
+    assert json.loads(line)["content"] == note["content"]
@@ -0,0 +1,36 @@
+"""
+The bounded password hashing pool.
+"""
+
+import threading
+
+import pytest
+
+from backend.utils.hashing import HashingPool, HashingPoolFull, hashing_pool
+
+from .conftest import PASSWORD
+
+
+def test_rejects_past_queue_limit():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running, queued = pool.submit(release.wait), pool.submit(release.wait)
+
+    with pytest.raises(HashingPoolFull):
+        pool.submit(release.wait)
+
+    release.set()
+    assert running.result() and queued.result()
+    assert pool.submit(sum, [1, 2]).result() == 3
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["in_flight"]) == (3, 1, 0)
+
+
+def test_full_pool_answers_503(client, monkeypatch):
+    username = client.get("/api/auth/me").json()["username"]
+    monkeypatch.setattr(hashing_pool, "_capacity", 0)
+
+    response = client.post("/api/auth/login", json={"username": username, "password": PASSWORD})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,68 @@
+"""
+NDJSON import batching and line limits.
+"""
+
+import json
+
+from backend.config import IMPORT_MAX_LINE_BYTES, NOTE_CONTENT_MAX_LENGTH
+from backend.routers import notes as notes_router
+
+
+def ndjson(*notes) -> bytes:
+    return b"".join(json.dumps(note).encode() + b"\n" for note in notes)
+
+
+def test_batches_flush_by_bytes(client, monkeypatch):
+    # Every line fills a batch, so each note is inserted on its own
+    monkeypatch.setattr(notes_router, "IMPORT_BATCH_BYTES", 1)
+
+    body = ndjson(*({"title": f"Note {index}", "content": "x" * 100} for index in range(3)))
+    response = client.post("/api/notes/import", content=body + b"not json\n")
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 4:")
+    assert "(3 notes of earlier lines were imported)" in response.json()["detail"]
+    assert len(client.get("/api/notes/").json()["items"]) == 3
+
+
+def test_largest_note_with_escaped_content(client):
+    # json.dumps escapes non-ASCII as \uXXXX: six bytes per character
+    line = ndjson({"title": "Ü" * 200, "content": "ü" * NOTE_CONTENT_MAX_LENGTH})
+    assert len(line) <= IMPORT_MAX_LINE_BYTES
+
+    response = client.post("/api/notes/import", content=line)
+
+    assert response.status_code == 201
+    assert response.json() == {"imported": 1}
+
+
+def test_line_too_long(client):
+    response = client.post("/api/notes/import", content=b"x" * (IMPORT_MAX_LINE_BYTES + 1))
+
+    assert response.status_code == 413
+
+
+def test_timestamp_out_of_range_in_utc(client):
+    body = ndjson(
+        {"title": "Fine", "content": "x", "created_at": "2024-01-01T12:00:00+02:00"},
+        {"title": "Too early", "content": "x", "created_at": "0001-01-01T00:00:00+01:00"},
+    )
+
+    response = client.post("/api/notes/import", content=body)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 2: Value error, Timestamp is out of range")
+    assert client.get("/api/notes/").json()["items"] == []
+
+
+def test_timestamps_kept_in_utc(client):
+    body = ndjson({
+        "title": "Dated", "content": "x",
+        "created_at": "2024-01-01T12:00:00+02:00", "updated_at": "2024-01-02T00:00:00"
+    })
+
+    assert client.post("/api/notes/import", content=body).status_code == 201
+
+    [item] = client.get("/api/notes/").json()["items"]
+    assert item["created_at"] == "2024-01-01T10:00:00Z"
+    assert item["updated_at"] == "2024-01-02T00:00:00Z"
@@ -0,0 +1,65 @@
+"""
+The fast list encoding must produce exactly what NoteListResponse would.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from backend.database import SessionLocal
+from backend.models import Note
+from backend.repositories import note_repository, user_repository
+from backend.routers.notes import encode_note_list
+from backend.schemas import NoteListResponse
+from backend.utils import encoding
+
+NOTES = [
+    # Whole second: no fractional part in the JSON
+    {"title": "Whole second", "content": "plain",
+     "created_at": datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)},
+    {"title": "Microseconds", "content": "x" * 3000,
+     "created_at": datetime(2024, 1, 2, 12, 0, 0, 120, tzinfo=timezone.utc)},
+    {"title": "Ünïcödé ✓ 日本語 🎉", "content": "emoji 🎉, quotes \" and \\ backslash\n\ttab  ",
+     "created_at": datetime(2024, 1, 3, tzinfo=timezone.utc)},
+    {"title": "Empty", "content": "",
+     "created_at": datetime(2024, 1, 4, 0, 0, 0, 999999, tzinfo=timezone.utc)},
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """
+    Run with orjson (if installed) and with the standard library fallback.
+    """
+    if request.param == "orjson" and encoding.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "json":
+        monkeypatch.setattr(encoding, "orjson", None)
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def user_id():
+    with SessionLocal() as db:
+        user = user_repository.add_user(db, "serialization", "hash", "salt")
+        note_repository.import_notes(db, NOTES, user.id)
+        return user.id
+
+
+@pytest.mark.parametrize("limit", [len(NOTES) - 1, len(NOTES)], ids=["next_page", "last_page"])
+def test_matches_note_list_response(encoder, user_id, limit):
+    with SessionLocal() as db:
+        rows, next_cursor = note_repository.get_user_notes(db, user_id, limit=limit)
+        notes = db.scalars(
+            select(Note).where(Note.user_id == user_id)
+            .order_by(Note.updated_at.desc(), Note.id.desc())
+            .limit(limit)
+        ).all()
+
+    expected = NoteListResponse.model_validate(
+        {"items": notes, "next_cursor": next_cursor}, from_attributes=True
+    ).model_dump_json().encode()
+
+    assert (next_cursor is None) == (limit == len(NOTES))
+    assert encode_note_list(rows, next_cursor, tuple(note_repository.NOTE_FIELDS)) == expected
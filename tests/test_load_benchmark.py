@@ -0,0 +1,65 @@
+"""
+Helpers of the load benchmark, and a short in-process run of it.
+"""
+
+import argparse
+import uuid
+from collections import Counter
+
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.load import DEFAULT_MIX, parse_mix, percentile, run_inprocess, summarize
+from benchmarks.seed import ContentGenerator, seed
+
+
+def test_parse_mix():
+    assert parse_mix("list=3,get=1") == {"list": 3, "get": 1}
+
+    with pytest.raises(argparse.ArgumentTypeError, match="unknown operation 'search'"):
+        parse_mix("search=1")
+
+
+def test_percentile_is_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert (percentile(samples, 0.5), percentile(samples, 0.99), percentile(samples, 1.0)) == (50, 99, 100)
+    assert percentile([7.0], 0.01) == 7.0
+
+
+def test_summarize_counts_errors():
+    summary = summarize([0.002, 0.001], Counter({200: 1, 503: 1}), seconds=2)
+
+    assert summary["requests"] == 2 and summary["errors"] == 1
+    assert (summary["rps"], summary["p50_ms"], summary["p99_ms"]) == (1.0, 1.0, 2.0)
+
+
+def test_compare_reports_change():
+    run = {"total": {"rps": 100, "p50_ms": 2, "p95_ms": 4, "p99_ms": 8, "errors": 0}}
+    faster = {"total": dict(run["total"], rps=150, p99_ms=6)}
+
+    report = compare(dict(run, endpoints={}), dict(faster, endpoints={}))["endpoints"]["total"]
+
+    assert report["rps"]["change_percent"] == 50.0
+    assert report["p99_ms"]["change_percent"] == -25.0
+    assert report["errors"]["change_percent"] is None
+
+
+def test_content_generator_is_seeded():
+    first, second = ContentGenerator(3), ContentGenerator(3)
+
+    assert [first.content() for _ in range(5)] == [second.content() for _ in range(5)]
+
+
+def test_inprocess_run():
+    users = seed([3, 3], prefix=f"load_{uuid.uuid4().hex[:8]}_")
+    args = argparse.Namespace(mix=parse_mix(DEFAULT_MIX), concurrency=2, warmup=0, duration=0.5)
+
+    result = run_inprocess(users, args)
+
+    assert result["total"]["requests"] > 0
+    assert result["total"]["errors"] == 0, result["total"]["statuses"]
+    assert set(result["endpoints"]) <= {
+        "GET /api/notes", "GET /api/notes/{id}", "PUT /api/notes/{id}", "POST /api/notes",
+        "DELETE /api/notes/{id}", "POST /api/auth/login", "POST /api/auth/signup",
+    }
@@ -0,0 +1,62 @@
+"""
+Request and SQL metrics on /metrics.
+"""
+
+from typing import Dict
+
+from backend.metrics import Histogram
+
+
+def samples(client) -> Dict[str, float]:
+    response = client.get("/metrics")
+    response.raise_for_status()
+    return {
+        name: float(value)
+        for name, _, value in (line.rpartition(" ") for line in response.text.splitlines())
+        if not name.startswith("#")
+    }
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    lines = []
+    histogram.render("latency", 'route="/"', lines)
+
+    assert lines == [
+        'latency_bucket{route="/",le="1"} 2',
+        'latency_bucket{route="/",le="5"} 3',
+        'latency_bucket{route="/",le="+Inf"} 4',
+        'latency_sum{route="/"} 14.5',
+        'latency_count{route="/"} 4',
+    ]
+
+
+def test_requests_counted_by_route_template(client, note):
+    labels = 'method="GET",route="/api/notes/{note_id}"'
+    before = samples(client)
+
+    client.get(f"/api/notes/{note['id']}")
+    client.get(f"/api/notes/{note['id'] + 1000}")
+
+    after = samples(client)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta(f"notes_http_request_duration_seconds_count{{{labels}}}") == 2
+    assert delta(f'notes_http_responses_total{{{labels},status="200"}}') == 1
+    assert delta(f'notes_http_responses_total{{{labels},status="404"}}') == 1
+    assert delta(f"notes_db_statements_per_request_count{{{labels}}}") == 2
+    assert delta(f"notes_db_statements_per_request_sum{{{labels}}}") >= 1
+
+
+def test_component_gauges(client):
+    names = samples(client)
+
+    assert "notes_user_cache_hits" in names
+    assert "notes_note_cache_size" in names
+    assert "notes_sessions_live" in names or "notes_sessions_issued" in names
+    assert names["notes_http_requests_in_flight"] == 1
@@ -0,0 +1,68 @@
+"""
+Note previews and statistics, kept in step with content on every write.
+"""
+
+import hashlib
+
+import pytest
+from sqlalchemy import update
+
+from backend.database import engine
+from backend.models import Note
+from backend.note_stats import backfill, content_stats
+
+
+def test_content_stats():
+    content = "  First line\n\n\tsecond   line  "
+
+    assert content_stats(content, preview_length=15) == {
+        "preview": "First line seco",
+        "word_count": 4,
+        "char_count": len(content),
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+    }
+
+
+def listed(client, note_id: int) -> dict:
+    [item] = [item for item in client.get("/api/notes/").json()["items"] if item["id"] == note_id]
+    return item
+
+
+@pytest.mark.parametrize("write", ["put", "patch", "batch"])
+def test_stats_follow_content(client, note, write):
+    url = f"/api/notes/{note['id']}"
+    if write == "put":
+        client.put(url, json={"content": "three new words"}).raise_for_status()
+    elif write == "patch":
+        etag = client.get(url).headers["ETag"]
+        client.patch(url, headers={"If-Match": etag}, json={
+            "operations": [{"op": "splice", "offset": 0, "length": 12, "text": "three new words"}]
+        }).raise_for_status()
+    else:
+        client.put("/api/notes/batch", json=[{"id": note["id"], "content": "three new words"}]).raise_for_status()
+
+    item = listed(client, note["id"])
+
+    assert "content" not in item
+    assert (item["preview"], item["word_count"], item["char_count"]) == ("three new words", 3, 15)
+    assert item["content_hash"] == hashlib.sha256(b"three new words").hexdigest()
+
+
+def test_list_fields(client, note):
+    item = client.get("/api/notes/", params={"fields": "id,content"}).json()["items"][0]
+
+    assert item == {"id": note["id"], "content": "Some content"}
+    assert client.get("/api/notes/", params={"fields": "id,secret"}).status_code == 400
+
+
+def test_backfill(client, note):
+    with engine.begin() as connection:
+        connection.execute(
+            update(Note.__table__).where(Note.id == note["id"])
+            .values(preview="", word_count=0, char_count=0, content_hash=None, updated_at=Note.updated_at)
+        )
+        assert backfill(connection) == 1
+        assert backfill(connection) == 0
+
+    item = listed(client, note["id"])
+    assert (item["preview"], item["word_count"], item["updated_at"]) == ("Some content", 2, note["updated_at"])
@@ -0,0 +1,15 @@
+"""
+OpenAPI documentation of routes that return pre-encoded responses.
+"""
+
+from backend.main import app
+
+
+def test_list_notes_documents_every_shape():
+    operation = app.openapi()["paths"]["/api/notes/"]["get"]
+    schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert {ref["$ref"].rsplit("/", 1)[1] for ref in schema["anyOf"]} == {
+        "NoteSummaryListResponse", "NoteListResponse", "NoteFieldsListResponse"
+    }
+    assert "304" in operation["responses"]
@@ -0,0 +1,95 @@
+"""
+PATCH of note content with text operations and unified diffs.
+"""
+
+import difflib
+import hashlib
+
+import pytest
+
+from backend.config import NOTE_CONTENT_MAX_LENGTH
+from backend.text_patch import PatchError, apply_operations
+
+
+def create(client, content: str):
+    response = client.post("/api/notes/", json={"title": "Patch", "content": content})
+    response.raise_for_status()
+    return response.json()["id"], response.headers["ETag"]
+
+
+def test_operations(client):
+    note_id, etag = create(client, "Hello world")
+
+    response = client.patch(f"/api/notes/{note_id}", headers={"If-Match": etag}, json={
+        "operations": [
+            {"op": "splice", "offset": 6, "length": 5, "text": "there"},
+            {"op": "insert", "offset": 0, "text": "Oh, "},
+            {"op": "delete", "offset": 2, "length": 1},
+        ]
+    })
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["content_hash"] == hashlib.sha256(b"Oh Hello there").hexdigest()
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == "Oh Hello there"
+
+
+def test_unified_diff(client):
+    old = "one\ntwo\nthree\n"
+    new = "one\n2\nthree\nfour\n"
+    note_id, etag = create(client, old)
+    diff = "".join(difflib.unified_diff(old.splitlines(True), new.splitlines(True), "a", "b"))
+
+    response = client.patch(f"/api/notes/{note_id}", headers={"If-Match": etag}, json={"diff": diff})
+
+    assert response.status_code == 200
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == new
+
+
+def test_if_match_required(client, note):
+    response = client.patch(f"/api/notes/{note['id']}", json={"diff": "@@ -1 +1 @@\n"})
+
+    assert response.status_code == 428
+
+
+def test_stale_etag(client):
+    note_id, etag = create(client, "first")
+    client.put(f"/api/notes/{note_id}", json={"content": "second"}).raise_for_status()
+
+    response = client.patch(f"/api/notes/{note_id}", headers={"If-Match": etag}, json={
+        "operations": [{"op": "insert", "offset": 0, "text": "x"}]
+    })
+
+    assert response.status_code == 412
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == "second"
+
+
+def test_operation_past_the_end(client):
+    note_id, etag = create(client, "short")
+
+    response = client.patch(f"/api/notes/{note_id}", headers={"If-Match": etag}, json={
+        "operations": [{"op": "delete", "offset": 3, "length": 5}]
+    })
+
+    assert response.status_code == 422
+    assert "past the end" in response.json()["detail"]
+
+
+def test_operations_past_the_length_limit(client):
+    note_id, etag = create(client, "")
+    text = "x" * (NOTE_CONTENT_MAX_LENGTH // 2 + 1)
+
+    response = client.patch(f"/api/notes/{note_id}", headers={"If-Match": etag}, json={
+        "operations": [{"op": "insert", "offset": 0, "text": text}] * 2
+    })
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Operation 1 makes the content longer")
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == ""
+
+
+def test_operations_stop_at_the_length_limit():
+    operations = [{"op": "insert", "offset": 0, "text": "x" * NOTE_CONTENT_MAX_LENGTH}] * 1000
+
+    with pytest.raises(PatchError, match="^Operation 1 "):
+        apply_operations("", operations)
@@ -0,0 +1,39 @@
+"""
+Revision history routes.
+"""
+
+import pytest
+
+
+def test_revisions_rebuild_every_version(client, note):
+    versions = [note["content"]]
+    for index in range(1, 25):
+        content = versions[-1] + f"\nline {index}"
+        client.put(f"/api/notes/{note['id']}", json={"content": content}).raise_for_status()
+        versions.append(content)
+
+    listed = client.get(f"/api/notes/{note['id']}/revisions", params={"limit": 200}).json()
+    assert [item["number"] for item in listed["items"]] == list(range(24, 0, -1))
+
+    for number in range(1, 25):
+        revision = client.get(f"/api/notes/{note['id']}/revisions/{number}").json()
+        assert revision["content"] == versions[number - 1]
+
+
+@pytest.mark.parametrize("number", ["0", "-1", str(2 ** 63), "99999999999999999999"])
+def test_revision_number_out_of_range(client, note, number):
+    response = client.get(f"/api/notes/{note['id']}/revisions/{number}")
+
+    assert response.status_code == 422
+
+
+def test_revision_before_out_of_range(client, note):
+    response = client.get(f"/api/notes/{note['id']}/revisions", params={"before": "99999999999999999999"})
+
+    assert response.status_code == 422
+
+
+def test_largest_revision_number(client, note):
+    response = client.get(f"/api/notes/{note['id']}/revisions/{2 ** 63 - 1}")
+
+    assert response.status_code == 404
@@ -0,0 +1,60 @@
+"""
+Full-text search over the authenticated user's notes.
+"""
+
+import pytest
+
+from backend.utils.pagination import MAX_INTEGER
+
+
+def search(client, q: str, **params):
+    response = client.get("/api/notes/search", params={"q": q, **params})
+    response.raise_for_status()
+    return response.json()
+
+
+def test_ranks_and_highlights(client):
+    client.post("/api/notes/", json={"title": "Groceries", "content": "buy apples"})
+    client.post("/api/notes/", json={"title": "Apples", "content": "pie recipe"})
+
+    items = search(client, "apples")["items"]
+
+    # Title matches rank above content matches
+    assert [item["title"] for item in items] == ["Apples", "Groceries"]
+    assert items[0]["title_highlight"] == "<mark>Apples</mark>"
+    assert "<mark>apples</mark>" in items[1]["snippet"]
+
+
+def test_prefix_and_operators_literal(client):
+    client.post("/api/notes/", json={"title": "Meeting", "content": "quarterly planning"})
+
+    assert len(search(client, "plan*")["items"]) == 1
+    assert search(client, "plan")["items"] == []
+    assert search(client, 'planning OR "x" NEAR(')["items"] == []
+
+
+def test_only_own_notes(client, other_client):
+    client.post("/api/notes/", json={"title": "Secret", "content": "owner only"})
+    other_client.post("/api/notes/", json={"title": "Public", "content": "owner only"})
+
+    assert [item["title"] for item in search(client, "owner")["items"]] == ["Secret"]
+    assert [item["title"] for item in search(other_client, "owner")["items"]] == ["Public"]
+
+
+def test_pages(client):
+    for index in range(3):
+        client.post("/api/notes/", json={"title": f"Page {index}", "content": "paged"})
+
+    first = search(client, "paged", limit=2)
+    second = search(client, "paged", limit=2, offset=first["next_offset"])
+
+    assert first["next_offset"] == 2
+    assert len(second["items"]) == 1 and second["next_offset"] is None
+    assert search(client, "paged", offset=MAX_INTEGER)["items"] == []
+
+
+@pytest.mark.parametrize("offset", [-1, MAX_INTEGER + 1])
+def test_invalid_offset(client, offset):
+    response = client.get("/api/notes/search", params={"q": "x", "offset": offset})
+
+    assert response.status_code == 422
@@ -0,0 +1,131 @@
+"""
+Session backends: in-memory, shared SQLite and signed tokens.
+"""
+
+import time
+
+import pytest
+
+from backend.auth import SessionStore, SQLiteSessionStore, TokenDenylist, TokenSessionBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return SessionStore(ttl_seconds=60, max_size=100)
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60, cache_ttl_seconds=5)
+
+
+def later(monkeypatch, seconds: float) -> None:
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + seconds)
+
+
+def test_create_get_delete(store):
+    session_id = store.create(7, "alice")
+
+    record = store.get(session_id)
+    assert (record.user_id, record.username) == (7, "alice")
+    assert store.get("unknown") is None
+
+    store.delete(session_id)
+    assert store.get(session_id) is None
+
+
+def test_expired_sessions_swept(store, monkeypatch):
+    session_id = store.create(7, "alice")
+    store.create(8, "bob")
+    later(monkeypatch, 61)
+
+    assert store.get(session_id) is None
+    assert store.sweep() == 1
+    assert store.stats()["live"] == 0
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = SessionStore(ttl_seconds=60, max_size=2)
+    first, second = store.create(1, "a"), store.create(2, "b")
+    store.get(first)
+    store.create(3, "c")
+
+    assert store.get(first) is not None
+    assert store.get(second) is None
+    assert store.stats()["evicted"] == 1
+
+
+def test_sqlite_store_shared_between_workers(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker, other_worker = (
+        SQLiteSessionStore(path, ttl_seconds=60, cache_ttl_seconds=0) for _ in range(2)
+    )
+
+    session_id = worker.create(7, "alice")
+    assert other_worker.get(session_id).user_id == 7
+
+    other_worker.delete(session_id)
+    assert worker.get(session_id) is None
+
+
+def test_logout_ends_session(client):
+    session_id = client.cookies["session_id"]
+    client.post("/api/auth/logout").raise_for_status()
+    # The session must be gone on the server, not only from the cookie jar
+    client.cookies.set("session_id", session_id)
+
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def token_backend(denylist: TokenDenylist, secret: bytes = b"secret") -> TokenSessionBackend:
+    return TokenSessionBackend(secret, ttl_seconds=60, denylist=denylist)
+
+
+def test_token_round_trip():
+    backend = token_backend(TokenDenylist())
+    token = backend.create(7, "alice:with:colons")
+
+    record = backend.get(token)
+    assert (record.user_id, record.username) == (7, "alice:with:colons")
+
+
+def test_token_rejected_when_tampered_or_expired(monkeypatch):
+    backend = token_backend(TokenDenylist())
+    token = backend.create(7, "alice")
+    body, signature = token.split(".")
+
+    assert token_backend(TokenDenylist(), b"other secret").get(token) is None
+    assert backend.get(body[:-2] + "xx." + signature) is None
+    assert backend.get("not a token") is None
+
+    later(monkeypatch, 61)
+    assert backend.get(token) is None
+    assert backend.stats()["rejected"] == 3
+
+
+def test_token_logout_shared_through_denylist(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker = token_backend(TokenDenylist(path, sync_interval_seconds=0))
+    other_worker = token_backend(TokenDenylist(path, sync_interval_seconds=0))
+    token = worker.create(7, "alice")
+    assert other_worker.get(token) is not None
+
+    worker.delete(token)
+
+    assert worker.get(token) is None
+    assert other_worker.get(token) is None
+
+
+def test_denylist_sweep(tmp_path, monkeypatch):
+    path = str(tmp_path / "sessions.db")
+    denylist, other_denylist = (TokenDenylist(path, sync_interval_seconds=0) for _ in range(2))
+    denylist.add("long", time.time() + 120)
+    denylist.add("short", time.time() + 1)
+    assert "short" in other_denylist
+    later(monkeypatch, 60)
+
+    assert denylist.sweep() == 1
+    assert "short" not in denylist and "long" in denylist
+
+    # The swept row had the highest id; a new revocation must not reuse
+    # it, or workers that synced past it would never see the new one
+    denylist.add("newest", time.time() + 120)
+    assert "newest" in other_denylist
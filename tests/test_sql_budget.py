@@ -0,0 +1,98 @@
+"""
+Statement budgets of the note routes, and the profiler's N+1 and full
+scan detection behind them.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.database import get_read_db
+from backend.models import Note
+from backend.profiler import ProfilerMiddleware
+from backend.repositories import note_repository
+
+# Statements per request, without transaction control
+BUDGETS = {
+    # notes version (for the ETag), page
+    "GET /api/notes/": 2,
+    # note (the user comes from the cache)
+    "GET /api/notes/{note_id}": 1,
+    "GET /api/notes/search": 1,
+    # notes version bump, INSERT
+    "POST /api/notes/": 2,
+    # previous version, UPDATE ... RETURNING, notes version bump,
+    # revision INSERT
+    "PUT /api/notes/{note_id}": 4,
+    # DELETE ... RETURNING, notes version bump, tombstone INSERT,
+    # revisions DELETE
+    "DELETE /api/notes/{note_id}": 4,
+    # note check, page
+    "GET /api/notes/{note_id}/revisions": 2,
+    # note content, revisions down to the wanted one
+    "GET /api/notes/{note_id}/revisions/{number}": 2,
+}
+
+
+def test_note_routes_within_budget(client, sql_budget):
+    with sql_budget(BUDGETS) as profiles:
+        note = client.post("/api/notes/", json={"title": "Budget", "content": "first draft"}).json()
+        client.get("/api/notes/")
+        client.get(f"/api/notes/{note['id']}")
+        client.put(f"/api/notes/{note['id']}", json={"content": "second draft"})
+        client.get("/api/notes/search", params={"q": "draft"})
+        client.get(f"/api/notes/{note['id']}/revisions")
+        client.get(f"/api/notes/{note['id']}/revisions/1")
+        client.delete(f"/api/notes/{note['id']}")
+
+    assert len(profiles) == 8
+
+
+def test_budget_exceeded(client, sql_budget):
+    with pytest.raises(pytest.fail.Exception, match=r"ran 2 statements \(budget 1\)"):
+        with sql_budget({"GET /api/notes/": 1}):
+            client.get("/api/notes/")
+
+
+@pytest.fixture
+def probe_client(client):
+    """
+    Client of an app with deliberately bad query patterns, over the
+    notes of client's user.
+    """
+    notes = [
+        client.post("/api/notes/", json={"title": f"Note {index}", "content": "x"}).json()
+        for index in range(5)
+    ]
+    user_id = notes[0]["user_id"]
+
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware)
+
+    @app.get("/n-plus-one")
+    def n_plus_one(db: Session = Depends(get_read_db)):
+        ids = db.scalars(select(Note.id).where(Note.user_id == user_id)).all()
+        return [note_repository.get_note_by_id(db, note_id, user_id).title for note_id in ids]
+
+    @app.get("/full-scan")
+    def full_scan(db: Session = Depends(get_read_db)):
+        return db.scalars(select(Note.id).where(Note.title == "Note 0")).all()
+
+    return TestClient(app)
+
+
+def test_n_plus_one_fails_budget(probe_client, sql_budget):
+    with pytest.raises(pytest.fail.Exception, match="ran the same statement 5 times"):
+        with sql_budget(100):
+            assert len(probe_client.get("/n-plus-one").json()) == 5
+
+
+def test_full_scan_fails_budget(probe_client, sql_budget):
+    with pytest.raises(pytest.fail.Exception, match="scans without an index"):
+        with sql_budget(100):
+            probe_client.get("/full-scan")
+
+    with sql_budget(100, allow_full_scans=True):
+        probe_client.get("/full-scan")
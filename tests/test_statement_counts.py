@@ -0,0 +1,72 @@
+"""
+Statements run per request by the note write routes.
+
+Each write touches the note with one ownership-scoped statement and
+never reads it back afterwards; a change in these counts is a
+regression unless the new statement is deliberate. Transaction control
+(BEGIN, SAVEPOINT, ...) differs between the database and write modes
+and is not counted.
+"""
+
+from typing import List
+
+from backend.profiler import UNPLANNED_PREFIXES, profiler
+
+
+def request_statements(client, method: str, url: str, **kwargs) -> List[str]:
+    """
+    SQL of the statements one request ran, without transaction control.
+    """
+    with profiler.capture() as profiles:
+        response = client.request(method, url, **kwargs)
+
+    response.raise_for_status()
+    [profile] = profiles
+
+    return [
+        " ".join(record.sql.split()) for record in profile.statements
+        if not record.sql.lstrip().upper().startswith(UNPLANNED_PREFIXES)
+    ]
+
+
+def test_create_note(client):
+    statements = request_statements(
+        client, "POST", "/api/notes/", json={"title": "Title", "content": "Content"}
+    )
+
+    # Notes version bump, INSERT
+    assert len(statements) == 2, statements
+    assert statements[-1].startswith("INSERT INTO notes ")
+    assert not any(sql.startswith("SELECT") for sql in statements)
+
+
+def test_update_note(client, note):
+    statements = request_statements(
+        client, "PUT", f"/api/notes/{note['id']}", json={"content": "New content"}
+    )
+
+    # Previous version (kept as a revision), UPDATE ... RETURNING, notes
+    # version bump, revision INSERT
+    assert len(statements) == 4, statements
+    [write] = [sql for sql in statements if sql.startswith("UPDATE notes ")]
+    assert "WHERE notes.id = ? AND notes.user_id = ?" in write
+    assert " RETURNING " in write
+
+
+def test_delete_note(client, note):
+    statements = request_statements(client, "DELETE", f"/api/notes/{note['id']}")
+
+    # DELETE ... RETURNING, notes version bump, tombstone INSERT,
+    # revisions DELETE
+    assert len(statements) == 4, statements
+    assert statements[0] == "DELETE FROM notes WHERE notes.id = ? AND notes.user_id = ? RETURNING id"
+    assert not any(sql.startswith("SELECT") for sql in statements)
+
+
+def test_update_missing_note(client):
+    with profiler.capture() as profiles:
+        response = client.put("/api/notes/0", json={"title": "x"})
+
+    assert response.status_code == 404
+    # Only the version lookup, no write
+    assert not any(record.sql.startswith("UPDATE notes ") for record in profiles[0].statements)
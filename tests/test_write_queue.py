@@ -0,0 +1,66 @@
+"""
+Group commit of writes through the write queue.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from backend.database import create_sqlite_engine
+from backend.write_queue import WriteQueue
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'queue.db'}", {"journal_mode": "WAL"})
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (name TEXT PRIMARY KEY)"))
+    yield engine
+    engine.dispose()
+
+
+def insert(name: str):
+    def operation(db):
+        db.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": name})
+        db.commit()
+        return name
+    return operation
+
+
+def names(engine):
+    with engine.connect() as connection:
+        return set(connection.scalars(text("SELECT name FROM items")))
+
+
+def test_failed_write_rolled_back_alone(engine):
+    # Long enough for all three writes to land in one batch
+    queue = WriteQueue(engine, max_batch=3, max_wait_seconds=5)
+    outcomes = {}
+
+    def submit(name, operation):
+        try:
+            outcomes[name] = queue.submit(operation)
+        except Exception as exc:
+            outcomes[name] = exc
+
+    def insert_then_fail(db):
+        db.execute(text("INSERT INTO items (name) VALUES ('failed')"))
+        # The duplicate fails after the write above went through
+        db.execute(text("INSERT INTO items (name) VALUES ('failed')"))
+
+    threads = [
+        threading.Thread(target=submit, args=("first", insert("first"))),
+        threading.Thread(target=submit, args=("failed", insert_then_fail)),
+        threading.Thread(target=submit, args=("third", insert("third"))),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert names(engine) == {"first", "third"}
+    assert (outcomes["first"], outcomes["third"]) == ("first", "third")
+    assert "UNIQUE constraint failed" in str(outcomes["failed"])
+    stats = queue.stats()
+    assert (stats["batches"], stats["operations"], stats["failed_operations"]) == (1, 3, 1)